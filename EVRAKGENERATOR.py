@@ -6,35 +6,69 @@ Düzenleyen: Claude AI Assistant
 
 import os
 import re
+import sys
+import copy
+import errno
+import json
+import time
 import shutil
+import stat
+import hashlib
+import argparse
 import datetime
+import tempfile
 import unicodedata
+import zipfile
+import csv
+import multiprocessing
+from io import BytesIO
+from pathlib import Path
+from collections import OrderedDict, deque, namedtuple
+from contextlib import ExitStack
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 
-import pandas as pd
 import threading
+from derived_fields import DERIVED_FIELDS
+from instrumentation import (METRICS, TRACE, MetricsHistory, RunProfiler, StageMetrics, instrumented,
+                             memory_probe, profiling_active)
+from company_search import CompanySearchIndex
 
 # tkinter GUI ve belge işlemleri için
 import tkinter as tk
-from tkinter import messagebox, Toplevel, BooleanVar, Checkbutton
+from tkinter import messagebox, filedialog, Toplevel, BooleanVar, Checkbutton
 import tkinter.ttk as ttk
 
+# İşçi havuzu süreçlerinde GUI ve dış program yoklamaları yapılmaz
+IS_WORKER_PROCESS = multiprocessing.parent_process() is not None
+
 # Belge ve GUI için platformlar arası Türkçe karakter destekli font seçimi
+# (ekransız çalışmada veya işçi süreçlerinde Tk açılamadığı için Arial varsayılır)
 import tkinter.font as tkfont_det
-_font_root = tk.Tk()
-_font_root.withdraw()
-_available_fonts = set(tkfont_det.families())
-_font_root.destroy()
-for _font in ("Arial", "Liberation Sans", "DejaVu Sans", "TkDefaultFont"):
-    if _font in _available_fonts:
-        DEFAULT_FONT = _font
-        break
-else:
-    DEFAULT_FONT = tkfont_det.nametofont("TkDefaultFont").actual()["family"]
+try:
+    if IS_WORKER_PROCESS:
+        raise tk.TclError("işçi süreci")
+    _font_root = tk.Tk()
+    _font_root.withdraw()
+    _available_fonts = set(tkfont_det.families())
+    DEFAULT_FONT = None
+    for _font in ("Arial", "Liberation Sans", "DejaVu Sans", "TkDefaultFont"):
+        if _font in _available_fonts:
+            DEFAULT_FONT = _font
+            break
+    if DEFAULT_FONT is None:
+        DEFAULT_FONT = tkfont_det.nametofont("TkDefaultFont").actual()["family"]
+    _font_root.destroy()
+except tk.TclError:
+    DEFAULT_FONT = "Arial"
 
+import importlib
 import importlib.util
-from openpyxl import load_workbook
 import logging
 import traceback
+import atexit
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
 import platform
 import subprocess
@@ -45,13 +79,23 @@ IS_WINDOWS = SYSTEM == "Windows"
 IS_MACOS = SYSTEM == "Darwin"
 IS_LINUX = SYSTEM == "Linux"
 
-# python-docx import kontrolü
-try:
-    from docx import Document
-    DOCX_AVAILABLE = True
-except ImportError:
-    DOCX_AVAILABLE = False
+# pandas, openpyxl ve python-docx ilk kullanıldıkları yerde içe aktarılır (pencere beklemeden açılır);
+# python-docx yalnızca kurulu mu diye yoklanır
+DOCX_AVAILABLE = importlib.util.find_spec("docx") is not None
+if not DOCX_AVAILABLE:
     print("UYARI: python-docx kurulu değil! Kurulum için: pip install python-docx")
+HEAVY_MODULES = ("pandas", "openpyxl", "docx")
+
+
+def preload_heavy_modules():
+    """Ağır kütüphaneleri arka planda içe aktarır; ilk belge/form açılışı içe aktarmayı beklemez"""
+    def task():
+        for name in HEAVY_MODULES:
+            try:
+                importlib.import_module(name)
+            except ImportError:
+                pass
+    threading.Thread(target=task, name="kutuphane-onyukleme", daemon=True).start()
 
 
 # win32com import kontrolü (sadece Windows için)
@@ -73,7 +117,11 @@ else:
         default_soffice = "/Applications/LibreOffice.app/Contents/MacOS/soffice"
         if os.path.exists(default_soffice):
             _libre = default_soffice
-    if _libre:
+    if _libre and IS_WORKER_PROCESS:
+        # Ana süreç zaten doğruladı; işçilerde --version tekrar çalıştırılmaz
+        LIBREOFFICE_BINARY = _libre
+        LIBREOFFICE_AVAILABLE = True
+    elif _libre:
         LIBREOFFICE_BINARY = _libre
         try:
             result = subprocess.run([_libre, "--version"], capture_output=True, text=True, timeout=5)
@@ -90,15 +138,991 @@ else:
         LIBREOFFICE_BINARY = None
         print("UYARI: LibreOffice bulunamadı! PDF dönüştürme için LibreOffice kurmanız gerekiyor.")
 
-# Loglama ayarları
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('evrak_generator.log', encoding='utf-8'),
-        logging.StreamHandler()
-    ]
-)
+# Loglama ayarları: kayıtlar kuyruğa bırakılır, dosyaya ve konsola arka plandaki QueueListener yazar
+# (belge üreten iş parçacıkları ve işçi süreçleri disk G/Ç'sini beklemez). Dosya LOG_MAX_BYTES'ı
+# geçince döndürülür. Seviyeler "INFO,evrak.hucre=DEBUG" biçiminde EVRAK_LOG_SEVIYE ortam
+# değişkeniyle veya --log-seviye ile kök ve modül loglayıcıları için ayrı ayrı verilebilir.
+LOG_FILE = "evrak_generator.log"
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUP_COUNT = 5
+DEFAULT_LOG_LEVELS = "INFO"
+
+# Açılış ölçümü (benchmark_startup.py): ayarlıysa ilk pencere çizilince stdout'a işaret yazılır ve
+# uygulama kapanır; değer "form" ise önce form penceresi de açılıp süresi yazılır
+STARTUP_PROBE_ENV = "EVRAK_ACILIS_OLCUMU"
+
+# Sıcak döngülerdeki hücre/anahtar ayrıntıları (varsayılan INFO seviyesinde yazılmaz)
+cell_log = logging.getLogger("evrak.hucre")
+# Belge listesi ve dosya adı filtreleme ayrıntıları
+filter_log = logging.getLogger("evrak.filtre")
+
+_LOG_HANDLERS = []
+_LOG_LISTENERS = []
+_WORKER_LOG_QUEUE = None
+
+
+def apply_log_levels(spec):
+    """"INFO,evrak.hucre=DEBUG" biçimindeki seviye tanımını kök ve adlandırılmış loglayıcılara uygular"""
+    for part in (p.strip() for p in (spec or "").split(",")):
+        if not part:
+            continue
+        name, _, level = part.rpartition("=")
+        try:
+            logging.getLogger(name.strip() or None).setLevel(level.strip().upper())
+        except ValueError:
+            logging.warning(f"Geçersiz log seviyesi atlandı: {part}")
+
+
+def _log_levels():
+    """İşçi süreçlerine aktarılacak seviyeler: {loglayıcı adı: seviye} ("" kök)"""
+    levels = {"": logging.getLogger().level}
+    for name, logger in logging.root.manager.loggerDict.items():
+        if isinstance(logger, logging.Logger) and logger.level != logging.NOTSET:
+            levels[name] = logger.level
+    return levels
+
+
+def _start_log_listener(log_queue):
+    listener = QueueListener(log_queue, *_LOG_HANDLERS, respect_handler_level=True)
+    listener.start()
+    _LOG_LISTENERS.append(listener)
+
+
+def _stop_logging():
+    """Kuyrukta bekleyen kayıtları yazıp dinleyicileri durdurur (çıkışta çağrılır)"""
+    while _LOG_LISTENERS:
+        _LOG_LISTENERS.pop().stop()
+    for handler in _LOG_HANDLERS:
+        handler.close()
+
+
+def setup_logging(levels=None):
+    """Ana süreçte dönen log dosyası ve konsol işleyicilerini arka plan dinleyicisine bağlar"""
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    formatter = logging.Formatter(LOG_FORMAT)
+    file_handler = RotatingFileHandler(LOG_FILE, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT,
+                                       encoding='utf-8', delay=True)
+    stream_handler = logging.StreamHandler()
+    for handler in (file_handler, stream_handler):
+        handler.setFormatter(formatter)
+        _LOG_HANDLERS.append(handler)
+    log_queue = queue.SimpleQueue()
+    root.addHandler(QueueHandler(log_queue))
+    _start_log_listener(log_queue)
+    root.setLevel(logging.INFO)
+    apply_log_levels(levels or os.environ.get("EVRAK_LOG_SEVIYE", DEFAULT_LOG_LEVELS))
+    atexit.register(_stop_logging)
+
+
+def redirect_log_file(path):
+    """Log dosyasını başka bir yola yönlendirir (ölçüm araçları depo günlüğünü kirletmesin)"""
+    for handler in _LOG_HANDLERS:
+        if isinstance(handler, logging.FileHandler):
+            handler.acquire()
+            try:
+                # delay=True: dosya bir sonraki kayıtta yeni yolda açılır
+                handler.close()
+                handler.baseFilename = os.path.abspath(path)
+            finally:
+                handler.release()
+
+
+def _worker_log_queue():
+    """İşçi süreçlerinin kayıtlarını ana sürece taşıyan kuyruk (ilk süreç havuzunda oluşturulur)"""
+    global _WORKER_LOG_QUEUE
+    if _WORKER_LOG_QUEUE is None and _LOG_HANDLERS:
+        _WORKER_LOG_QUEUE = multiprocessing.get_context("spawn").Queue()
+        _start_log_listener(_WORKER_LOG_QUEUE)
+    return _WORKER_LOG_QUEUE
+
+
+def setup_worker_logging(log_queue, levels):
+    """İşçi sürecinde kayıtları ana sürecin kuyruğuna yönlendirir (dosyaya yalnızca ana süreç yazar)"""
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    if log_queue is not None:
+        root.addHandler(QueueHandler(log_queue))
+    for name, level in levels.items():
+        logging.getLogger(name or None).setLevel(level)
+
+
+if not IS_WORKER_PROCESS:
+    setup_logging()
+
+
+class TemplateCache:
+    """Şablon dosyalarının baytlarını süreç içinde önbellekler (yol + mtime + boyut anahtarlı)"""
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get_bytes(self, path):
+        """Şablonun baytlarını döndürür; dosya değiştiyse yeniden okur"""
+        abs_path = os.path.abspath(path)
+        st = os.stat(abs_path)
+        signature = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            entry = self._entries.get(abs_path)
+            if entry is not None and entry[0] == signature:
+                return entry[1]
+        with open(abs_path, "rb") as f:
+            data = f.read()
+        with self._lock:
+            self._entries[abs_path] = (signature, data)
+        return data
+
+    def open(self, path):
+        """Şablonu bellekten okunabilir bir akış olarak döndürür"""
+        return BytesIO(self.get_bytes(path))
+
+    def prime(self, path, data):
+        """Ana süreçte okunmuş şablon baytlarını önbelleğe ekler"""
+        st = os.stat(path)
+        with self._lock:
+            self._entries[os.path.abspath(path)] = ((st.st_mtime_ns, st.st_size), data)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# Süreç başına şablon önbelleği (işçi süreçlerinde ayrı kopyası oluşur)
+TEMPLATE_CACHE = TemplateCache()
+
+
+def default_workers(job_count=None):
+    """Varsayılan işçi sayısı: çekirdek sayısı - 1 (iş sayısını aşmaz)"""
+    workers = max(1, (os.cpu_count() or 2) - 1)
+    if job_count is not None:
+        workers = max(1, min(workers, job_count))
+    return workers
+
+
+def _process_pool(workers, initializer=None, initargs=()):
+    """Tüm platformlarda aynı davranış için 'spawn' bağlamıyla süreç havuzu oluşturur"""
+    return ProcessPoolExecutor(max_workers=workers,
+                               mp_context=multiprocessing.get_context("spawn"),
+                               initializer=_init_process,
+                               initargs=(_worker_log_queue(), _log_levels(), initializer, initargs))
+
+
+def _init_process(log_queue, levels, initializer, initargs):
+    """Her işçi sürecinde önce loglamayı ana sürece bağlar, sonra asıl başlatıcıyı çağırır"""
+    setup_worker_logging(log_queue, levels)
+    if initializer is not None:
+        initializer(*initargs)
+
+
+def file_sha256(path):
+    """Dosyanın SHA-256 özetini döndürür"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def input_fingerprint(data):
+    """İş girdisinin (replacements, iş satırı) değişip değişmediğini anlamak için özet"""
+    return hashlib.sha256(json.dumps(data, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+class JobJournal:
+    """Çıkış klasöründe tamamlanan işleri kaydeden, yalnızca sona eklenen iş günlüğü
+
+    Her satır (firma, belge, aşama, girdi özeti, çıktı dosyalarının SHA-256 özetleri) içerir.
+    resume=True ise önceki kayıtlar okunur; girdisi aynı ve çıktıları hâlâ doğrulanan işler atlanır.
+    """
+
+    FILENAME = ".evrak_gunlugu.jsonl"
+
+    def __init__(self, folder, resume=False, filename=None):
+        self.path = os.path.join(folder, filename or self.FILENAME)
+        self._lock = threading.Lock()
+        self._entries = {}
+        if resume:
+            self._load()
+        elif os.path.exists(self.path):
+            # Yeni çalışma: önceki günlük geçersiz
+            os.remove(self.path)
+
+    @classmethod
+    def pending_entries(cls, folder, filename=None):
+        """Klasördeki önceki günlükte kaç kayıt olduğunu döndürür (devam sorusu için)"""
+        path = os.path.join(folder, filename or cls.FILENAME)
+        if not os.path.isfile(path):
+            return 0
+        with open(path, encoding="utf-8") as f:
+            return sum(1 for line in f if line.strip())
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Kesinti sırasında yarım kalmış son satır
+                    continue
+                self._entries[(entry["firma"], entry["belge"])] = entry
+        logging.info(f"İş günlüğü okundu: {self.path} ({len(self._entries)} kayıt)")
+
+    def __len__(self):
+        return len(self._entries)
+
+    def completed(self, company, document, fingerprint, need_pdf=False):
+        """İş daha önce aynı girdiyle tamamlandıysa ve çıktılar doğrulanıyorsa çıktı listesini döndürür"""
+        entry = self._entries.get((str(company), document))
+        if entry is None or entry.get("girdi") != fingerprint:
+            return None
+        if need_pdf and entry.get("asama") != "pdf":
+            return None
+        for path, digest in entry["ciktilar"].items():
+            if not os.path.isfile(path) or file_sha256(path) != digest:
+                logging.info(f"Günlük kaydı doğrulanamadı, yeniden üretilecek: {company} / {document}")
+                return None
+        return list(entry["ciktilar"])
+
+    def record(self, company, document, fingerprint, outputs, extra=None):
+        """Tamamlanan işi diske (fsync ile) ekler"""
+        stage = "pdf" if any(p.lower().endswith(".pdf") for p in outputs) else "belge"
+        entry = {"firma": str(company), "belge": document, "asama": stage, "girdi": fingerprint,
+                 "zaman": datetime.datetime.now().isoformat(timespec="seconds"),
+                 "ciktilar": {p: file_sha256(p) for p in outputs if os.path.isfile(p)}}
+        if extra:
+            entry.update(extra)
+        line = json.dumps(entry, ensure_ascii=False)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._entries[(entry["firma"], document)] = entry
+
+    def entry(self, company, document):
+        return self._entries.get((str(company), document))
+
+    def discard(self):
+        """Çalışma eksiksiz bittiğinde günlüğü siler (bir sonraki çalışma devam sorusu sormaz)"""
+        with self._lock:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+
+# Şablon içindeki placeholder anahtarları ([DEĞİŞTİR:...])
+PLACEHOLDER_PATTERN = re.compile(r"\[DEĞİŞTİR:[^\[\]<>]+\]")
+
+
+class PlaceholderIndex:
+    """Her şablonun kullandığı placeholder anahtarlarını şablon özetine göre kaydeder
+
+    Şablon (docx/xlsx) içindeki XML parçaları etiketlerden arındırılıp taranır; run'lara bölünmüş
+    placeholder'lar da yakalanır. Sonuç yedekler klasöründeki dizin dosyasında saklanır, şablon
+    değişmedikçe yeniden taranmaz.
+    """
+
+    FILENAME = os.path.join("yedekler", ".sablon_alanlari.json")
+
+    def __init__(self, path=None):
+        self.path = path or self.FILENAME
+        self._lock = threading.Lock()
+        self._keys = {}
+        self._digests = {}
+        self._dirty = False
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                self._keys = {digest: frozenset(keys) for digest, keys in json.load(f).items()}
+        except (OSError, ValueError):
+            pass
+
+    @staticmethod
+    def scan(data):
+        """Şablon baytlarındaki placeholder anahtarlarını döndürür"""
+        keys = set()
+        with zipfile.ZipFile(BytesIO(data)) as z:
+            for name in z.namelist():
+                if not name.endswith(".xml") or not name.startswith(("word/", "xl/")):
+                    continue
+                text = re.sub(r"<[^>]+>", "", z.read(name).decode("utf-8", errors="ignore"))
+                keys.update(PLACEHOLDER_PATTERN.findall(unicodedata.normalize("NFC", text)))
+        return frozenset(keys)
+
+    def keys_for(self, template_path):
+        """(şablon özeti, anahtar kümesi) döndürür"""
+        data = TEMPLATE_CACHE.get_bytes(template_path)
+        abs_path = os.path.abspath(template_path)
+        with self._lock:
+            entry = self._digests.get(abs_path)
+        # Önbellekteki baytlar değişmedikçe özet yeniden hesaplanmaz
+        if entry is not None and entry[0] is data:
+            digest = entry[1]
+        else:
+            digest = hashlib.sha256(data).hexdigest()
+            with self._lock:
+                self._digests[abs_path] = (data, digest)
+        with self._lock:
+            keys = self._keys.get(digest)
+        if keys is None:
+            keys = self.scan(data)
+            logging.info(f"Şablon alanları tarandı: {os.path.basename(template_path)} ({len(keys)} alan)")
+            with self._lock:
+                self._keys[digest] = keys
+                self._dirty = True
+        return digest, keys
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({digest: sorted(keys) for digest, keys in self._keys.items()}, f,
+                          ensure_ascii=False, indent=1)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+
+
+# Süreç başına şablon alanları dizini (RenderCache ve değişiklik tespiti ortak kullanır)
+PLACEHOLDER_INDEX = PlaceholderIndex()
+
+
+class RenderCache:
+    """Doldurulmuş belge baytlarını LRU olarak önbellekler
+
+    Anahtar (şablon özeti, şablonun kullandığı alanların değerlerinin özeti) ikilisidir; aynı projedeki
+    firmalar katılım formları gibi az alan kullanan şablonlarda aynı çıktıyı paylaşır. Belge bir kez
+    üretilir, sonraki firmalar için baytlar kopyalanır. Toplam boyut max_bytes'ı aşınca en eski kayıtlar atılır.
+    Şablon alanları PLACEHOLDER_INDEX'ten alınır.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, index=None):
+        self.max_bytes = max_bytes
+        self.index = index or PLACEHOLDER_INDEX
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, src_path, replacements, extra=()):
+        """Önbellek anahtarını döndürür; güvenle paylaşılamayacak girdilerde None"""
+        normalized = {unicodedata.normalize("NFC", k): v for k, v in replacements.items()}
+        # Doldurma her anahtarı değiştirir; anahtar yalnızca placeholder'ları kapsadığından diğerleri paylaşılmaz
+        if not all(PLACEHOLDER_PATTERN.fullmatch(k) for k in normalized):
+            return None
+        digest, keys = self.index.keys_for(src_path)
+        values = {k: normalized.get(k) for k in sorted(keys)}
+        # Değeri başka bir placeholder içeriyorsa sonuç değiştirme sırasına bağlıdır, paylaşılmaz
+        if any(isinstance(v, str) and "[DEĞİŞTİR:" in v for v in values.values()):
+            return None
+        return digest, input_fingerprint([values, list(extra)])
+
+    def get(self, key):
+        if key is None:
+            return None
+        with self._lock:
+            data = self._entries.get(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def put(self, key, data):
+        if key is None or len(data) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return
+            self._entries[key] = data
+            self._size += len(data)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+# Süreç başına doldurulmuş belge önbelleği
+RENDER_CACHE = RenderCache()
+
+
+def _write_bytes(path, data):
+    """Dosyayı geçici adla yazıp os.replace ile atomik olarak yerine koyar (yarım dosya görünmez)"""
+    # Süreç ve iş parçacığı başına ayrı geçici ad: aynı hedefe eşzamanlı yazanlar çakışmaz
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with METRICS.stage("kaydetme") as m:
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            # Yazılamayan veya yerine konamayan geçici dosya hedef klasörde bırakılmaz
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        m["bayt"] = len(data)
+
+
+# Deterministik kayıt: aynı girdiler bayt bayt aynı dosyayı üretir (önbellek, tekilleştirme ve değişiklik tespiti için)
+DETERMINISTIC_SAVE = True
+PACKAGE_ZIP_TIME = (1980, 1, 1, 0, 0, 0)
+PACKAGE_DOC_TIME = b"2000-01-01T00:00:00Z"
+
+
+def normalize_package(data):
+    """docx/xlsx paketini sabit zip tarihleri, sabit üye sırası ve sabit docProps zamanlarıyla yeniden yazar"""
+    out = BytesIO()
+    with zipfile.ZipFile(BytesIO(data)) as src, zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as dst:
+        names = sorted(src.namelist(), key=lambda n: (n != "[Content_Types].xml", n != "_rels/.rels", n))
+        for name in names:
+            blob = src.read(name)
+            if name == "docProps/core.xml":
+                blob = re.sub(rb"(<dcterms:(?:created|modified)\b[^>]*>)[^<]*(</dcterms:)",
+                              rb"\g<1>" + PACKAGE_DOC_TIME + rb"\g<2>", blob)
+            info = zipfile.ZipInfo(name, PACKAGE_ZIP_TIME)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.create_system = 0
+            info.external_attr = 0o600 << 16
+            dst.writestr(info, blob)
+    return out.getvalue()
+
+
+def package_bytes(document):
+    """python-docx Document veya openpyxl Workbook nesnesini (deterministik) bayt olarak kaydeder"""
+    with METRICS.stage("paketleme") as m:
+        buffer = BytesIO()
+        document.save(buffer)
+        data = buffer.getvalue()
+        if DETERMINISTIC_SAVE:
+            data = normalize_package(data)
+        m["bayt"] = len(data)
+    return data
+
+
+
+class ZipBundle:
+    """Üretilen belgeleri bellekten doğrudan tek bir .zip dosyasına akıtan paket yazıcı
+
+    docx/xlsx/pdf zaten sıkıştırılmış olduğundan yeniden sıkıştırılmadan (ZIP_STORED) eklenir.
+    Hedef bir dosya yoluysa geçici adla yazılıp kapanışta atomik olarak yerine konur; BytesIO da verilebilir.
+    """
+
+    STORED_EXTENSIONS = (".docx", ".xlsx", ".pdf", ".zip")
+
+    def __init__(self, target):
+        self.target = target
+        self._tmp_path = None
+        if isinstance(target, (str, os.PathLike)):
+            self._tmp_path = f"{target}.{os.getpid()}.tmp"
+            self._zip = zipfile.ZipFile(self._tmp_path, "w", zipfile.ZIP_DEFLATED)
+        else:
+            self._zip = zipfile.ZipFile(target, "w", zipfile.ZIP_DEFLATED)
+        self.names = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+    def add(self, name, data):
+        """Bellekteki baytları pakete ekler (aynı ad ikinci kez eklenmez)"""
+        name = name.replace(os.sep, "/")
+        if name in self.names:
+            logging.warning(f"Pakette zaten var, atlandı: {name}")
+            return
+        date_time = PACKAGE_ZIP_TIME if DETERMINISTIC_SAVE else datetime.datetime.now().timetuple()[:6]
+        info = zipfile.ZipInfo(name, date_time)
+        stored = name.lower().endswith(self.STORED_EXTENSIONS)
+        info.compress_type = zipfile.ZIP_STORED if stored else zipfile.ZIP_DEFLATED
+        info.external_attr = 0o644 << 16
+        with self._zip.open(info, "w") as entry:
+            entry.write(data)
+        self.names.append(name)
+
+    def add_file(self, name, path):
+        with open(path, "rb") as f:
+            self.add(name, f.read())
+
+    def add_archive(self, prefix, data):
+        """Başka bir paketin (ör. işçi sürecinde üretilen firma paketi) girdilerini önek altında aktarır"""
+        with zipfile.ZipFile(BytesIO(data)) as src:
+            for name in src.namelist():
+                self.add(prefix + name, src.read(name))
+
+    def close(self):
+        self._zip.close()
+        if self._tmp_path:
+            os.replace(self._tmp_path, self.target)
+            logging.info(f"Paket kaydedildi: {self.target} ({len(self.names)} dosya)")
+
+    def abort(self):
+        self._zip.close()
+        if self._tmp_path and os.path.exists(self._tmp_path):
+            os.remove(self._tmp_path)
+
+
+class DependencyManifest:
+    """Yedek klasöründe her belgenin şablon özeti, ilgili alan değerlerinin özeti ve çıktılarını tutar
+
+    "Yalnızca değişenler" modunda aynı projenin en son manifestiyle karşılaştırılır; şablonu ve
+    kullandığı alanların değerleri aynı, çıktıları yerinde olan belgeler yeniden üretilmez.
+    """
+
+    FILENAME = "uretim_manifest.json"
+
+    def __init__(self, backup_folder):
+        self.backup_folder = backup_folder
+        self.path = os.path.join(backup_folder, self.FILENAME)
+        self._lock = threading.Lock()
+        self.previous = self._read(self.latest_path(backup_folder))
+        # Bu çalışmada üretilmeyen belgelerin kayıtları önceki manifestten taşınır
+        self.documents = dict(self.previous)
+
+    @classmethod
+    def latest_path(cls, backup_folder):
+        """Aynı projeye ait (tarih - proje) yedek klasörlerindeki en yeni manifest yolu"""
+        parent, name = os.path.split(os.path.normpath(backup_folder))
+        own = os.path.join(backup_folder, cls.FILENAME)
+        if os.path.isfile(own):
+            return own
+        suffix = name.split(" - ", 1)[-1]
+        try:
+            candidates = sorted((d for d in os.listdir(parent or ".") if d.split(" - ", 1)[-1] == suffix),
+                                reverse=True)
+        except OSError:
+            return None
+        for folder in candidates:
+            path = os.path.join(parent, folder, cls.FILENAME)
+            if os.path.isfile(path):
+                return path
+        return None
+
+    @staticmethod
+    def _read(path):
+        if not path:
+            return {}
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f).get("belgeler", {})
+        except (OSError, ValueError) as e:
+            logging.error(f"Manifest okunamadı: {path} ({e})")
+            return {}
+
+    def unchanged(self, document, signature, need_pdf=False):
+        """Belge önceki üretimle aynı girdilere sahipse ve çıktıları doğrulanıyorsa çıktı listesini döndürür"""
+        entry = self.previous.get(document)
+        if not entry or entry.get("sablon") != signature["sablon"] or entry.get("girdi") != signature["girdi"]:
+            return None
+        outputs = entry.get("ciktilar", {})
+        if need_pdf and not any(p.lower().endswith(".pdf") for p in outputs):
+            return None
+        for path, digest in outputs.items():
+            if not os.path.isfile(path) or file_sha256(path) != digest:
+                return None
+        return list(outputs)
+
+    def update(self, document, signature, outputs):
+        with self._lock:
+            self.documents[document] = {
+                "sablon": signature["sablon"], "girdi": signature["girdi"], "alanlar": signature["alanlar"],
+                "zaman": datetime.datetime.now().isoformat(timespec="seconds"),
+                "ciktilar": {p: file_sha256(p) for p in outputs if os.path.isfile(p)}}
+
+    def save(self):
+        with self._lock:
+            os.makedirs(self.backup_folder, exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"surum": 1, "belgeler": self.documents}, f, ensure_ascii=False, indent=1)
+            BackupStore.detach(self.path)
+            os.replace(tmp_path, self.path)
+        logging.info(f"Üretim manifesti kaydedildi: {self.path}")
+
+
+class BackupStore:
+    """yedekler/ için içerik adresli, tekilleştiren yedek deposu
+
+    Her yedek dosyası SHA-256 özetiyle adlandırılan salt okunur bir nesne olarak yedekler/.nesneler altında
+    bir kez saklanır; tarihli klasördeki dosya bu nesneye sabit bağlantıdır (dosya sistemi desteklemiyorsa
+    kopyası). Her klasördeki yedek_manifest.jsonl dosya adı → özet eşlemesini tutar; tarihli klasör görünümü
+    bu manifestten yeniden kurulabilir. Aynı içerikteki tekrar yedekler yalnızca manifest satırı maliyetindedir.
+    """
+
+    ROOT = "yedekler"
+    OBJECTS = ".nesneler"
+    MANIFEST = "yedek_manifest.jsonl"
+    # Tekilleştirme yalnızca üretilen belge yedeklerine uygulanır; klasörde yerinde yeniden yazılan
+    # çalışma dosyaları (veri.xlsx, uretim_manifest.json, tarif.json) salt okunur nesneye bağlanmaz
+    DOCUMENT_EXTENSIONS = (".docx", ".xlsx", ".pdf")
+    WORKING_FILES = ("veri.xlsx",)
+
+    def __init__(self, root=None):
+        self.root = root or self.ROOT
+        self.objects = os.path.join(self.root, self.OBJECTS)
+        self._lock = threading.Lock()
+
+    def object_path(self, digest):
+        return os.path.join(self.objects, digest[:2], digest)
+
+    def put(self, path, digest=None):
+        """Dosyayı depoya ekler (zaten varsa yalnızca özeti döndürür); (özet, yeni mi) döndürür"""
+        digest = digest or file_sha256(path)
+        obj = self.object_path(digest)
+        if os.path.exists(obj):
+            return digest, False
+        os.makedirs(os.path.dirname(obj), exist_ok=True)
+        tmp_path = f"{obj}.{os.getpid()}.{threading.get_ident()}.tmp"
+        shutil.copyfile(path, tmp_path)
+        os.chmod(tmp_path, stat.S_IREAD | stat.S_IRGRP | stat.S_IROTH)
+        try:
+            os.replace(tmp_path, obj)
+        except OSError:
+            # Başka bir süreç aynı nesneyi aynı anda yazdıysa onunki kullanılır
+            if not os.path.exists(obj):
+                raise
+            os.remove(tmp_path)
+        return digest, True
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except PermissionError:
+            # Windows salt okunur dosyayı silmez; bağlantının özniteliği nesneyle ortaktır
+            os.chmod(path, stat.S_IWRITE | stat.S_IREAD)
+            os.remove(path)
+
+    @classmethod
+    def detach(cls, path):
+        """Depo nesnesine bağlı dosyayı yeniden yazmadan önce kaldırır (ortak salt okunur nesne değişmesin;
+        önceki sürümler çalışma dosyalarını da tekilleştiriyordu)"""
+        if os.path.isfile(path) and os.stat(path).st_nlink > 1:
+            cls._remove(path)
+
+    def materialize(self, digest, path):
+        """Nesneyi verilen yolda sabit bağlantı (olmazsa kopya) olarak oluşturur"""
+        obj = self.object_path(digest)
+        if os.path.lexists(path):
+            if os.path.exists(path) and os.path.samefile(obj, path):
+                return
+            self._remove(path)
+        try:
+            os.link(obj, path)
+        except OSError:
+            shutil.copyfile(obj, path)
+
+    def _append_manifest(self, folder, name, digest, size):
+        line = json.dumps({"ad": name, "sha256": digest, "boyut": size,
+                           "zaman": datetime.datetime.now().isoformat(timespec="seconds")}, ensure_ascii=False)
+        with self._lock:
+            with open(os.path.join(folder, self.MANIFEST), "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+    def backup(self, src_path, backup_path):
+        """src_path'in yedeğini backup_path'e alır; özetini döndürür"""
+        digest, _ = self.put(src_path)
+        self.materialize(digest, backup_path)
+        self._append_manifest(os.path.dirname(backup_path) or ".", os.path.basename(backup_path), digest,
+                              os.path.getsize(src_path))
+        return digest
+
+    def load_manifest(self, folder):
+        """Klasörün manifestini {dosya adı: kayıt} olarak döndürür (aynı ad için son satır geçerlidir)"""
+        entries = {}
+        path = os.path.join(folder, self.MANIFEST)
+        if not os.path.isfile(path):
+            return entries
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                entries[entry["ad"]] = entry
+        return entries
+
+    def rebuild_view(self, folder):
+        """Manifestteki eksik veya boyutu tutmayan dosyaları depodan yeniden oluşturur; (onarılan, eksik nesne)"""
+        restored, missing = 0, 0
+        os.makedirs(folder, exist_ok=True)
+        for name, entry in self.load_manifest(folder).items():
+            path = os.path.join(folder, name)
+            if os.path.isfile(path) and os.path.getsize(path) == entry.get("boyut"):
+                continue
+            if not os.path.exists(self.object_path(entry["sha256"])):
+                logging.error(f"Yedek nesnesi bulunamadı: {entry['sha256']} ({name})")
+                missing += 1
+                continue
+            self.materialize(entry["sha256"], path)
+            restored += 1
+        logging.info(f"Yedek görünümü onarıldı: {folder} ({restored} dosya, {missing} eksik nesne)")
+        return restored, missing
+
+    def deduplicate(self, folder):
+        """Mevcut bir yedek klasörünü depoya taşır; (dosya sayısı, kazanılan bayt) döndürür"""
+        known = self.load_manifest(folder)
+        files, saved = 0, 0
+        for name in sorted(os.listdir(folder)):
+            path = os.path.join(folder, name)
+            if (name.startswith(".") or not name.lower().endswith(self.DOCUMENT_EXTENSIONS)
+                    or name in self.WORKING_FILES or not os.path.isfile(path)):
+                continue
+            digest, created = self.put(path)
+            if os.path.samefile(self.object_path(digest), path):
+                continue
+            if not created:
+                saved += os.path.getsize(path)
+            self.materialize(digest, path)
+            if known.get(name, {}).get("sha256") != digest:
+                self._append_manifest(folder, name, digest, os.path.getsize(path))
+            files += 1
+        return files, saved
+
+    def deduplicate_all(self):
+        """yedekler/ altındaki tüm tarihli klasörleri tekilleştirir"""
+        total_files, total_saved = 0, 0
+        for name in sorted(os.listdir(self.root)):
+            folder = os.path.join(self.root, name)
+            if name.startswith(".") or not os.path.isdir(folder):
+                continue
+            files, saved = self.deduplicate(folder)
+            total_files += files
+            total_saved += saved
+        logging.info(f"Yedekler tekilleştirildi: {total_files} dosya, {total_saved / 1e6:.1f} MB kazanıldı")
+        return total_files, total_saved
+
+
+BACKUP_STORE = BackupStore()
+
+
+class RecipeBackup:
+    """Tarif yedeği: belge kopyaları yerine belgeyi yeniden üretmeye yetecek girdileri saklar
+
+    Yedek klasöründeki tarif.json; değiştirme değerlerinin anlık görüntüsünü, her belgenin kullandığı
+    şablonları ve kural dosyalarını (göreli yol → SHA-256) içerir. Tarifte geçen şablon sürümleri yedek
+    deposunda tutulur ve .sablon_arsivi.jsonl dizinine yazılır; Evrak Geçmişi'nden eski bir belge bu
+    sürümlerle yeniden üretilebilir.
+    """
+
+    FILENAME = "tarif.json"
+    ARCHIVE_INDEX = ".sablon_arsivi.jsonl"
+
+    def __init__(self, store=None):
+        self.store = store or BACKUP_STORE
+        self.index_path = os.path.join(self.store.root, self.ARCHIVE_INDEX)
+        self._archived = set()
+        if os.path.isfile(self.index_path):
+            with open(self.index_path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    self._archived.add((entry["yol"], entry["sha256"]))
+
+    @staticmethod
+    def is_safe_path(rel_path):
+        """Göreli yol çalışma klasörünün içinde mi kalıyor (mutlak yol, sürücü ve '..' içermez)"""
+        parts = rel_path.replace("\\", "/").split("/")
+        return bool(rel_path) and not os.path.isabs(rel_path) and not re.match(r"^[A-Za-z]:", rel_path) \
+            and not any(part in ("", os.pardir) for part in parts)
+
+    def archive(self, path):
+        """Şablonu/kural dosyasını sürümlü arşive ekler; (göreli yol, özet) döndürür
+
+        Yol program klasörüne göre tutulur; bu klasörün dışındaki dosyalar tarifle yeniden üretilemeyeceği
+        için ValueError verir.
+        """
+        try:
+            rel_path = os.path.normpath(os.path.relpath(os.path.abspath(path))).replace(os.sep, "/")
+        except ValueError:
+            # Windows'ta farklı sürücüdeki dosyanın göreli yolu yoktur
+            rel_path = os.path.abspath(path)
+        if not self.is_safe_path(rel_path):
+            raise ValueError(f"Program klasörünün dışındaki dosya tarife eklenemez: {path}")
+        digest, _ = self.store.put(path)
+        if (rel_path, digest) not in self._archived:
+            os.makedirs(self.store.root, exist_ok=True)
+            with open(self.index_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"yol": rel_path, "sha256": digest,
+                                    "zaman": datetime.datetime.now().isoformat(timespec="seconds")},
+                                   ensure_ascii=False) + "\n")
+            self._archived.add((rel_path, digest))
+        return rel_path, digest
+
+    def write(self, backup_folder, generator, jobs):
+        """İşlerin tarifini yedek klasörüne yazar"""
+        if not jobs:
+            return None
+        documents, files = {}, {}
+        for job in jobs:
+            template_path, _, extra_files = generator.document_sources(job)
+            used = []
+            for path in [template_path] + list(extra_files):
+                if path and os.path.isfile(path):
+                    try:
+                        rel_path, digest = self.archive(path)
+                    except ValueError as e:
+                        logging.warning(f"{job.filename}: {e}")
+                        continue
+                    files[rel_path] = digest
+                    used.append(rel_path)
+            documents[job.filename] = used
+        program = os.path.abspath(__file__)
+        recipe = {"surum": 1, "zaman": datetime.datetime.now().isoformat(timespec="seconds"),
+                  "proje": jobs[0].project_name, "pdf": bool(jobs[0].generate_pdf),
+                  "program": file_sha256(program) if os.path.isfile(program) else None,
+                  "degerler": dict(jobs[0].replacements), "belgeler": documents, "dosyalar": files}
+        os.makedirs(backup_folder, exist_ok=True)
+        path = os.path.join(backup_folder, self.FILENAME)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(recipe, f, ensure_ascii=False, indent=1)
+        BackupStore.detach(path)
+        os.replace(tmp_path, path)
+        logging.info(f"Tarif yedeği yazıldı: {path} ({len(documents)} belge, {len(files)} dosya)")
+        return path
+
+    @classmethod
+    def load(cls, backup_folder):
+        path = os.path.join(backup_folder, cls.FILENAME)
+        if not os.path.isfile(path):
+            return None
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def prepare_workspace(self, recipe, workspace, documents):
+        """Belgelerin tarifteki şablon/kural sürümlerini çalışma klasörüne aynı göreli yollarla çıkarır"""
+        needed = {rel for doc in documents for rel in recipe["belgeler"].get(doc, [])}
+        missing = []
+        for rel_path in sorted(needed):
+            # Tarif dosyası elle düzenlenmiş veya eski sürümde yazılmış olabilir: klasör dışına yazılmaz
+            if not self.is_safe_path(rel_path):
+                logging.error(f"Tarifte geçersiz şablon yolu: {rel_path}")
+                missing.append(rel_path)
+                continue
+            obj = self.store.object_path(recipe["dosyalar"][rel_path])
+            if not os.path.isfile(obj):
+                missing.append(rel_path)
+                continue
+            dst = os.path.join(workspace, *rel_path.split("/"))
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            # Arşiv nesneleri salt okunurdur; geçici klasör silinebilsin diye kopyalanır
+            shutil.copyfile(obj, dst)
+        return missing
+
+
+
+class OutputStaging:
+    """Çıktıları yerel bir hazırlık klasöründe üretip sonunda hedef klasöre toplu ve atomik olarak taşır
+
+    Masaüstü genellikle eşitlenen bir klasördür; belgeler önce yerel geçici klasöre yazılır, yedekleri
+    arka plan iş parçacığında alınır, tüm set en sonda os.replace ile (farklı sürücüdeyse hedefte geçici
+    adla kopyalanıp os.replace ile) yayımlanır. Hedefte yarım veya bozuk dosya görünmez. Yayımlanamayan
+    dosya varsa (ör. hedefteki belge açık) hazırlık klasörü silinmez; dosyaların tek kopyası oradadır.
+    """
+
+    def __init__(self, target_folder, backup_folder=None, store=None):
+        self.target_folder = os.path.abspath(target_folder)
+        self.backup_folder = backup_folder
+        self.store = store or BACKUP_STORE
+        self.path = tempfile.mkdtemp(prefix="evrak_hazirlik_")
+        self._backups = ThreadPoolExecutor(max_workers=1, thread_name_prefix="evrak-yedek")
+        self._pending = []
+        self.kept = False
+
+    def final_path(self, staged_path):
+        """Hazırlık klasöründeki yolun yayımlandıktan sonraki karşılığı"""
+        rel_path = os.path.relpath(os.path.abspath(staged_path), self.path)
+        if rel_path.startswith(os.pardir):
+            return staged_path
+        return os.path.join(self.target_folder, rel_path)
+
+    def stage(self, outputs):
+        """Üretilen belgelerin yedeğini arka planda alır (PDF'ler yedeklenmez)"""
+        if not self.backup_folder:
+            return
+        for path in outputs:
+            if path.lower().endswith(".pdf") or not path.startswith(self.path):
+                continue
+            backup_path = os.path.join(self.backup_folder, os.path.basename(path))
+            self._pending.append(self._backups.submit(self._backup, path, backup_path))
+
+    def _backup(self, path, backup_path):
+        """Arka plan yedeği; "yedek" aşaması genel metrik kaydına, görev aralığı yedek iş parçacığının
+        izine yazılır"""
+        with TRACE.span("yedek", "gorev"), METRICS.stage("yedek") as m:
+            self.store.backup(path, backup_path)
+            m["bayt"] = os.path.getsize(path)
+
+    @staticmethod
+    def _publish_file(src, dst):
+        try:
+            os.replace(src, dst)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            # Farklı dosya sistemi: hedef klasörde geçici adla kopyala, sonra atomik olarak değiştir
+            tmp_path = f"{dst}.{os.getpid()}.tmp"
+            shutil.copyfile(src, tmp_path)
+            os.replace(tmp_path, dst)
+            os.remove(src)
+
+    def publish(self):
+        """Yedeklerin bitmesini bekler, hazırlanan tüm dosyaları hedefe taşır; {hazırlık yolu: hedef yolu}"""
+        for future in self._pending:
+            try:
+                future.result()
+            except Exception as e:
+                logging.error(f"Yedek alınamadı: {e}")
+        self._backups.shutdown(wait=True)
+        published = {}
+        failed = []
+        for dirpath, _, filenames in os.walk(self.path):
+            for name in filenames:
+                if name.endswith(".tmp"):
+                    continue
+                src = os.path.join(dirpath, name)
+                dst = self.final_path(src)
+                os.makedirs(os.path.dirname(dst), exist_ok=True)
+                try:
+                    self._publish_file(src, dst)
+                    published[src] = dst
+                except OSError as e:
+                    failed.append(src)
+                    logging.error(f"Dosya yayımlanamadı: {dst} ({e})")
+        if failed:
+            self.kept = True
+            logging.warning(f"Yayımlanamayan {len(failed)} dosya hazırlık klasöründe bırakıldı: {self.path}")
+        self.close()
+        logging.info(f"Hazırlanan {len(published)} dosya yayımlandı: {self.target_folder}")
+        return published
+
+    def close(self):
+        """Yedek iş parçacığını durdurur, hazırlık klasörünü siler (yayımlanamayan dosya varsa bırakır)"""
+        self._backups.shutdown(wait=True, cancel_futures=True)
+        if not self.kept:
+            shutil.rmtree(self.path, ignore_errors=True)
 
 
 class DocumentProcessor:
@@ -151,6 +1175,78 @@ class DocumentProcessor:
         norm2 = DocumentProcessor.normalize_text_for_comparison(text2)
         return (text1.upper() == text2.upper()) or (norm1 == norm2) or (text2.upper() in text1.upper()) or (norm2 in norm1)
     
+    @staticmethod
+    def fill_document(doc, replacements):
+        """Açık Word belgesindeki placeholder'ları doldurur, değişiklik sayısını döndürür"""
+        replacement_count = 0
+        
+        # Tüm metin içeriklerini işle
+        text_elements = []
+        
+        # Paragrafları topla
+        for paragraph in doc.paragraphs:
+            text_elements.append(('paragraph', paragraph))
+        
+        # Tabloları topla
+        for table in doc.tables:
+            for row in table.rows:
+                for cell in row.cells:
+                    for paragraph in cell.paragraphs:
+                        text_elements.append(('table', paragraph))
+        
+        # Header'ları topla
+        for section in doc.sections:
+            if section.header:
+                for paragraph in section.header.paragraphs:
+                    text_elements.append(('header', paragraph))
+                    
+            if section.footer:
+                for paragraph in section.footer.paragraphs:
+                    text_elements.append(('footer', paragraph))
+        
+        # Tüm elementleri işle
+        for element_type, paragraph in text_elements:
+            original_text = paragraph.text
+            new_text = original_text
+            
+            # Değiştirmeleri uygula
+            for key, value in replacements.items():
+                if key and key in new_text:
+                    new_text = new_text.replace(key, str(value) if value else "")
+                    replacement_count += 1
+                    cell_log.debug("%s - %s -> %s", element_type, key, value)
+            
+            # Değişiklik varsa güncelle
+            if new_text != original_text:
+                # Paragrafın tüm run'larını temizle ve yeni metni yaz
+                for run in paragraph.runs:
+                    run.text = ""
+                
+                if paragraph.runs:
+                    paragraph.runs[0].text = new_text
+                else:
+                    paragraph.add_run(new_text)
+        return replacement_count
+
+    @staticmethod
+    def render_word_document(src_path, replacements):
+        """Word şablonunu bellekte doldurur ve belge baytlarını döndürür (aynı girdiler önbellekten gelir)"""
+        from docx import Document
+        cache_key = RENDER_CACHE.key(src_path, replacements)
+        cached = RENDER_CACHE.get(cache_key)
+        if cached is not None:
+            METRICS.add("onbellek", 0.0, len(cached))
+            logging.info(f"Belge önbellekten alındı: {os.path.basename(src_path)}")
+            return cached
+        with METRICS.stage("sablon_okuma"):
+            doc = Document(TEMPLATE_CACHE.open(src_path))
+        with METRICS.stage("doldurma"):
+            replacement_count = DocumentProcessor.fill_document(doc, replacements)
+        logging.info(f"Toplam {replacement_count} değişiklik yapıldı")
+        data = package_bytes(doc)
+        RENDER_CACHE.put(cache_key, data)
+        return data
+
     @staticmethod
     def process_word_document(src_path, dst_path, replacements):
         """Word belgesini python-docx ile işler"""
@@ -161,61 +1257,18 @@ class DocumentProcessor:
         logging.info(f"Word işleme başladı: {os.path.basename(src_path)}")
         
         try:
-            # Belgeyi aç
-            doc = Document(src_path)
-            replacement_count = 0
-            
-            # Tüm metin içeriklerini işle
-            text_elements = []
-            
-            # Paragrafları topla
-            for paragraph in doc.paragraphs:
-                text_elements.append(('paragraph', paragraph))
-            
-            # Tabloları topla
-            for table in doc.tables:
-                for row in table.rows:
-                    for cell in row.cells:
-                        for paragraph in cell.paragraphs:
-                            text_elements.append(('table', paragraph))
-            
-            # Header'ları topla
-            for section in doc.sections:
-                if section.header:
-                    for paragraph in section.header.paragraphs:
-                        text_elements.append(('header', paragraph))
-                        
-                if section.footer:
-                    for paragraph in section.footer.paragraphs:
-                        text_elements.append(('footer', paragraph))
-            
-            # Tüm elementleri işle
-            for element_type, paragraph in text_elements:
-                original_text = paragraph.text
-                new_text = original_text
-                
-                # Değiştirmeleri uygula
-                for key, value in replacements.items():
-                    if key and key in new_text:
-                        new_text = new_text.replace(key, str(value) if value else "")
-                        replacement_count += 1
-                        logging.debug(f"{element_type} - {key} -> {value}")
-                
-                # Değişiklik varsa güncelle
-                if new_text != original_text:
-                    # Paragrafın tüm run'larını temizle ve yeni metni yaz
-                    for run in paragraph.runs:
-                        run.text = ""
-                    
-                    if paragraph.runs:
-                        paragraph.runs[0].text = new_text
-                    else:
-                        paragraph.add_run(new_text)
-            
-            logging.info(f"Toplam {replacement_count} değişiklik yapıldı")
+            # Şablon ise bellekte doldurulur; aynı dosya üzerinde çalışılıyorsa yerinde güncellenir
+            if os.path.abspath(src_path) != os.path.abspath(dst_path):
+                data = DocumentProcessor.render_word_document(src_path, replacements)
+            else:
+                from docx import Document
+                doc = Document(src_path)
+                replacement_count = DocumentProcessor.fill_document(doc, replacements)
+                logging.info(f"Toplam {replacement_count} değişiklik yapıldı")
+                data = package_bytes(doc)
             
             # Belgeyi kaydet
-            doc.save(dst_path)
+            _write_bytes(dst_path, data)
             logging.info(f"Belge kaydedildi: {dst_path}")
             
             return True
@@ -225,60 +1278,99 @@ class DocumentProcessor:
             logging.error(traceback.format_exc())
             return False
     
+    @staticmethod
+    def fill_worksheet(ws, replacements):
+        """Tek sayfadaki placeholder'ları doldurur, değişiklik sayısını döndürür"""
+        replacement_count = 0
+        for row in ws.iter_rows():
+            for cell in row:
+                if isinstance(cell.value, str):
+                    original_text = cell.value
+                    new_text = original_text
+                    
+                    # Önce replacement dictionary'deki anahtarları değiştir
+                    for key, value in replacements.items():
+                        if key in new_text:
+                            new_text = new_text.replace(key, str(value))
+                            replacement_count += 1
+                    
+                    # Sonra replacement'ta olmayan placeholder'ları tamamen sil
+                    # Faaliyet tarihi placeholder'ını özel olarak kontrol et
+                    if "[DEĞİŞTİR:FAALİYETTARİH]" in new_text and "[DEĞİŞTİR:FAALİYETTARİH]" not in replacements:
+                        new_text = new_text.replace("[DEĞİŞTİR:FAALİYETTARİH]", "")
+                        replacement_count += 1
+                        cell_log.debug("Faaliyet tarihi placeholder'ı Excel'den silindi")
+                    
+                    if new_text != original_text:
+                        cell.value = new_text
+        return replacement_count
+
+    @staticmethod
+    def fill_workbook(wb, replacements, filename):
+        """Açık çalışma kitabındaki placeholder'ları doldurur, değişiklik sayısını döndürür"""
+        replacement_count = 0
+        
+        for ws in wb.worksheets:
+            replacement_count += DocumentProcessor.fill_worksheet(ws, replacements)
+        
+        # Özel işleme: Yıllık Değerlendirme Raporu için RD yöntemi güncellemesi
+        filter_log.debug("Excel dosya adı kontrol ediliyor: '%s'", filename)
+        
+        # Debug için tüm kontrolleri yaz - case insensitive
+        filename_normalized = unicodedata.normalize('NFKC', filename.upper())
+        check1 = DocumentProcessor.safe_string_comparison(filename_normalized, "YILLIK")
+        check2 = (DocumentProcessor.safe_string_comparison(filename_normalized, "DEĞERLENDIRME") or 
+                 DocumentProcessor.safe_string_comparison(filename_normalized, "DEGERLENDIRME"))
+        check3 = DocumentProcessor.safe_string_comparison(filename_normalized, "RAPORU")
+        filter_log.debug("Excel kontrolleri: Yıllık=%s, Değerlendirme=%s, Raporu=%s", check1, check2, check3)
+        filter_log.debug("Normalized filename: '%s'", filename_normalized)
+        
+        # Daha geniş kontrolle Yıllık Değerlendirme Raporu'nu yakala
+        if check1 and check2 and check3:
+            logging.info("Yıllık Değerlendirme Raporu tespit edildi - RD yöntemi güncelleniyor")
+            DocumentProcessor.update_rd_method_in_excel(wb, replacements)
+        else:
+            filter_log.debug("Normal Excel dosyası - RD güncelleme yok")
+        return replacement_count
+    
+    @staticmethod
+    def render_excel_document(src_path, replacements):
+        """Excel şablonunu bellekte doldurur ve çalışma kitabı baytlarını döndürür (aynı girdiler önbellekten gelir)"""
+        from openpyxl import load_workbook
+        # RD yöntemi hücresi şablonda placeholder olarak geçmediği için anahtara ayrıca eklenir
+        cache_key = RENDER_CACHE.key(src_path, replacements,
+                                     (os.path.basename(src_path), replacements.get("[DEĞİŞTİR:RDYONTEMI]")))
+        cached = RENDER_CACHE.get(cache_key)
+        if cached is not None:
+            METRICS.add("onbellek", 0.0, len(cached))
+            logging.info(f"Excel önbellekten alındı: {os.path.basename(src_path)}")
+            return cached
+        with METRICS.stage("sablon_okuma"):
+            wb = load_workbook(TEMPLATE_CACHE.open(src_path))
+        with METRICS.stage("doldurma"):
+            replacement_count = DocumentProcessor.fill_workbook(wb, replacements, os.path.basename(src_path))
+        logging.info(f"Excel dolduruldu. {replacement_count} değişiklik yapıldı.")
+        data = package_bytes(wb)
+        RENDER_CACHE.put(cache_key, data)
+        return data
+
     @staticmethod
     def process_excel_document(src_path, dst_path, replacements):
         """Excel belgesini işler"""
+        from openpyxl import load_workbook
         logging.info(f"Excel işleme başladı: {os.path.basename(src_path)}")
         
         try:
-            wb = load_workbook(src_path)
-            replacement_count = 0
-            
-            for ws in wb.worksheets:
-                for row in ws.iter_rows():
-                    for cell in row:
-                        if isinstance(cell.value, str):
-                            original_text = cell.value
-                            new_text = original_text
-                            
-                            # Önce replacement dictionary'deki anahtarları değiştir
-                            for key, value in replacements.items():
-                                if key in new_text:
-                                    new_text = new_text.replace(key, str(value))
-                                    replacement_count += 1
-                            
-                            # Sonra replacement'ta olmayan placeholder'ları tamamen sil
-                            # Faaliyet tarihi placeholder'ını özel olarak kontrol et
-                            if "[DEĞİŞTİR:FAALİYETTARİH]" in new_text and "[DEĞİŞTİR:FAALİYETTARİH]" not in replacements:
-                                new_text = new_text.replace("[DEĞİŞTİR:FAALİYETTARİH]", "")
-                                replacement_count += 1
-                                logging.info("Faaliyet tarihi placeholder'ı Excel'den silindi")
-                            
-                            if new_text != original_text:
-                                cell.value = new_text
-            
-            # Özel işleme: Yıllık Değerlendirme Raporu için RD yöntemi güncellemesi
-            filename = os.path.basename(src_path)
-            logging.info(f"Excel dosya adı kontrol ediliyor: '{filename}'")
-            
-            # Debug için tüm kontrolleri yaz - case insensitive
-            filename_normalized = unicodedata.normalize('NFKC', filename.upper())
-            check1 = DocumentProcessor.safe_string_comparison(filename_normalized, "YILLIK")
-            check2 = (DocumentProcessor.safe_string_comparison(filename_normalized, "DEĞERLENDIRME") or 
-                     DocumentProcessor.safe_string_comparison(filename_normalized, "DEGERLENDIRME"))
-            check3 = DocumentProcessor.safe_string_comparison(filename_normalized, "RAPORU")
-            logging.info(f"[DEBUG] Excel kontrolleri: Yıllık={check1}, Değerlendirme={check2}, Raporu={check3}")
-            logging.info(f"[DEBUG] Normalized filename: '{filename_normalized}'")
-            
-            # Daha geniş kontrolle Yıllık Değerlendirme Raporu'nu yakala
-            if check1 and check2 and check3:
-                logging.info("Yıllık Değerlendirme Raporu tespit edildi - RD yöntemi güncelleniyor")
-                DocumentProcessor.update_rd_method_in_excel(wb, replacements)
+            if os.path.abspath(src_path) != os.path.abspath(dst_path):
+                data = DocumentProcessor.render_excel_document(src_path, replacements)
             else:
-                logging.info("Normal Excel dosyası - RD güncelleme yok")
+                wb = load_workbook(src_path)
+                replacement_count = DocumentProcessor.fill_workbook(wb, replacements, os.path.basename(src_path))
+                logging.info(f"Excel dolduruldu. {replacement_count} değişiklik yapıldı.")
+                data = package_bytes(wb)
             
-            wb.save(dst_path)
-            logging.info(f"Excel kaydedildi. {replacement_count} değişiklik yapıldı.")
+            _write_bytes(dst_path, data)
+            logging.info(f"Excel kaydedildi: {dst_path}")
             return True
             
         except Exception as e:
@@ -331,8 +1423,20 @@ class DocumentProcessor:
 
 class PDFConverter:
     """PDF dönüştürme sınıfı"""
+
+    @staticmethod
+    def _libreoffice_command(src_path, out_dir):
+        """LibreOffice komutunu oluşturur; işçi süreçlerinde ayrı kullanıcı profili kullanılır
+        (aynı profille eşzamanlı çalışan soffice örnekleri dönüştürmeyi sessizce atlar)"""
+        cmd = [LIBREOFFICE_BINARY, "--headless"]
+        if IS_WORKER_PROCESS:
+            profile = Path(tempfile.gettempdir()) / f"evrak_lo_profile_{os.getpid()}"
+            cmd.append(f"-env:UserInstallation={profile.as_uri()}")
+        cmd += ["--convert-to", "pdf", "--outdir", out_dir, os.path.abspath(src_path)]
+        return cmd
     
     @staticmethod
+    @METRICS.timed("pdf")
     def export_pdf_from_docx(docx_path, pdf_path):
         """
         Word belgesini PDF'e dönüştürür:
@@ -373,13 +1477,9 @@ class PDFConverter:
                 os.makedirs(os.path.dirname(pdf_path), exist_ok=True)
                 
                 logging.info(f"LibreOffice komutu: {LIBREOFFICE_BINARY} --headless --convert-to pdf --outdir {os.path.dirname(pdf_path)} {docx_path}")
-                subprocess.run([
-                    LIBREOFFICE_BINARY,
-                    "--headless",
-                    "--convert-to", "pdf",
-                    "--outdir", os.path.dirname(pdf_path),
-                    os.path.abspath(docx_path)
-                ], check=True, timeout=60)
+                subprocess.run(
+                    PDFConverter._libreoffice_command(docx_path, os.path.dirname(pdf_path)),
+                    check=True, timeout=60)
                 
                 # LibreOffice genellikle dosya adını değiştirir, kontrol et
                 expected_pdf = os.path.join(os.path.dirname(pdf_path), 
@@ -396,6 +1496,7 @@ class PDFConverter:
                 logging.error(f"PDF dönüştürme hatası (LibreOffice): {e}")
                 return False    
     @staticmethod
+    @METRICS.timed("pdf")
     def export_pdf_from_xlsx(xlsx_path, pdf_path):
         """
         Excel belgesini PDF'e dönüştürür:
@@ -430,13 +1531,9 @@ class PDFConverter:
                 os.makedirs(os.path.dirname(pdf_path), exist_ok=True)
                 
                 logging.info(f"LibreOffice komutu: {LIBREOFFICE_BINARY} --headless --convert-to pdf --outdir {os.path.dirname(pdf_path)} {xlsx_path}")
-                subprocess.run([
-                    LIBREOFFICE_BINARY,
-                    "--headless",
-                    "--convert-to", "pdf",
-                    "--outdir", os.path.dirname(pdf_path),
-                    os.path.abspath(xlsx_path)
-                ], check=True, timeout=60)
+                subprocess.run(
+                    PDFConverter._libreoffice_command(xlsx_path, os.path.dirname(pdf_path)),
+                    check=True, timeout=60)
                 
                 # LibreOffice genellikle dosya adını değiştirir, kontrol et
                 expected_pdf = os.path.join(os.path.dirname(pdf_path), 
@@ -453,12 +1550,312 @@ class PDFConverter:
                 logging.error(f"PDF dönüştürme hatası (LibreOffice): {e}")
                 return False
 
+class KeyValueTable:
+    """veri.xlsx ve yıllıkverileri.xlsx gibi küçük Anahtar/Karşılık tabloları için pandas'sız okuyucu/yazıcı
+
+    Hücreler metin olarak tutulur (boş hücre ""). Okunan tablo dosya değişmedikçe bellekten döner ve
+    paylaşıldığı için yerinde değiştirilmez; with_values yeni tablo döndürür.
+    """
+
+    KEY = "Anahtar"
+    VALUE = "Karşılık"
+    _cache = {}
+    _cache_lock = threading.Lock()
+
+    def __init__(self, columns, rows=()):
+        self.columns = list(columns)
+        self.rows = [tuple(row) for row in rows]
+
+    @staticmethod
+    def _text(value):
+        return "" if value is None else str(value)
+
+    @classmethod
+    def read(cls, path):
+        """İlk sayfayı salt okunur açar; başlık satırı sütun adlarıdır, tamamen boş satırlar atlanır"""
+        stat = os.stat(path)
+        key, signature = os.path.abspath(path), (stat.st_mtime_ns, stat.st_size)
+        with cls._cache_lock:
+            cached = cls._cache.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        from openpyxl import load_workbook
+        wb = load_workbook(path, read_only=True, data_only=True)
+        try:
+            rows = wb.worksheets[0].iter_rows(values_only=True)
+            columns = [cls._text(c) for c in next(rows, ())]
+            while columns and not columns[-1]:
+                columns.pop()
+            width = len(columns)
+            data = []
+            for row in rows:
+                values = tuple(cls._text(v) for v in row[:width])
+                if any(values):
+                    data.append(values + ("",) * (width - len(values)))
+        finally:
+            wb.close()
+        table = cls(columns, data)
+        with cls._cache_lock:
+            cls._cache[key] = (signature, table)
+        return table
+
+    @classmethod
+    def prime(cls, path, table):
+        """Dosyaya yeni yazılmış içeriği önbelleğe koyar; sonraki read dosyayı yeniden ayrıştırmaz"""
+        stat = os.stat(path)
+        with cls._cache_lock:
+            cls._cache[os.path.abspath(path)] = ((stat.st_mtime_ns, stat.st_size), table)
+
+    def column(self, name):
+        index = self.columns.index(name)
+        return [row[index] for row in self.rows]
+
+    def mapping(self, value_column=VALUE):
+        """Anahtar → değer sözlüğü (anahtarı boş satırlar atlanır)"""
+        key_index, value_index = self.columns.index(self.KEY), self.columns.index(value_column)
+        return {row[key_index]: row[value_index] for row in self.rows if row[key_index]}
+
+    def with_values(self, replacements, value_column=VALUE):
+        """Anahtarı replacements'ta geçen satırların değerini güncellenmiş yeni tablo"""
+        key_index, value_index = self.columns.index(self.KEY), self.columns.index(value_column)
+        rows = []
+        for row in self.rows:
+            if row[key_index] in replacements:
+                row = row[:value_index] + (self._text(replacements[row[key_index]]),) + row[value_index + 1:]
+            rows.append(row)
+        return KeyValueTable(self.columns, rows)
+
+    def write(self, path):
+        """Tabloyu tek sayfalık xlsx olarak yazar (boş değerler boş hücre olur)"""
+        from openpyxl import Workbook
+        BackupStore.detach(path)
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("Sheet1")
+        ws.append(self.columns)
+        for row in self.rows:
+            ws.append([value if value != "" else None for value in row])
+        wb.save(path)
+
+
+class CompanyDirectory:
+    """ANKARA işyeri ve NACE tablolarını bir kez yükler, SGK → satır indeksini bellekte tutar"""
+
+    # ANKARA tablosu sütun indeksleri (FormModülü eşlemesiyle aynı)
+    COL_IL = 3
+    COL_SIRKET = 4
+    COL_ISYERI = 5
+    COL_PROJE = 6
+    COL_NACE = 9
+    COL_SGK_SICIL = 10
+    COL_KISA_SGK = 15
+    COL_TEHLIKE = 16
+    COL_CALISAN = 19
+    COL_UZMAN = 21
+    COL_HEKIM = 25
+    COL_ADRES = 31
+
+    def __init__(self, ankara_path="ANKARA İŞYERİ TABLOSU.xlsx", nace_path="Nace Kod Listesi.xlsx"):
+        self.ankara_path = ankara_path
+        self.nace_path = nace_path
+        self._rows = {}
+        self._nace = {}
+        self._signature = None
+        self._search = None
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # İşçi süreçlerine tablolar kilit ve arama indeksi olmadan aktarılır
+        state = self.__dict__.copy()
+        del state["_lock"]
+        state["_search"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _resolve_path(path, keyword):
+        """Dosya adı farklı olabilir; önce literal, sonra klasörde anahtar kelime içeren xlsx aranır"""
+        if os.path.exists(path):
+            return path
+        for f in os.listdir():
+            if keyword in f.upper() and f.lower().endswith(".xlsx"):
+                return f
+        return path
+
+    @staticmethod
+    def _cell(value):
+        """NaN değerleri boş string olarak döndürür"""
+        return "" if value is None or value != value else str(value)
+
+    def _current_signature(self):
+        signature = []
+        for path, keyword in ((self.ankara_path, "ANKARA"), (self.nace_path, "NACE")):
+            resolved = self._resolve_path(path, keyword)
+            try:
+                st = os.stat(resolved)
+                signature.append((resolved, st.st_mtime_ns, st.st_size))
+            except OSError:
+                signature.append((resolved, None, None))
+        return tuple(signature)
+
+    def load(self, force=False):
+        """Tablolar değiştiyse (veya ilk kez) yükler; değişmediyse önbelleği kullanır"""
+        with self._lock:
+            signature = self._current_signature()
+            if not force and signature == self._signature:
+                return
+            (ankara_file, _, _), (nace_file, _, _) = signature
+            import pandas as pd
+            with METRICS.stage("firma_tablosu"):
+                df_ank = pd.read_excel(ankara_file, dtype=str, engine='openpyxl')
+                sgk_col = df_ank.columns.get_loc("KISA SGK") if "KISA SGK" in df_ank.columns else self.COL_KISA_SGK
+                rows = {}
+                for values in df_ank.itertuples(index=False, name=None):
+                    kod = self._cell(values[sgk_col]).strip()
+                    # Aynı SGK birden fazla satırda ise ilk satır geçerlidir
+                    if kod and kod not in rows:
+                        rows[kod] = tuple(self._cell(v) for v in values)
+                nace = {}
+                try:
+                    df_nace = pd.read_excel(nace_file, dtype=str, engine='openpyxl')
+                    for kod, aciklama in df_nace.iloc[:, :2].itertuples(index=False, name=None):
+                        kod = str(kod).strip()
+                        if kod not in nace:
+                            nace[kod] = self._cell(aciklama)
+                except Exception as e:
+                    logging.error(f"NACE tablosu yükleme hatası: {e}")
+                self._rows, self._nace, self._signature = rows, nace, signature
+                self._search = None
+                logging.info(f"Firma dizini yüklendi: {len(rows)} SGK, {len(nace)} NACE kodu")
+
+    def find_row(self, sgk):
+        """SGK koduna göre ANKARA satırını (tuple) döndürür"""
+        self.load()
+        return self._rows.get(str(sgk).strip())
+
+    def nace_description(self, nace_kod):
+        """NACE koduna karşılık gelen faaliyet açıklamasını döndürür"""
+        self.load()
+        return self._nace.get(str(nace_kod).strip(), "")
+
+    def search_index(self):
+        """SGK kodu ve şirket türü/işyeri/proje adları üzerinde önek indeksi (tablo değişene kadar bir kez kurulur)"""
+        self.load()
+        with self._lock:
+            if self._search is None:
+                self._search = CompanySearchIndex.from_rows(self._rows, sirket_col=self.COL_SIRKET,
+                                                            isyeri_col=self.COL_ISYERI,
+                                                            proje_col=self.COL_PROJE)
+                logging.info(f"Firma arama indeksi kuruldu: {len(self._search)} firma")
+            return self._search
+
+    @METRICS.timed("firma_arama")
+    def company_fields(self, sgk):
+        """SGK koduna göre firma placeholder değerlerini üretir; bulunamazsa None"""
+        r = self.find_row(sgk)
+        if r is None:
+            return None
+        sirket = r[self.COL_SIRKET]
+        proje = r[self.COL_PROJE]
+        fields = {
+            "[DEĞİŞTİR:İL]": r[self.COL_IL],
+            "[DEĞİŞTİR:ŞİRKET UNVANI]": sirket,
+            "[DEĞİŞTİR:PROJEADI]": proje,
+            "[DEĞİŞTİR:ADRES]": r[self.COL_ADRES],
+            "[DEĞİŞTİR:SGKSİCİL]": r[self.COL_SGK_SICIL],
+            "[DEĞİŞTİR:SGKSİCİL20PUNTO]": r[self.COL_SGK_SICIL],
+            "[DEĞİŞTİR:NACE]": r[self.COL_NACE],
+            "[DEĞİŞTİR:TEHLİKESINIFI]": r[self.COL_TEHLIKE],
+            "[DEĞİŞTİR:ÇALIŞANSAYISI]": r[self.COL_CALISAN],
+            "[DEĞİŞTİR:UZMANADI]": r[self.COL_UZMAN],
+            "[DEĞİŞTİR:HEKİMADI]": r[self.COL_HEKIM],
+            "[DEĞİŞTİR:ŞİRKET UNVANI20PUNTO]": sirket,
+            "[DEĞİŞTİR:PROJEADI20PUNTO]": proje,
+        }
+        # Grup dışı kontrolü
+        if "GRUP DIŞI" in sirket.upper():
+            fields["[DEĞİŞTİR:ŞİRKET UNVANI]"] = proje
+            fields["[DEĞİŞTİR:ŞİRKET UNVANI20PUNTO]"] = proje
+            fields["[DEĞİŞTİR:PROJEADI]"] = ""
+            fields["[DEĞİŞTİR:PROJEADI20PUNTO]"] = ""
+            fields["[DEĞİŞTİR:ŞİRKETPROJE]"] = proje
+        else:
+            fields["[DEĞİŞTİR:ŞİRKETPROJE]"] = f"{sirket} - {proje}" if proje else sirket
+        # NACE açıklaması ve kombinasyon
+        nace_kod = fields["[DEĞİŞTİR:NACE]"]
+        aciklama = self.nace_description(nace_kod) if nace_kod else ""
+        fields["[DEĞİŞTİR:NACEFAALİYET]"] = aciklama
+        if aciklama:
+            fields["[DEĞİŞTİR:NACEVEFAALİYET]"] = f"{nace_kod} - {aciklama}"
+        return fields
+
+
+class FormHost:
+    """FORMMODULU ana süreçte açıldığında firma dizinini ve veri tablolarını forma paylaştırır
+
+    Form SGK satırını, SGK arama indeksini ve NACE açıklamasını generator'ın dizininden alır;
+    kaydedilen veriler KeyValueTable önbelleğine yazılır, sonraki üretim veri.xlsx'i yeniden ayrıştırmaz.
+    """
+
+    DATA_FILE = "veri.xlsx"
+    CONFIG_FILE = "veri_yapilandirma_GUNCEL.xlsx"
+
+    def __init__(self, generator):
+        self.directory = generator.directory
+
+    def find_row(self, sgk):
+        return self.directory.find_row(sgk)
+
+    def nace_description(self, nace_kod):
+        return self.directory.nace_description(nace_kod)
+
+    def search_index(self):
+        return self.directory.search_index()
+
+    def config_table(self):
+        table = KeyValueTable.read(self.CONFIG_FILE)
+        return table.columns, table.rows
+
+    def saved(self, columns, rows):
+        """Form veri.xlsx ve yapılandırma dosyasını yazdıktan sonra çağrılır"""
+        table = KeyValueTable(columns, (tuple(KeyValueTable._text(v) for v in row) for row in rows))
+        for path in (self.DATA_FILE, self.CONFIG_FILE):
+            try:
+                KeyValueTable.prime(path, table)
+            except OSError as e:
+                logging.error(f"Form verisi önbelleğe alınamadı: {path} ({e})")
+        logging.info(f"Form verileri paylaşıldı: {len(table.rows)} anahtar")
+
+
 class EvrakGenerator:
     """Ana evrak oluşturma sınıfı"""
-    
-    def __init__(self):
+
+    def __init__(self, directory=None):
         self.processor = DocumentProcessor()
         self.pdf_converter = PDFConverter()
+        self.directory = directory or CompanyDirectory()
+        # İş modunda oluşturulan dosyaların listesi (None ise kaydedilmez)
+        self.output_log = None
+        # Paralel belge üretimi için kalıcı süreç havuzu
+        self._pool = None
+        self._pool_workers = 0
+        self._rules_cache = None
+
+    def _backup(self, dst_path, backup_path):
+        """Çıktının yedeğini içerik adresli depoya alır (hedef ve yedek aynı dosyaysa atlanır)"""
+        if os.path.abspath(backup_path) == os.path.abspath(dst_path):
+            return False
+        with METRICS.stage("yedek") as m:
+            BACKUP_STORE.backup(dst_path, backup_path)
+            m["bayt"] = os.path.getsize(dst_path)
+        return True
+
+    def _record_output(self, path):
+        """İş modunda oluşturulan çıktı yolunu kaydeder"""
+        if self.output_log is not None:
+            self.output_log.append(os.path.abspath(path))
     
     def find_template_file(self, template_filename):
         """Platform uyumlu template dosya arama"""
@@ -499,23 +1896,17 @@ class EvrakGenerator:
         logging.error(f"Çalışma dizini: {os.getcwd()}")
         return None
     
+    @METRICS.timed("veri_yukleme")
     def load_replacements(self):
-        """veri.xlsx dosyasından değiştirme verilerini yükler"""
+        """veri.xlsx dosyasından değiştirme verilerini yükler: (replacements, KeyValueTable)"""
         try:
-            df = pd.read_excel("veri.xlsx", dtype=str, engine='openpyxl')
+            table = KeyValueTable.read("veri.xlsx")
             logging.info("veri.xlsx başarıyla yüklendi")
             
-            replacements = {}
-            for _, row in df.iterrows():
-                key = row["Anahtar"]
-                value = row["Karşılık"]
-                if pd.notna(key) and pd.notna(value):
-                    replacements[str(key)] = str(value)
-                elif pd.notna(key):
-                    replacements[str(key)] = ""
+            replacements = table.mapping()
             
             logging.info(f"Toplam {len(replacements)} anahtar yüklendi")
-            return replacements, df
+            return replacements, table
             
         except FileNotFoundError:
             logging.error("veri.xlsx bulunamadı")
@@ -594,19 +1985,18 @@ class EvrakGenerator:
                 should_include = True
                 
                 if rd_method:
-                    logging.info(f"[DEBUG] Filtreleme kontrol: RD='{rd_method}' (len={len(rd_method)}), Dosya={filename}")
+                    filter_log.debug("Filtreleme kontrol: RD='%s', Dosya=%s", rd_method, filename)
                     filename_upper = filename.upper().strip()
                     # Unicode normalization to handle Turkish characters
                     filename_normalized = unicodedata.normalize('NFKC', filename_upper)
                     
                     if rd_method == "Matris":
-                        logging.info(f"[DEBUG] Matris dalında - filename_normalized='{filename_normalized}'")
                         # Matris seçiliyse Fine Kinney dosyasını hariç tut
                         fine_kinney_patterns = ["FINE_KINNEY", "FİNE_KINNEY", "FINE KINNEY", "FİNE KINNEY"]
                         contains_fine_kinney = any(pattern in filename_normalized for pattern in fine_kinney_patterns)
-                        logging.info(f"[DEBUG] Fine Kinney kontrol: {contains_fine_kinney} - patterns: {fine_kinney_patterns}")
+                        filter_log.debug("Fine Kinney kontrol: %s", contains_fine_kinney)
                         if contains_fine_kinney:
-                            logging.info(f"[FILTER] Fine Kinney dosyası atlandı (Matris seçili): {filename}")
+                            filter_log.debug("Fine Kinney dosyası atlandı (Matris seçili): %s", filename)
                             should_include = False
                             filtered_count += 1
                     elif rd_method == "Fine Kinney":
@@ -614,15 +2004,15 @@ class EvrakGenerator:
                         matris_patterns = ["MATRIS", "MATRİS"]
                         contains_matris = any(pattern in filename_normalized for pattern in matris_patterns)
                         contains_risk = "RİSK" in filename_normalized or "RISK" in filename_normalized
-                        logging.info(f"[DEBUG] Matris kontrol: matris={contains_matris}, risk={contains_risk}")
+                        filter_log.debug("Matris kontrol: matris=%s, risk=%s", contains_matris, contains_risk)
                         if contains_matris and contains_risk:
-                            logging.info(f"[FILTER] Matris dosyası atlandı (Fine Kinney seçili): {filename}")
+                            filter_log.debug("Matris dosyası atlandı (Fine Kinney seçili): %s", filename)
                             should_include = False
                             filtered_count += 1
                 
                 if should_include:
                     documents.append(filename)
-                    logging.debug(f"[INCLUDE] Dahil edildi: {filename}")
+                    filter_log.debug("Dahil edildi: %s", filename)
         
         # Yıllık plan seçeneklerini ekle
         documents = self.process_yearly_plan_options(documents)
@@ -642,31 +2032,30 @@ class EvrakGenerator:
         
         # YILLIKLAR klasöründeki dosyaları kontrol et
         yilliklar_path = os.path.join("Evraklar", "YILLIKLAR")
-        logging.info(f"YILLIKLAR klasörü kontrol ediliyor: {yilliklar_path}")
-        logging.info(f"Klasör var mı: {os.path.exists(yilliklar_path)}")
+        filter_log.debug("YILLIKLAR klasörü kontrol ediliyor: %s", yilliklar_path)
         
         if os.path.exists(yilliklar_path):
             try:
                 files = os.listdir(yilliklar_path)
-                logging.info(f"YILLIKLAR klasöründeki dosyalar: {files}")
+                filter_log.debug("YILLIKLAR klasöründeki dosyalar: %s", files)
                 
                 for filename in files:
                     if filename.lower().endswith(".xlsx") and not filename.startswith("~$"):
                         filename_upper = filename.upper()
-                        logging.info(f"YILLIKLAR dosya kontrolü: {filename}")
+                        filter_log.debug("YILLIKLAR dosya kontrolü: %s", filename)
                         # ASCII tabanlı kontrol için aksanları kaldır
                         filename_stripped = DocumentProcessor.normalize_text_for_comparison(filename)
                         # Plan türlerini tespit et
                         if DocumentProcessor.safe_string_comparison(filename_stripped, "EGITIM"):
                             yearly_plans_found.append("Yıllık Eğitim Planı")
-                            logging.info("Yıllık Eğitim Planı bulundu!")
+                            filter_log.debug("Yıllık Eğitim Planı bulundu!")
                         elif DocumentProcessor.safe_string_comparison(filename_stripped, "CALISMA"):
                             yearly_plans_found.append("Yıllık Çalışma Planı")
-                            logging.info("Yıllık Çalışma Planı bulundu!")
+                            filter_log.debug("Yıllık Çalışma Planı bulundu!")
                         elif (DocumentProcessor.safe_string_comparison(filename_stripped, "DEGERLENDIRME") and 
                               DocumentProcessor.safe_string_comparison(filename_stripped, "RAPORU")):
                             yearly_plans_found.append("Yıllık Değerlendirme Raporu")
-                            logging.info("Yıllık Değerlendirme Raporu bulundu!")
+                            filter_log.debug("Yıllık Değerlendirme Raporu bulundu!")
             except Exception as e:
                 logging.error(f"YILLIKLAR klasörü okuma hatası: {e}")
         
@@ -700,8 +2089,9 @@ class EvrakGenerator:
         """Dosyanın yıllık değerlendirme raporu belgesi olup olmadığını kontrol eder"""
         return filename == "Yıllık Değerlendirme Raporu"
     
-    def process_yearly_plan_document(self, filename, replacements, project_name, target_folder, backup_folder):
-        """Yıllık plan belgesini özel algoritmayla işler"""
+    def render_yearly_plan(self, filename, replacements, project_name):
+        """Yıllık plan belgesini bellekte üretir, (hedef dosya adı, baytlar) döndürür"""
+        from openpyxl import load_workbook
         logging.info(f"=== Yıllık plan belgesi işleniyor: {filename} ===")
         
         # Yıl kontrolü yap
@@ -717,7 +2107,7 @@ class EvrakGenerator:
         template_path = self.select_yearly_template(filename, is_kurullu)
         if not template_path:
             logging.error(f"Yıllık plan template bulunamadı: {filename}")
-            return False
+            return None
         
         logging.info(f"Seçilen template: {template_path}")
         
@@ -729,41 +2119,74 @@ class EvrakGenerator:
         
         logging.info(f"Plan türü belirlendi: {plan_type} (dosya: {filename})")
         
-        # Hedef dosya yolları
         kurullu_text = "KURULLU" if is_kurullu else "KURULSUZ"
         dst_filename = f"{project_name} - Yıllık {plan_type} {kurullu_text}.xlsx"
-        dst_path = os.path.join(target_folder, dst_filename)
-        backup_path = os.path.join(backup_folder, dst_filename)
         
+        # Template bellekten açılır; tüm adımlar tek çalışma kitabında yapılıp bir kez paketlenir
+        with METRICS.stage("sablon_okuma"):
+            wb = load_workbook(TEMPLATE_CACHE.open(template_path))
+        
+        # Placeholder'ları doldur
+        with METRICS.stage("doldurma"):
+            self.processor.fill_workbook(wb, replacements, dst_filename)
+        
+        # Dinamik algoritma uygula (geçmiş ayları temizle)
+        if use_dynamic_algorithm:
+            logging.info("Dinamik algoritma uygulanıyor...")
+            with METRICS.stage("dinamik_algoritma"):
+                self.apply_dynamic_algorithm_to_workbook(wb, plan_type,
+                                                         replacements.get("[DEĞİŞTİR:YILLIK:TARİH]", None))
+            logging.info("Dinamik algoritma tamamlandı.")
+        # Yıllık silme kuralları her durumda uygula
+        logging.info("Yıllık silme kuralları uygulanıyor...")
+        with METRICS.stage("silme_kurallari"):
+            self.apply_yearly_deletion_rules_to_workbook(wb, plan_type, replacements)
+        logging.info("Yıllık silme kuralları tamamlandı.")
+        
+        data = package_bytes(wb)
+        wb.close()
+        return dst_filename, data
+
+    def render_yearly_report(self, replacements, project_name):
+        """Yıllık değerlendirme raporunu bellekte üretir, (hedef dosya adı, baytlar) döndürür"""
+        from openpyxl import load_workbook
+        # Dosya adı Unicode normalizasyonu platforma göre farklı olabilir (NFC/NFD)
+        template_path = self.find_template_file("YILLIK DEĞERLENDİRME RAPORU.xlsx")
+        if not template_path:
+            logging.error("Yıllık Değerlendirme Raporu template bulunamadı")
+            return None
+        dst_filename = f"{project_name} - Yıllık Değerlendirme Raporu.xlsx"
+        with METRICS.stage("sablon_okuma"):
+            wb = load_workbook(TEMPLATE_CACHE.open(template_path))
+        with METRICS.stage("doldurma"):
+            self.processor.fill_workbook(wb, replacements, dst_filename)
+        data = package_bytes(wb)
+        wb.close()
+        return dst_filename, data
+
+    def process_yearly_plan_document(self, filename, replacements, project_name, target_folder, backup_folder):
+        """Yıllık plan belgesini özel algoritmayla işler"""
         try:
-            # Template'i kopyala
-            shutil.copy2(template_path, dst_path)
-            logging.info(f"Template kopyalandı: {template_path} -> {dst_path}")
-            
-            # Placeholder'ları doldur
-            self.fill_excel_placeholders(dst_path, replacements)
-            
-            # Dinamik algoritma uygula (geçmiş ayları temizle)
-            if use_dynamic_algorithm:
-                logging.info("Dinamik algoritma uygulanıyor...")
-                self.apply_dynamic_algorithm(dst_path, plan_type,
-                                             replacements.get("[DEĞİŞTİR:YILLIK:TARİH]", None))
-                logging.info("Dinamik algoritma tamamlandı.")
-            # Yıllık silme kuralları her durumda uygula
-            logging.info("Yıllık silme kuralları uygulanıyor...")
-            self.apply_yearly_deletion_rules(dst_path, plan_type, replacements)
-            logging.info("Yıllık silme kuralları tamamlandı.")
+            rendered = self.render_yearly_plan(filename, replacements, project_name)
+            if rendered is None:
+                return False
+            dst_filename, data = rendered
+            dst_path = os.path.join(target_folder, dst_filename)
+            backup_path = os.path.join(backup_folder, dst_filename)
+            _write_bytes(dst_path, data)
+            logging.info(f"Yıllık plan kaydedildi: {dst_path}")
             
             # Yedek kopyala
-            shutil.copy(dst_path, backup_path)
+            self._backup(dst_path, backup_path)
+            self._record_output(dst_path)
             
             # PDF oluşturma tercihi
             if getattr(self, 'generate_pdf', False):
                 pdf_dir = os.path.join(target_folder, "PDF")
                 os.makedirs(pdf_dir, exist_ok=True)
-                pdf_filename = f"{project_name} - Yıllık {plan_type} {kurullu_text}.pdf"
-                pdf_path = os.path.join(pdf_dir, pdf_filename)
-                self.pdf_converter.export_pdf_from_xlsx(dst_path, pdf_path)
+                pdf_path = os.path.join(pdf_dir, os.path.splitext(dst_filename)[0] + ".pdf")
+                if self.pdf_converter.export_pdf_from_xlsx(dst_path, pdf_path):
+                    self._record_output(pdf_path)
                 logging.info(f"Yıllık plan PDF oluşturuldu: {pdf_path}")
             logging.info(f"Yıllık plan belgesi başarıyla oluşturuldu: {dst_filename}")
             return True
@@ -771,26 +2194,26 @@ class EvrakGenerator:
         except Exception as e:
             logging.error(f"Yıllık plan belgesi hatası: {e}")
             return False
+
     def process_yearly_report_document(self, filename, replacements, project_name, target_folder, backup_folder):
         """Yıllık değerlendirme raporu belgesini işler"""
         logging.info(f"=== Yıllık Değerlendirme Raporu işleniyor: {filename} ===")
-        template_path = os.path.join("Evraklar", "YILLIKLAR", "YILLIK DEĞERLENDİRME RAPORU.xlsx")
-        if not os.path.exists(template_path):
-            logging.error(f"Yıllık Değerlendirme Raporu template bulunamadı: {template_path}")
-            return False
-        dst_filename = f"{project_name} - Yıllık Değerlendirme Raporu.xlsx"
-        dst_path = os.path.join(target_folder, dst_filename)
-        backup_path = os.path.join(backup_folder, dst_filename)
         try:
-            shutil.copy2(template_path, dst_path)
-            self.fill_excel_placeholders(dst_path, replacements)
-            shutil.copy(dst_path, backup_path)
-            pdf_dir = os.path.join(target_folder, "PDF")
-            os.makedirs(pdf_dir, exist_ok=True)
-            pdf_filename = f"{project_name} - Yıllık Değerlendirme Raporu.pdf"
-            pdf_path = os.path.join(pdf_dir, pdf_filename)
+            rendered = self.render_yearly_report(replacements, project_name)
+            if rendered is None:
+                return False
+            dst_filename, data = rendered
+            dst_path = os.path.join(target_folder, dst_filename)
+            backup_path = os.path.join(backup_folder, dst_filename)
+            _write_bytes(dst_path, data)
+            self._backup(dst_path, backup_path)
+            self._record_output(dst_path)
             if getattr(self, 'generate_pdf', False):
-                self.pdf_converter.export_pdf_from_xlsx(dst_path, pdf_path)
+                pdf_dir = os.path.join(target_folder, "PDF")
+                os.makedirs(pdf_dir, exist_ok=True)
+                pdf_path = os.path.join(pdf_dir, os.path.splitext(dst_filename)[0] + ".pdf")
+                if self.pdf_converter.export_pdf_from_xlsx(dst_path, pdf_path):
+                    self._record_output(pdf_path)
                 logging.info(f"Yıllık Değerlendirme Raporu PDF oluşturuldu: {pdf_path}")
             logging.info(f"Yıllık Değerlendirme Raporu başarıyla oluşturuldu: {dst_filename}")
             return True
@@ -928,8 +2351,17 @@ class EvrakGenerator:
         """Dinamik algoritma - geçmiş ayları temizle (kullanıcı tarihine göre)"""
         try:
             from openpyxl import load_workbook
-            from openpyxl.styles import PatternFill, Font
+            wb = load_workbook(excel_path)
+            self.apply_dynamic_algorithm_to_workbook(wb, plan_type, tarih_str)
+            _write_bytes(excel_path, package_bytes(wb))
+            wb.close()
+        except Exception as e:
+            logging.error(f"Dinamik algoritma hatası: {e}")
+            logging.error(traceback.format_exc())
 
+    def apply_dynamic_algorithm_to_workbook(self, wb, plan_type, tarih_str=None):
+        """Dinamik algoritmayı açık çalışma kitabına uygular (kaydetmez)"""
+        try:
             # Başlık satırını tespit et
             header_row = 17 if "Eğitim" in plan_type else 6
             logging.info(f"Dinamik algoritma başlıyor - Plan türü: {plan_type}, Başlık satırı: {header_row}")
@@ -945,8 +2377,6 @@ class EvrakGenerator:
                 current_month = datetime.datetime.now().month
             logging.info(f"Dinamik tarih ayı: {current_month}")
             
-            # Excel dosyasını aç
-            wb = load_workbook(excel_path)
             ws = wb.active
             
             # Ay başlıklarını bul - tüm satırları tara
@@ -960,7 +2390,7 @@ class EvrakGenerator:
                     cell_value = ws.cell(row=row, column=col).value
                     if cell_value and str(cell_value).strip().upper() in ay_isimleri:
                         found_header_row = row
-                        logging.info(f"Ay başlıkları {row}. satırda bulundu!")
+                        cell_log.debug("Ay başlıkları %s. satırda bulundu", row)
                         break
                 if found_header_row:
                     break
@@ -969,25 +2399,22 @@ class EvrakGenerator:
                 header_row = found_header_row
                 logging.info(f"Güncellenen başlık satırı: {header_row}")
             
-            cleaned_count = 0
+            cleaned_months = []
+            cleared_cells = 0
             # Geçmiş ayları temizle
             for col in range(1, ws.max_column + 1):
                 cell_value = ws.cell(row=header_row, column=col).value
                 if cell_value and str(cell_value).strip().upper() in ay_isimleri:
                     ay_index = ay_isimleri.index(str(cell_value).strip().upper()) + 1
-                    logging.info(f"Ay bulundu: {cell_value}, Index: {ay_index}, Kolon: {col}")
+                    cell_log.debug("Ay bulundu: %s, Index: %s, Kolon: %s", cell_value, ay_index, col)
                     
                     # Eğer bu ay geçmiş aysa, sütunu temizle
                     if ay_index < current_month:
-                        self.clear_column_content(ws, col, header_row)
-                        cleaned_count += 1
-                        logging.info(f"Geçmiş ay temizlendi: {cell_value}")
+                        cleared_cells += self.clear_column_content(ws, col, header_row)
+                        cleaned_months.append(str(cell_value).strip())
             
-            logging.info(f"Toplam {cleaned_count} ay temizlendi")
-            
-            # Kaydet
-            wb.save(excel_path)
-            wb.close()
+            logging.info(f"Toplam {len(cleaned_months)} ay, {cleared_cells} hücre temizlendi: "
+                         f"{', '.join(cleaned_months)}")
             
         except Exception as e:
             logging.error(f"Dinamik algoritma hatası: {e}")
@@ -995,11 +2422,11 @@ class EvrakGenerator:
             logging.error(traceback.format_exc())
     
     def clear_column_content(self, worksheet, column_index, header_row):
-        """Sütun içeriğini temizler (başlık hariç)"""
+        """Sütun içeriğini temizler (başlık hariç), temizlenen hücre sayısını döndürür"""
+        cleared_count = 0
         try:
             from openpyxl.styles import PatternFill, Font
             
-            cleared_count = 0
             # Başlık satırından sonraki tüm hücreleri temizle
             for row in range(header_row + 1, worksheet.max_row + 1):
                 cell = worksheet.cell(row=row, column=column_index)
@@ -1014,29 +2441,58 @@ class EvrakGenerator:
                         cell.fill = PatternFill()
                         cell.font = Font()
                         cleared_count += 1
-                        logging.info(f"Satır {row}, Sütun {column_index}: '{original_value}' temizlendi")
+                        cell_log.debug("Satır %s, Sütun %s: '%s' temizlendi", row, column_index, original_value)
             
-            logging.info(f"Sütun {column_index}'da {cleared_count} hücre temizlendi")
+            cell_log.debug("Sütun %s'da %s hücre temizlendi", column_index, cleared_count)
                     
         except Exception as e:
             logging.error(f"Sütun temizleme hatası: {e}")
             import traceback
             logging.error(traceback.format_exc())
+        return cleared_count
+
+    def load_deletion_rules(self):
+        """YILLIK_SILME_KURALLARI.csv'yi okur; dosya değişmedikçe bellekteki kopyayı döndürür"""
+        path = "YILLIK_SILME_KURALLARI.csv"
+        stat = os.stat(path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if self._rules_cache is None or self._rules_cache[0] != signature:
+            rules = {}
+            with open(path, encoding='utf-8', newline='') as f:
+                for row in csv.DictReader(f):
+                    cell_str = row["hucreler"] or ""
+                    cells = [c.strip() for c in cell_str.split(";") if c.strip()]
+                    rules.setdefault((int(row["ay"]), str(row["plan_tipi"])), cells)
+            self._rules_cache = (signature, rules)
+            logging.info(f"Silme kuralları yüklendi: {len(rules)} kural")
+        return self._rules_cache[1]
 
     def apply_yearly_deletion_rules(self, excel_path, plan_type, replacements):
         """Yıllık silme kurallarına göre belirli hücreleri temizler."""
+        try:
+            from openpyxl import load_workbook
+            wb = load_workbook(excel_path)
+            if self.apply_yearly_deletion_rules_to_workbook(wb, plan_type, replacements):
+                _write_bytes(excel_path, package_bytes(wb))
+            wb.close()
+        except Exception as e:
+            logging.error(f"Yıllık silme kuralları hatası: {e}")
+            logging.error(traceback.format_exc())
+
+    def apply_yearly_deletion_rules_to_workbook(self, wb, plan_type, replacements):
+        """Silme kurallarını açık çalışma kitabına uygular; değişiklik yapıldıysa True döner"""
         try:
             # Tarih bilgisini al
             tarih_str = replacements.get("[DEĞİŞTİR:YILLIK:TARİH]", "")
             if not tarih_str:
                 logging.info("YILLIK:TARİH değeri bulunamadı, silme kuralları uygulanmayacak")
-                return
+                return False
             # Tarih formatı dd.mm.yyyy
             try:
                 tarih = datetime.datetime.strptime(tarih_str.strip(), "%d.%m.%Y")
             except Exception:
                 logging.error(f"Tarih parse edilemedi: {tarih_str}")
-                return
+                return False
             ay = tarih.month
             # Plan tipi anahtarını oluştur
             is_kurullu = self.get_calisanlar_sayisi(replacements) >= 50
@@ -1048,18 +2504,15 @@ class EvrakGenerator:
             plan_key = f"yillik_{base}_{kur_text}"
             logging.info(f"Yıllık silme kuralı hesaplandı: ay={ay}, plan_tipi={plan_key}")
             # Kuralları oku
-            df_rules = pd.read_csv("YILLIK_SILME_KURALLARI.csv", encoding='utf-8')
-            df_match = df_rules[(df_rules["ay"] == ay) & (df_rules["plan_tipi"] == plan_key)]
-            if df_match.empty:
+            rules = self.load_deletion_rules()
+            if (ay, plan_key) not in rules:
                 logging.info(f"Silme kuralı bulunamadı: ay={ay}, plan_tipi={plan_key}")
-                return
-            cell_str = df_match.iloc[0]["hucreler"]
-            if not cell_str or pd.isna(cell_str):
+                return False
+            cell_list = rules[(ay, plan_key)]
+            if not cell_list:
                 logging.info(f"Silinecek hücre yok: ay={ay}, plan_tipi={plan_key}")
-                return
-            cell_list = [c.strip() for c in cell_str.split(";") if c.strip()]
-            logging.info(f"Silinecek hücreler listesi ({len(cell_list)}): {cell_list}")
-            wb = load_workbook(excel_path)
+                return False
+            cell_log.debug("Silinecek hücreler listesi (%s): %s", len(cell_list), cell_list)
             ws = wb.active
             from openpyxl.styles import PatternFill, Font
             removed = 0
@@ -1070,13 +2523,13 @@ class EvrakGenerator:
                     cell.fill = PatternFill()
                     cell.font = Font()
                     removed += 1
-                    logging.info(f"Hücre silindi: {ref}")
-            wb.save(excel_path)
-            wb.close()
+                    cell_log.debug("Hücre silindi: %s", ref)
             logging.info(f"Toplam {removed} hücre silindi (YILLIK_SILME_KURALLARI)")
+            return removed > 0
         except Exception as e:
             logging.error(f"Yıllık silme kuralları hatası: {e}")
             logging.error(traceback.format_exc())
+            return False
     
     def fill_excel_placeholders(self, excel_path, replacements):
         """Excel dosyasındaki placeholder'ları doldurur"""
@@ -1094,8 +2547,9 @@ class EvrakGenerator:
             import traceback
             logging.error(traceback.format_exc())
     
-    def process_document(self, filename, replacements, project_name, target_folder, backup_folder):
-        """Tek bir belgeyi işler"""
+    def process_document(self, filename, replacements, project_name, target_folder, backup_folder,
+                         template_path=None):
+        """Tek bir belgeyi işler (template_path verilirse Evraklar yerine o şablon kullanılır)"""
         logging.info(f"\n=== İşlem başlıyor: {filename} ===")
         
         # Yıllık değerlendirme raporu veya plan kontrolü
@@ -1104,7 +2558,7 @@ class EvrakGenerator:
         if self.is_yearly_plan_document(filename):
             return self.process_yearly_plan_document(filename, replacements, project_name, target_folder, backup_folder)
         
-        src_path = os.path.join("Evraklar", filename)
+        src_path = template_path or os.path.join("Evraklar", filename)
         if not os.path.isfile(src_path):
             logging.error(f"Kaynak dosya bulunamadı: {src_path}")
             return False
@@ -1122,10 +2576,11 @@ class EvrakGenerator:
             success = self.processor.process_excel_document(src_path, dst_path, replacements)
         
         if success:
+            self._record_output(dst_path)
             # Yedek kopyala
             try:
-                shutil.copy(dst_path, backup_path)
-                logging.info("Yedek kopyalandı")
+                if self._backup(dst_path, backup_path):
+                    logging.debug("Yedek kopyalandı")
             except Exception as e:
                 logging.error(f"Yedek kopyalama hatası: {e}")
             
@@ -1135,23 +2590,85 @@ class EvrakGenerator:
                 os.makedirs(pdf_dir, exist_ok=True)
                 pdf_filename = f"{project_name} - {os.path.splitext(filename)[0]}.pdf"
                 pdf_path = os.path.join(pdf_dir, pdf_filename)
+                pdf_ok = False
                 if filename.lower().endswith(".docx"):
-                    self.pdf_converter.export_pdf_from_docx(dst_path, pdf_path)
+                    pdf_ok = self.pdf_converter.export_pdf_from_docx(dst_path, pdf_path)
                 elif filename.lower().endswith(".xlsx"):
-                    self.pdf_converter.export_pdf_from_xlsx(dst_path, pdf_path)
+                    pdf_ok = self.pdf_converter.export_pdf_from_xlsx(dst_path, pdf_path)
+                if pdf_ok:
+                    self._record_output(pdf_path)
         
         logging.info(f"=== İşlem tamamlandı: {filename} ===\n")
         return success
     
+    def render_document(self, filename, replacements, project_name, template_path=None):
+        """Belgeyi diske yazmadan üretir: (hedef dosya adı, baytlar) veya başarısızsa None"""
+        if self.is_yearly_report_document(filename):
+            return self.render_yearly_report(replacements, project_name)
+        if self.is_yearly_plan_document(filename):
+            return self.render_yearly_plan(filename, replacements, project_name)
+        src_path = template_path or os.path.join("Evraklar", filename)
+        if not os.path.isfile(src_path):
+            logging.error(f"Kaynak dosya bulunamadı: {src_path}")
+            return None
+        dst_filename = f"{project_name} - {filename}"
+        if filename.lower().endswith(".docx"):
+            if not DOCX_AVAILABLE:
+                logging.error("python-docx kurulu değil!")
+                return None
+            return dst_filename, self.processor.render_word_document(src_path, replacements)
+        if filename.lower().endswith(".xlsx"):
+            return dst_filename, self.processor.render_excel_document(src_path, replacements)
+        return None
+
+    def export_dossier(self, documents, replacements, project_name, bundle, prefix="", generate_pdf=False):
+        """Belgeleri üretip doğrudan pakete (ZipBundle) yazar; [(belge, başarılı mı, süre)] döndürür
+
+        Belgeler bellekten pakete akar, ara dosya oluşmaz. PDF dönüştürücü (LibreOffice/Office) dosya
+        yolu istediğinden yalnızca PDF istenirse belge geçici klasöre yazılır ve PDF pakete alınır.
+        """
+        results = []
+        with tempfile.TemporaryDirectory(prefix="evrak_paket_") as tmp:
+            for doc in documents:
+                t0 = time.perf_counter()
+                ok = False
+                try:
+                    with METRICS.document(doc):
+                        rendered = self.render_document(doc, replacements, project_name)
+                    if rendered is not None:
+                        dst_filename, data = rendered
+                        with METRICS.document(doc), METRICS.stage("paket") as m:
+                            bundle.add(prefix + dst_filename, data)
+                            m["bayt"] = len(data)
+                        ok = True
+                        if generate_pdf:
+                            doc_path = os.path.join(tmp, dst_filename)
+                            pdf_filename = os.path.splitext(dst_filename)[0] + ".pdf"
+                            pdf_path = os.path.join(tmp, pdf_filename)
+                            _write_bytes(doc_path, data)
+                            with METRICS.document(doc):
+                                if dst_filename.lower().endswith(".docx"):
+                                    pdf_ok = self.pdf_converter.export_pdf_from_docx(doc_path, pdf_path)
+                                else:
+                                    pdf_ok = self.pdf_converter.export_pdf_from_xlsx(doc_path, pdf_path)
+                            if pdf_ok and os.path.isfile(pdf_path):
+                                bundle.add_file(prefix + "PDF/" + pdf_filename, pdf_path)
+                            os.remove(doc_path)
+                except Exception as e:
+                    logging.error(f"Paket belgesi hatası ({doc}): {e}")
+                    logging.error(traceback.format_exc())
+                results.append((doc, ok, round(time.perf_counter() - t0, 4)))
+        return results
+
     def create_all_documents(self):
         """Tüm belgeleri oluşturur"""
         try:
-            replacements, df = self.load_replacements()
+            replacements, table = self.load_replacements()
             project_name = self.get_project_name(replacements)
             target_folder, backup_folder = self.create_folders(project_name)
             
             # veri.xlsx'i yedekle
-            df.to_excel(os.path.join(backup_folder, "veri.xlsx"), index=False, engine='openpyxl')
+            table.write(os.path.join(backup_folder, "veri.xlsx"))
             
             # RD yöntemini al
             rd_method = replacements.get("[DEĞİŞTİR:RDYONTEMI]", "Matris")
@@ -1184,31 +2701,1202 @@ class EvrakGenerator:
             if self.process_document(doc, replacements, project_name, target_folder, backup_folder):
                 success_count += 1
         
-        messagebox.showinfo("Tamamlandı", 
+        messagebox.showinfo("Tamamlandı",
                           f"İşlem tamamlandı!\n\n"
                           f"• {success_count}/{len(selected_files)} belge başarıyla işlendi")
 
+    def get_process_pool(self, workers):
+        """Kalıcı süreç havuzunu döndürür (işçi şablon önbellekleri çalıştırmalar arasında korunur)"""
+        if self._pool is None or self._pool_workers != workers:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False)
+            self._pool = _process_pool(workers)
+            self._pool_workers = workers
+        return self._pool
+
+    def build_document_jobs(self, documents, replacements, project_name, target_folder, backup_folder):
+        """Belge listesinden işçi süreçlerine gönderilebilecek iş tanımlarını oluşturur"""
+        jobs = []
+        for doc in documents:
+            template_path = None
+            if not (self.is_yearly_report_document(doc) or self.is_yearly_plan_document(doc)):
+                template_path = os.path.join("Evraklar", doc)
+            jobs.append(DocumentJob(doc, template_path, dict(replacements), project_name,
+                                    target_folder, backup_folder,
+                                    bool(getattr(self, 'generate_pdf', False))))
+        return jobs
+
+    # Şablonda geçmeyen ama belgenin içeriğini belirleyen alanlar (şablon seçimi, silme kuralları, RD hücresi)
+    YEARLY_PLAN_FIELDS = ("[DEĞİŞTİR:YILLIK:TARİH]", "[DEĞİŞTİR:YILLIK:YIL]", "[DEĞİŞTİR:ÇALIŞANSAYISI]")
+    YEARLY_REPORT_FIELDS = ("[DEĞİŞTİR:RDYONTEMI]",)
+
+    @property
+    def placeholder_index(self):
+        return PLACEHOLDER_INDEX
+
+    def document_sources(self, job):
+        """Belgenin üretiminde kullanılan dosyalar: (şablon yolu, şablonda geçmeyen alanlar, ek kural dosyaları)"""
+        if self.is_yearly_plan_document(job.filename):
+            is_kurullu = self.get_calisanlar_sayisi(job.replacements) >= 50
+            return (self.select_yearly_template(job.filename, is_kurullu), self.YEARLY_PLAN_FIELDS,
+                    ["YILLIK_SILME_KURALLARI.csv"])
+        if self.is_yearly_report_document(job.filename):
+            return self.find_template_file("YILLIK DEĞERLENDİRME RAPORU.xlsx"), self.YEARLY_REPORT_FIELDS, []
+        return job.template_path, (), []
+
+    def document_signature(self, job):
+        """Belgenin girdilerini özetler: şablon özeti, kullandığı alanlar ve bu alanların değerlerinin özeti"""
+        template_path, extra_fields, extra_files = self.document_sources(job)
+        if not template_path or not os.path.isfile(template_path):
+            return None
+        template_digest, keys = self.placeholder_index.keys_for(template_path)
+        for path in extra_files:
+            if os.path.isfile(path):
+                template_digest = input_fingerprint([template_digest, file_sha256(path)])
+        fields = sorted(set(keys) | set(extra_fields))
+        normalized = {unicodedata.normalize("NFC", k): v for k, v in job.replacements.items()}
+        values = {k: normalized.get(k) for k in fields}
+        return {"sablon": template_digest, "girdi": input_fingerprint(values), "alanlar": fields}
+
+    def partition_changed_jobs(self, jobs, manifest):
+        """İşleri (değişen işler, [(iş, önceki çıktılar)]) olarak ayırır"""
+        changed, unchanged = [], []
+        for job in jobs:
+            signature = self.document_signature(job)
+            outputs = None if signature is None else manifest.unchanged(job.filename, signature, job.generate_pdf)
+            if outputs is None:
+                changed.append(job)
+            else:
+                unchanged.append((job, outputs))
+        self.placeholder_index.save()
+        return changed, unchanged
+
+    def run_document_jobs(self, jobs, workers=1, on_result=None, journal=None, cancel_event=None,
+                          manifest=None, only_changed=False, staging=None):
+        """Belge işlerini yürütür; on_result(tamamlanan sayısı, sonuç) tamamlanma sırasıyla çağrılır
+
+        journal verilirse aynı girdiyle daha önce tamamlanmış belgeler atlanır, yenileri kaydedilir.
+        cancel_event set edilirse bekleyen işler başlatılmaz (iptal edilenler sonuçta yer almaz); başlamış
+        işlerin bitmesi beklenir.
+        manifest verilirse üretilen belgelerin girdi özetleri yedek klasörüne yazılır; only_changed=True
+        ise girdileri önceki üretimle aynı olan belgeler yeniden oluşturulmaz.
+        staging (OutputStaging) verilirse işler hazırlık klasörüne yazar; yedekler arka planda alınır,
+        dosyalar sonda hedefe yayımlanır ve günlük/manifest kayıtları yayımlanan yollarla yapılır; hedefe
+        taşınamayan belge başarısız sayılır ve kaydedilmez.
+        """
+        started = time.perf_counter()
+        results = []
+        staged = []
+
+        def record(result, job):
+            if journal is not None:
+                journal.record(job.project_name, job.filename, input_fingerprint(job.replacements),
+                               result.outputs)
+            if manifest is not None:
+                signature = self.document_signature(job)
+                if signature is not None:
+                    manifest.update(job.filename, signature, result.outputs)
+
+        def finished(result, job=None):
+            if job is not None and result.ok:
+                if staging is not None:
+                    staging.stage(result.outputs)
+                    staged.append((len(results), job))
+                else:
+                    record(result, job)
+            results.append(result)
+            if on_result:
+                on_result(len(results), result)
+
+        if manifest is not None and only_changed:
+            jobs, unchanged = self.partition_changed_jobs(jobs, manifest)
+            for job, outputs in unchanged:
+                logging.info(f"Girdileri değişmedi, atlandı: {job.filename}")
+                finished(DocumentResult(job.filename, True, None, outputs, 0.0, True))
+            if unchanged:
+                logging.info(f"Yalnızca değişenler: {len(jobs)} belge yeniden oluşturulacak, "
+                             f"{len(unchanged)} belge atlandı")
+
+        if journal is not None:
+            pending = []
+            for job in jobs:
+                outputs = journal.completed(job.project_name, job.filename,
+                                            input_fingerprint(job.replacements), job.generate_pdf)
+                if outputs is None:
+                    pending.append(job)
+                else:
+                    logging.info(f"Önceki çalışmada tamamlanmış, atlandı: {job.filename}")
+                    finished(DocumentResult(job.filename, True, None, outputs, 0.0, True))
+            jobs = pending
+
+        try:
+            if workers > 1 and len(jobs) > 1:
+                pool = self.get_process_pool(workers)
+                futures = {pool.submit(instrumented(_process_document_job), job): job for job in jobs}
+
+                def collect(future):
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        if isinstance(e, BrokenProcessPool):
+                            self._pool = None
+                        logging.error(f"İşçi süreci hatası ({futures[future].filename}): {e}")
+                        result = DocumentResult(futures[future].filename, False, str(e), [], 0.0)
+                    finished(result, futures[future])
+
+                remaining = set(futures)
+                for future in as_completed(futures):
+                    remaining.discard(future)
+                    collect(future)
+                    if cancel_event is not None and cancel_event.is_set():
+                        for other in remaining:
+                            other.cancel()
+                        # Başlamış işler hazırlık klasörüne yazmayı bitirsin; sonuçları da kaydedilir
+                        for other in as_completed([f for f in remaining if not f.cancelled()]):
+                            collect(other)
+                        logging.info("Belge üretimi kullanıcı tarafından iptal edildi")
+                        break
+            else:
+                for job in jobs:
+                    if cancel_event is not None and cancel_event.is_set():
+                        logging.info("Belge üretimi kullanıcı tarafından iptal edildi")
+                        break
+                    finished(_run_document_job(self, job), job)
+            if staging is not None:
+                published = staging.publish()
+                for index, job in staged:
+                    result = results[index]
+                    missing = [p for p in result.outputs if p not in published]
+                    if missing:
+                        # Hedefe taşınamayan belge tamamlanmış sayılmaz (devam/yalnızca değişenler yeniden üretir)
+                        names = ", ".join(os.path.basename(p) for p in missing)
+                        results[index] = result._replace(
+                            ok=False, error=f"Hedef klasöre taşınamadı: {names} (kopyası: {staging.path})")
+                        continue
+                    results[index] = result = result._replace(outputs=[published[p] for p in result.outputs])
+                    record(result, job)
+        finally:
+            if staging is not None:
+                staging.close()
+        if manifest is not None:
+            try:
+                manifest.save()
+            except OSError as e:
+                logging.error(f"Manifest kaydedilemedi: {e}")
+        MetricsHistory().append_results("belgeler", results, time.perf_counter() - started)
+        return results
+
+    def verify_reproducible(self, documents=None, replacements=None):
+        """Her belgeyi aynı girdilerle iki kez üretip çıktıların bayt bayt aynı olduğunu doğrular
+
+        Zip ve docProps zaman damgalarının (2 saniyelik) çözünürlüğü nedeniyle iki üretim arasında
+        en az 2 saniye beklenir. [(belge, aynı mı, açıklama)] döndürür.
+        """
+        if replacements is None:
+            replacements, _ = self.load_replacements()
+            today = datetime.datetime.now()
+            if not replacements.get("[DEĞİŞTİR:YILLIK:TARİH]") or not replacements.get("[DEĞİŞTİR:YILLIK:YIL]"):
+                replacements["[DEĞİŞTİR:YILLIK:TARİH]"] = today.strftime("%d.%m.%Y")
+                replacements["[DEĞİŞTİR:YILLIK:YIL]"] = today.strftime("%Y")
+        if documents is None:
+            documents = self.get_available_documents(replacements.get("[DEĞİŞTİR:RDYONTEMI]", "Matris"))
+        project_name = self.get_project_name(replacements)
+        generate_pdf = getattr(self, 'generate_pdf', False)
+        self.generate_pdf = False
+        checks = []
+        try:
+            with tempfile.TemporaryDirectory(prefix="evrak_tekrar_") as tmp:
+                runs = []
+                started = time.perf_counter()
+                for attempt in range(2):
+                    if attempt:
+                        time.sleep(max(0.0, 2.1 - (time.perf_counter() - started)))
+                    RENDER_CACHE.clear()
+                    folder = os.path.join(tmp, str(attempt))
+                    os.makedirs(folder)
+                    outputs = {}
+                    for doc in documents:
+                        self.output_log = []
+                        self.process_document(doc, dict(replacements), project_name, folder, folder)
+                        outputs[doc] = {os.path.basename(p): file_sha256(p) for p in self.output_log}
+                    runs.append(outputs)
+                for doc in documents:
+                    first, second = runs[0][doc], runs[1][doc]
+                    if not first:
+                        checks.append((doc, False, "belge üretilemedi"))
+                    elif first != second:
+                        differing = sorted(n for n in first if first.get(n) != second.get(n))
+                        checks.append((doc, False, f"çıktılar farklı: {', '.join(differing)}"))
+                    else:
+                        checks.append((doc, True, next(iter(first.values()))[:12]))
+        finally:
+            self.output_log = None
+            self.generate_pdf = generate_pdf
+        return checks
+
+    def regenerate_from_recipe(self, backup_folder, documents=None, target_folder=None, generate_pdf=False):
+        """Yedek klasöründeki tariften belgeleri o günkü şablon ve kural sürümleriyle yeniden üretir
+
+        Şablonlar geçici bir çalışma klasörüne özgün göreli yollarıyla çıkarılır; yıllık şablon seçimi ve silme
+        kuralları çalışma dizinine göre çözüldüğü için üretim o klasörde, ayrı bir süreçte yapılır.
+        """
+        recipe = RecipeBackup.load(backup_folder)
+        if recipe is None:
+            raise FileNotFoundError(f"Tarif bulunamadı: {os.path.join(backup_folder, RecipeBackup.FILENAME)}")
+        documents = list(documents or recipe["belgeler"])
+        project_name = recipe["proje"]
+        if target_folder is None:
+            desktop = os.path.join(os.path.expanduser("~"), "Desktop")
+            target_folder = os.path.join(desktop, f"{os.path.basename(os.path.normpath(backup_folder))} (yeniden)")
+        target_folder = os.path.abspath(target_folder)
+        os.makedirs(target_folder, exist_ok=True)
+        results = []
+        with tempfile.TemporaryDirectory(prefix="evrak_tarif_") as workspace:
+            missing = RecipeBackup().prepare_workspace(recipe, workspace, documents)
+            if missing:
+                logging.error(f"Tarifteki şablonlar arşivde yok: {missing}")
+            jobs = []
+            for doc in documents:
+                if doc not in recipe["belgeler"]:
+                    results.append(DocumentResult(doc, False, "Belge tarifte yok", [], 0.0))
+                elif missing and any(rel in missing for rel in recipe["belgeler"][doc]):
+                    results.append(DocumentResult(doc, False, "Şablon sürümü arşivde yok", [], 0.0))
+                else:
+                    template_path = None
+                    if not (self.is_yearly_report_document(doc) or self.is_yearly_plan_document(doc)):
+                        template_path = os.path.join("Evraklar", doc)
+                    # Yedek klasörü hedefle aynı verilir: yeniden üretimde yedek alınmaz
+                    jobs.append(DocumentJob(doc, template_path, dict(recipe["degerler"]), project_name,
+                                            target_folder, target_folder, generate_pdf))
+            if jobs:
+                with _process_pool(1) as pool:
+                    results.extend(pool.submit(instrumented(_regenerate_recipe_documents), workspace, jobs).result())
+        logging.info(f"Tariften yeniden üretildi: {backup_folder} -> {target_folder} "
+                     f"({sum(1 for r in results if r.ok)}/{len(results)})")
+        return target_folder, results
+
+    def apply_dynamic_fields(self, replacements):
+        """Tehlike sınıfına göre yıllık ve RD periyot/saat hesaplamalarını yapar (derived_fields kuralları)"""
+        try:
+            DERIVED_FIELDS.apply(replacements)
+        except Exception as e:
+            logging.error(f"Dinamik alan hesaplama hatası: {e}")
+
+    def replacements_to_table(self, base_table, replacements):
+        """veri.xlsx şablonundaki anahtarlara replacements değerlerini yazar"""
+        return base_table.with_values(replacements)
+
+    def create_faaliyet_form(self, fields, faaliyet_tarihi, output_folder):
+        """Firma alanlarından tek bir faaliyet formu oluşturur, çıktı yolunu döndürür"""
+        template_path = FaaliyetBatchEngine.TEMPLATE
+        if not os.path.exists(template_path):
+            logging.error(f"Faaliyet formu şablonu bulunamadı: {template_path}")
+            return None
+        replacements = FaaliyetBatchEngine.build_replacements(fields, faaliyet_tarihi)
+        output_path = os.path.join(output_folder, FaaliyetBatchEngine.output_name(replacements))
+        if not self.processor.process_excel_document(template_path, output_path, replacements):
+            logging.error(f"Placeholder doldurma başarısız: {output_path}")
+            return None
+        self._record_output(output_path)
+        logging.info(f"Faaliyet formu oluşturuldu: {output_path}")
+        return output_path
+
+    def build_job_replacements(self, job, fields, base=None, derive=True):
+        """İş tanımı ve firma alanlarından replacements sözlüğünü oluşturur
+
+        base: önceden yüklenmiş (replacements, tablo) çifti; verilirse veri.xlsx yeniden okunmaz
+        derive: False ise türetilen alanlar hesaplanmaz (toplu akış hepsini DERIVED_FIELDS.apply_many
+        ile tek geçişte hesaplar)
+        """
+        if base is None:
+            base = self.load_replacements()
+        replacements, base_table = dict(base[0]), base[1]
+        replacements.update(fields)
+        today = datetime.datetime.now()
+        yillik_tarih = job.get("yillik_tarih") or today.strftime("%d.%m.%Y")
+        yillik_yil = job.get("yillik_yil")
+        if not yillik_yil:
+            try:
+                yillik_yil = str(datetime.datetime.strptime(yillik_tarih, "%d.%m.%Y").year)
+            except ValueError:
+                yillik_yil = today.strftime("%Y")
+        replacements["[DEĞİŞTİR:YILLIK:TARİH]"] = yillik_tarih
+        replacements["[DEĞİŞTİR:YILLIK:YIL]"] = yillik_yil
+        overrides = {
+            "rd_yontemi": ("[DEĞİŞTİR:RDYONTEMI]",),
+            "rd_tarih": ("[DEĞİŞTİR:YDR:TARİH]", "[DEĞİŞTİR:RDEKİPATAMAEĞİTİMHAZIRLANMA]"),
+            "ydr_yil": ("[DEĞİŞTİR:YDR:YIL]",),
+            "telefon": ("[DEĞİŞTİR:TELEFON]",),
+            "mail": ("[DEĞİŞTİR:MAİL]",),
+        }
+        # İletişim bilgileri anahtar verildiyse boş da olsa yazılır (başka firmanın verisi kalmasın)
+        clearable = ("telefon", "mail")
+        for field, keys in overrides.items():
+            value = job.get(field)
+            if value or (field in clearable and value is not None):
+                for key in keys:
+                    replacements[key] = str(value).strip()
+        # Serbest placeholder değerleri en son uygulanır
+        replacements.update({str(k): str(v) for k, v in job.get("degerler", {}).items()})
+        if derive:
+            self.apply_dynamic_fields(replacements)
+        return replacements, base_table
+
+    def run_job(self, job):
+        """İş dosyasındaki tek bir firma işini yürütür ve sonuç kaydını döndürür"""
+        started = time.perf_counter()
+        result = {"satir": job.get("satir"), "sgk": job.get("sgk"), "tur": job.get("tur"),
+                  "durum": "hata", "ciktilar": [], "hatalar": [], "sureler": {}}
+        timings = result["sureler"]
+        self.output_log = result["ciktilar"]
+        self.generate_pdf = bool(job.get("pdf", False))
+        try:
+            t0 = time.perf_counter()
+            fields = self.directory.company_fields(job["sgk"])
+            timings["firma"] = round(time.perf_counter() - t0, 4)
+            if fields is None:
+                result["hatalar"].append(f"SGK kodu bulunamadı: {job['sgk']}")
+                return result
+
+            t0 = time.perf_counter()
+            today = datetime.datetime.now().strftime("%Y-%m-%d")
+            if job["tur"] == "faaliyet":
+                tarih = job.get("faaliyet_tarihi", "")
+                out_folder = job.get("cikti") or FaaliyetBatchEngine.default_output_folder(tarih)
+                os.makedirs(out_folder, exist_ok=True)
+                timings["hazirlik"] = round(time.perf_counter() - t0, 4)
+                t0 = time.perf_counter()
+                with METRICS.document("Faaliyet Formu"):
+                    ok = self.create_faaliyet_form(fields, tarih, out_folder) is not None
+                timings["belgeler"] = {"Faaliyet Formu": round(time.perf_counter() - t0, 4)}
+                if not ok:
+                    result["hatalar"].append("Faaliyet formu oluşturulamadı")
+            else:
+                replacements, base_table = self.build_job_replacements(job, fields)
+                # "zip": true -> firma paketi çıktı klasörüne yazılır; "bellek" -> paket sonuçta döner (diske yazılmaz)
+                zip_mode = job.get("zip")
+                if job["tur"] == "yillik":
+                    # Toplu yıllık ile aynı: dosya adlarında SGK kodu kullanılır
+                    project_name = job["sgk"]
+                    target_folder = job.get("cikti") or os.path.join(os.getcwd(), f"{today} Yıllıklar")
+                    if zip_mode != "bellek":
+                        os.makedirs(target_folder, exist_ok=True)
+                    backup_folder = target_folder
+                    documents = list(YearlyBatchScheduler.DOCUMENTS)
+                else:
+                    project_name = self.get_project_name(replacements)
+                    if zip_mode == "bellek":
+                        target_folder = backup_folder = None
+                    elif job.get("cikti"):
+                        target_folder = job["cikti"]
+                        backup_folder = os.path.normpath(os.path.join("yedekler", f"{today} - {project_name}"))
+                        os.makedirs(target_folder, exist_ok=True)
+                        os.makedirs(backup_folder, exist_ok=True)
+                    else:
+                        target_folder, backup_folder = self.create_folders(project_name)
+                    if backup_folder:
+                        self.replacements_to_table(base_table, replacements).write(
+                            os.path.join(backup_folder, "veri.xlsx"))
+                    documents = job.get("belgeler") or self.get_available_documents(
+                        replacements.get("[DEĞİŞTİR:RDYONTEMI]", "Matris"))
+                timings["hazirlik"] = round(time.perf_counter() - t0, 4)
+                timings["belgeler"] = {}
+                if zip_mode:
+                    bundle_target = BytesIO() if zip_mode == "bellek" else os.path.join(
+                        target_folder, f"{project_name}.zip")
+                    with ZipBundle(bundle_target) as bundle:
+                        exported = self.export_dossier(documents, replacements, project_name, bundle,
+                                                       generate_pdf=self.generate_pdf)
+                    for doc, ok, elapsed in exported:
+                        if not ok:
+                            result["hatalar"].append(f"Belge oluşturulamadı: {doc}")
+                        timings["belgeler"][doc] = elapsed
+                    if zip_mode == "bellek":
+                        result["_paket"] = bundle_target.getvalue()
+                    else:
+                        self._record_output(bundle_target)
+                    documents = []
+                for doc in documents:
+                    t0 = time.perf_counter()
+                    with METRICS.document(doc), memory_probe(f"{job['sgk']} / {doc}"):
+                        ok = self.process_document(doc, replacements, project_name, target_folder, backup_folder)
+                    if not ok:
+                        result["hatalar"].append(f"Belge oluşturulamadı: {doc}")
+                    timings["belgeler"][doc] = round(time.perf_counter() - t0, 4)
+            if not result["hatalar"]:
+                result["durum"] = "tamam"
+            elif result["ciktilar"] or result.get("_paket"):
+                result["durum"] = "kismi"
+        except Exception as e:
+            logging.error(f"İş hatası (satır {job.get('satir')}): {e}")
+            logging.error(traceback.format_exc())
+            result["hatalar"].append(str(e))
+        finally:
+            self.output_log = None
+            timings["toplam"] = round(time.perf_counter() - started, 4)
+            result["asamalar"] = {"genel": METRICS.take(),
+                                  "belgeler": {doc: METRICS.take(doc) for doc in timings.get("belgeler", {})}}
+        return result
+
+
+# İşçi süreci başına tek generator (firma dizini süreç içinde önbelleklenir)
+_WORKER_GENERATOR = None
+
+
+def _worker_generator():
+    global _WORKER_GENERATOR
+    if _WORKER_GENERATOR is None:
+        _WORKER_GENERATOR = EvrakGenerator()
+    return _WORKER_GENERATOR
+
+
+def _init_worker(directory=None, template_blobs=None):
+    """İşçi başlatıcısı: ana süreçte yüklenmiş firma dizinini ve şablon baytlarını devralır"""
+    global _WORKER_GENERATOR
+    _WORKER_GENERATOR = EvrakGenerator(directory=directory)
+    for path, data in (template_blobs or {}).items():
+        try:
+            TEMPLATE_CACHE.prime(path, data)
+        except OSError as e:
+            logging.error(f"Şablon önbelleğe alınamadı: {path} ({e})")
+
+
+def _execute_job(job):
+    """İşçi havuzunda çalışan iş fonksiyonu (picklable olması için modül seviyesinde)"""
+    with TRACE.company(job.get("sgk")):
+        return _worker_generator().run_job(job)
+
+
+# Süreçler arası taşınan belge işi ve sonucu
+DocumentJob = namedtuple("DocumentJob", ["filename", "template_path", "replacements", "project_name",
+                                         "target_folder", "backup_folder", "generate_pdf"])
+# Belge üretim seçenekleri: GUI iş parçacığında okunup arka plan işine düz değerler olarak verilir
+GenerationOptions = namedtuple("GenerationOptions", ["parallel", "only_changed", "recipe_backup", "zip_export",
+                                                     "profile", "trace"])
+
+DocumentResult = namedtuple("DocumentResult", ["filename", "ok", "error", "outputs", "elapsed", "skipped",
+                                               "metrics"],
+                            defaults=(False, None))
+
+
+def _run_document_job(generator, job):
+    """Tek bir belge işini verilen generator ile yürütür"""
+    started = time.perf_counter()
+    outputs = []
+    generator.generate_pdf = job.generate_pdf
+    generator.output_log = outputs
+    try:
+        with TRACE.company(job.project_name), METRICS.document(job.filename), memory_probe(job.filename):
+            ok = generator.process_document(job.filename, job.replacements, job.project_name,
+                                            job.target_folder, job.backup_folder,
+                                            template_path=job.template_path)
+        error = None if ok else "Belge oluşturulamadı"
+    except Exception as e:
+        logging.error(f"Belge işi hatası ({job.filename}): {e}")
+        logging.error(traceback.format_exc())
+        ok, error = False, str(e)
+    finally:
+        generator.output_log = None
+    return DocumentResult(job.filename, ok, error, outputs, round(time.perf_counter() - started, 4),
+                          metrics=METRICS.take(job.filename))
+
+
+def _process_document_job(job):
+    """İşçi süreçlerinde çalışan belge fonksiyonu"""
+    return _run_document_job(_worker_generator(), job)
+
+
+def _regenerate_recipe_documents(workspace, jobs):
+    """Tarif çalışma klasöründe (ayrı süreçte) belgeleri arşivlenmiş şablon sürümleriyle yeniden üretir"""
+    os.chdir(workspace)
+    generator = EvrakGenerator()
+    return [_run_document_job(generator, job) for job in jobs]
+
+
+# Firma başına toplu yıllık işi ve sonucu
+YearlyJob = namedtuple("YearlyJob", ["sgk", "replacements", "out_folder", "generate_pdf", "snapshot", "skip"],
+                       defaults=((),))
+YearlyResult = namedtuple("YearlyResult", ["sgk", "ok", "errors", "outputs", "elapsed", "documents"],
+                          defaults=((),))
+
+
+def _run_yearly_job(generator, job):
+    """Bir firmanın üç yıllık belgesini verilen generator ile oluşturur"""
+    started = time.perf_counter()
+    errors, outputs = [], []
+    if job.snapshot:
+        # Replacements Excel dosyası oluştur (veri.xlsx şablonuna benzer)
+        try:
+            _, base_table = generator.load_replacements()
+            temp_xls = os.path.join(job.out_folder, f"veri_{job.sgk}.xlsx")
+            generator.replacements_to_table(base_table, job.replacements).write(temp_xls)
+            logging.info(f"Replacements dosyası oluşturuldu: {temp_xls}")
+        except Exception as e:
+            logging.error(f"Replacements dosyası oluşturma hatası: {e}")
+    documents = []
+    for doc in YearlyBatchScheduler.DOCUMENTS:
+        if doc in job.skip:
+            continue
+        result = _run_document_job(generator, DocumentJob(doc, None, job.replacements, job.sgk,
+                                                          job.out_folder, job.out_folder,
+                                                          job.generate_pdf))
+        documents.append(result)
+        outputs.extend(result.outputs)
+        if not result.ok:
+            errors.append(f"{doc}: {result.error}")
+    return YearlyResult(job.sgk, not errors, errors, outputs, round(time.perf_counter() - started, 4),
+                        tuple(documents))
+
+
+def _process_yearly_job(job):
+    """İşçi süreçlerinde çalışan toplu yıllık fonksiyonu"""
+    return _run_yearly_job(_worker_generator(), job)
+
+
+class YearlyBatchScheduler:
+    """Toplu yıllıkları firma bazında işçi süreçlerine dağıtır ve hataları tek özette toplar"""
+
+    DOCUMENTS = ("Yıllık Eğitim Planı", "Yıllık Çalışma Planı", "Yıllık Değerlendirme Raporu")
+
+    def __init__(self, generator, workers=None):
+        self.generator = generator
+        self.workers = workers
+
+    def template_paths(self):
+        """Yıllık belgelerin kullanabileceği tüm şablon yolları"""
+        paths = []
+        for doc in self.DOCUMENTS[:2]:
+            for is_kurullu in (True, False):
+                path = self.generator.select_yearly_template(doc, is_kurullu)
+                if path and path not in paths:
+                    paths.append(path)
+        report = self.generator.find_template_file("YILLIK DEĞERLENDİRME RAPORU.xlsx")
+        if report and report not in paths:
+            paths.append(report)
+        return paths
+
+    def jobs_from_rows(self, rows, yillik_tarih, out_folder, generate_pdf):
+        """GUI satırlarından (sgk, rd yöntemi, rd tarih, telefon, e-mail) işleri oluşturur
+
+        Bulunamayan SGK kodları hata sonucu olarak döner: (işler, hatalar)
+        """
+        base = self.generator.load_replacements()
+        jobs, failures = [], []
+        for sgk, rd_method, rd_date, phone, email in rows:
+            fields = self.generator.directory.company_fields(sgk)
+            if fields is None:
+                failures.append(YearlyResult(sgk, False, [f"SGK kodu bulunamadı: {sgk}"], [], 0.0))
+                continue
+            job = {"sgk": sgk, "yillik_tarih": yillik_tarih, "rd_yontemi": rd_method,
+                   "rd_tarih": rd_date, "telefon": phone, "mail": email}
+            replacements, _ = self.generator.build_job_replacements(job, fields, base, derive=False)
+            jobs.append(YearlyJob(sgk, replacements, out_folder, generate_pdf, True))
+        # Geçerlilik tarihleri, saatler ve periyotlar tüm portföy için tek geçişte hesaplanır
+        try:
+            DERIVED_FIELDS.apply_many(job.replacements for job in jobs)
+        except Exception as e:
+            logging.error(f"Toplu türetilen alan hesaplama hatası, firma firma hesaplanıyor: {e}")
+            for job in jobs:
+                self.generator.apply_dynamic_fields(job.replacements)
+        return jobs, failures
+
+    @staticmethod
+    def jobs_from_yearly_file(path, out_folder, generate_pdf):
+        """yıllıkverileri.xlsx'teki tüm Karşılık sütunlarından işleri oluşturur"""
+        table = KeyValueTable.read(path)
+        jobs = []
+        for column in table.columns:
+            if not column.startswith(KeyValueTable.VALUE):
+                continue
+            replacements = table.mapping(column)
+            sgk = replacements.get("[DEĞİŞTİR:SGKSİCİL]", "").strip()
+            if not sgk:
+                continue
+            jobs.append(YearlyJob(sgk, replacements, out_folder, generate_pdf, False))
+        return jobs
+
+    def apply_journal(self, jobs, journal):
+        """Günlükte doğrulanan belgeleri işlerden çıkarır: (bekleyen işler, tamamlanmış sonuçlar)"""
+        pending, done = [], []
+        for job in jobs:
+            fingerprint = input_fingerprint(job.replacements)
+            skip, outputs = [], []
+            for doc in self.DOCUMENTS:
+                doc_outputs = journal.completed(job.sgk, doc, fingerprint, job.generate_pdf)
+                if doc_outputs is not None:
+                    skip.append(doc)
+                    outputs.extend(doc_outputs)
+            if len(skip) == len(self.DOCUMENTS):
+                logging.info(f"Önceki çalışmada tamamlanmış, atlandı: {job.sgk}")
+                done.append(YearlyResult(job.sgk, True, [], outputs, 0.0))
+            else:
+                pending.append(job._replace(skip=tuple(skip), snapshot=job.snapshot and not skip))
+        return pending, done
+
+    def run(self, jobs, on_result=None, journal=None, cancel_event=None):
+        """İşleri yürütür; on_result(tamamlanan sayısı, sonuç) tamamlanma sırasıyla çağrılır
+
+        journal verilirse tamamlanan belgeler firma/belge bazında kaydedilir ve önceki çalışmada
+        doğrulanmış olanlar atlanır. cancel_event set edilince bekleyen firmalar başlatılmaz; çalışmakta
+        olanların bitmesi beklenir ve sonuçları kaydedilir.
+        """
+        started = time.perf_counter()
+        results = []
+
+        def finished(result, job=None):
+            if journal is not None and job is not None:
+                fingerprint = input_fingerprint(job.replacements)
+                for doc_result in result.documents:
+                    if doc_result.ok:
+                        journal.record(job.sgk, doc_result.filename, fingerprint, doc_result.outputs)
+            results.append(result)
+            if on_result:
+                on_result(len(results), result)
+
+        if journal is not None:
+            jobs, done = self.apply_journal(jobs, journal)
+            for result in done:
+                finished(result)
+
+        workers = min(self.workers or default_workers(), len(jobs))
+        if workers <= 1:
+            for job in jobs:
+                if cancel_event is not None and cancel_event.is_set():
+                    logging.info("Toplu yıllık kullanıcı tarafından iptal edildi")
+                    break
+                finished(_run_yearly_job(self.generator, job), job)
+            self.record_metrics(results, started)
+            return results
+
+        # Tablolar ve şablonlar ana süreçte bir kez okunup işçilere başlangıçta aktarılır
+        self.generator.directory.load()
+        blobs = {path: TEMPLATE_CACHE.get_bytes(path) for path in self.template_paths()}
+        logging.info(f"Toplu yıllık: {len(jobs)} firma, {workers} işçi")
+        with _process_pool(workers, _init_worker, (self.generator.directory, blobs)) as pool:
+            futures = {pool.submit(instrumented(_process_yearly_job), job): job for job in jobs}
+
+            def collect(future):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    job = futures[future]
+                    logging.error(f"Toplu yıllık işçi hatası ({job.sgk}): {e}")
+                    result = YearlyResult(job.sgk, False, [str(e)], [], 0.0)
+                finished(result, futures[future])
+
+            remaining = set(futures)
+            for future in as_completed(futures):
+                remaining.discard(future)
+                collect(future)
+                if cancel_event is not None and cancel_event.is_set():
+                    # Başlamamış firmalar iptal edilir; çalışanlar dosyalarını yazdığı için sonuçları kaydedilir
+                    for other in remaining:
+                        other.cancel()
+                    for other in as_completed([f for f in remaining if not f.cancelled()]):
+                        collect(other)
+                    logging.info("Toplu yıllık kullanıcı tarafından iptal edildi")
+                    break
+        self.record_metrics(results, started)
+        return results
+
+    @staticmethod
+    def record_metrics(results, started):
+        """Firma sonuçlarındaki belge metriklerini çalışma geçmişine ekler"""
+        documents = [d for r in results for d in r.documents]
+        MetricsHistory().append_results("yillik", documents, time.perf_counter() - started)
+
+    @staticmethod
+    def summarize(results, limit=10):
+        """Firma sonuçlarından kullanıcıya gösterilecek özet metni üretir"""
+        success_count = sum(1 for r in results if r.ok)
+        lines = [f"• {success_count}/{len(results)} firma başarıyla işlendi"]
+        failed = [r for r in results if not r.ok]
+        for r in failed[:limit]:
+            lines.append(f"• {r.sgk}: {'; '.join(r.errors)}")
+        if len(failed) > limit:
+            lines.append(f"• … ve {len(failed) - limit} firma daha (ayrıntılar log dosyasında)")
+        for r in failed:
+            logging.error(f"Toplu yıllık hatası {r.sgk}: {'; '.join(r.errors)}")
+        return "\n".join(lines)
+
+
+# Faaliyet formu işi ve sonucu
+FaaliyetJob = namedtuple("FaaliyetJob", ["sgk", "replacements", "output_path"])
+FaaliyetResult = namedtuple("FaaliyetResult", ["sgk", "ok", "error", "output_path", "elapsed"])
+
+
+def _render_faaliyet_job(job):
+    """Faaliyet formunu bellekteki şablondan üretir: (xlsx baytları, hata, süre)"""
+    from openpyxl import load_workbook
+    started = time.perf_counter()
+    try:
+        with TRACE.company(job.sgk), TRACE.span("Faaliyet Formu", "belge"):
+            wb = load_workbook(TEMPLATE_CACHE.open(FaaliyetBatchEngine.TEMPLATE))
+            DocumentProcessor.fill_workbook(wb, job.replacements, os.path.basename(FaaliyetBatchEngine.TEMPLATE))
+            data = package_bytes(wb)
+            wb.close()
+        return data, None, round(time.perf_counter() - started, 4)
+    except Exception as e:
+        logging.error(f"Faaliyet formu üretim hatası ({job.sgk}): {e}")
+        logging.error(traceback.format_exc())
+        return None, str(e), round(time.perf_counter() - started, 4)
+
+
+class FaaliyetBatchEngine:
+    """Toplu faaliyet formlarını tek tablo ve tek şablon yüklemesiyle bellekte üretir"""
+
+    TEMPLATE = os.path.join("Evraklar", "FAALİYET FORMU.xlsx")
+
+    def __init__(self, generator=None, workers=None):
+        self.generator = generator or EvrakGenerator()
+        self.workers = workers
+
+    @staticmethod
+    def default_output_folder(faaliyet_tarihi):
+        """Masaüstünde tarihli faaliyet formları klasörü"""
+        folder_name = f"{faaliyet_tarihi} - Faaliyet Formları" if faaliyet_tarihi else "Faaliyet Formları"
+        return os.path.join(os.path.expanduser("~"), "Desktop", folder_name)
+
+    @staticmethod
+    def build_replacements(fields, faaliyet_tarihi):
+        """Firma alanlarına faaliyet tarihini ekler"""
+        replacements = dict(fields)
+        # Tarih yoksa placeholder'ı hiç eklememek yeterli, DocumentProcessor otomatik silecek
+        if faaliyet_tarihi:
+            replacements["[DEĞİŞTİR:FAALİYETTARİH]"] = faaliyet_tarihi
+        return replacements
+
+    @staticmethod
+    def output_name(replacements):
+        sirket_proje = replacements.get("[DEĞİŞTİR:ŞİRKETPROJE]") or "FAALİYET"
+        return DocumentProcessor.sanitize_filename(f"{sirket_proje} - Faaliyet Formu.xlsx")
+
+    def prepare(self, sgk_codes, faaliyet_tarihi, output_folder):
+        """SGK kodlarından işleri oluşturur; bulunamayanlar hata sonucu olarak döner"""
+        jobs, failures, used_names = [], [], set()
+        # Aynı SGK kodu birden fazla girildiyse tek form üretilir
+        for sgk in dict.fromkeys(str(kod).strip() for kod in sgk_codes):
+            fields = self.generator.directory.company_fields(sgk)
+            if fields is None:
+                logging.error(f"SGK kodu bulunamadı: {sgk}")
+                failures.append(FaaliyetResult(sgk, False, "SGK kodu bulunamadı", None, 0.0))
+                continue
+            replacements = self.build_replacements(fields, faaliyet_tarihi)
+            name = self.output_name(replacements)
+            if name.lower() in used_names:
+                # Aynı şirket-proje adı tekrarlanırsa önceki form ezilmesin
+                stem, ext = os.path.splitext(name)
+                name = f"{stem} ({sgk}){ext}"
+            used_names.add(name.lower())
+            jobs.append(FaaliyetJob(sgk, replacements, os.path.join(output_folder, name)))
+        return jobs, failures
+
+    def run(self, sgk_codes, faaliyet_tarihi="", output_folder=None, on_result=None, journal=None,
+            cancel_event=None):
+        """Formları üretir ve her formu tek yazmayla diske koyar; bulunamayan SGK kodları listenin başında döner
+
+        journal verilirse aynı girdiyle daha önce yazılmış ve doğrulanan formlar atlanır.
+        cancel_event set edilince kalan formlar üretilmez.
+        """
+        if not os.path.exists(self.TEMPLATE):
+            raise FileNotFoundError(f"Faaliyet formu şablonu bulunamadı: {self.TEMPLATE}")
+        output_folder = output_folder or self.default_output_folder(faaliyet_tarihi)
+        os.makedirs(output_folder, exist_ok=True)
+        jobs, results = self.prepare(sgk_codes, faaliyet_tarihi, output_folder)
+
+        def finished(result):
+            results.append(result)
+            if on_result:
+                on_result(len(results), result)
+
+        if journal is not None:
+            pending = []
+            for job in jobs:
+                if journal.completed(job.sgk, "Faaliyet Formu", input_fingerprint(job.replacements)) is None:
+                    pending.append(job)
+                else:
+                    logging.info(f"Önceki çalışmada tamamlanmış, atlandı: {job.sgk}")
+                    finished(FaaliyetResult(job.sgk, True, None, job.output_path, 0.0))
+            jobs = pending
+
+        executor = None
+        workers = min(self.workers or default_workers(), len(jobs))
+        if workers <= 1:
+            rendered = (_render_faaliyet_job(job) for job in jobs)
+        else:
+            blobs = {self.TEMPLATE: TEMPLATE_CACHE.get_bytes(self.TEMPLATE)}
+            executor = _process_pool(workers, _init_worker, (None, blobs))
+            rendered = executor.map(instrumented(_render_faaliyet_job), jobs,
+                                    chunksize=max(1, len(jobs) // (workers * 4)))
+        try:
+            # Formlar girdi sırasıyla, üretildikçe yazılır
+            for job, (data, error, elapsed) in zip(jobs, rendered):
+                if data is not None:
+                    try:
+                        _write_bytes(job.output_path, data)
+                        self.generator._record_output(job.output_path)
+                        if journal is not None:
+                            journal.record(job.sgk, "Faaliyet Formu", input_fingerprint(job.replacements),
+                                           [job.output_path])
+                        logging.info(f"Faaliyet formu oluşturuldu: {job.output_path}")
+                    except OSError as e:
+                        error = str(e)
+                        logging.error(f"Faaliyet formu yazma hatası: {e}")
+                finished(FaaliyetResult(job.sgk, error is None, error,
+                                        job.output_path if error is None else None, elapsed))
+                if cancel_event is not None and cancel_event.is_set():
+                    logging.info("Toplu faaliyet formu kullanıcı tarafından iptal edildi")
+                    break
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+        return results
+
+    def consolidated_path(self, faaliyet_tarihi, output_folder):
+        """Tek dosya modunda çıktı çalışma kitabının yolu"""
+        name = f"{faaliyet_tarihi} - Faaliyet Formları.xlsx" if faaliyet_tarihi else "Faaliyet Formları.xlsx"
+        return os.path.join(output_folder, name)
+
+    @staticmethod
+    def sheet_title(sgk, replacements):
+        """SGK ve şirket-proje adından Excel'in kabul ettiği (31 karakter) sayfa adı üretir"""
+        title = f"{sgk} {replacements.get('[DEĞİŞTİR:ŞİRKETPROJE]', '')}"
+        title = re.sub(r"[\[\]:*?/\\]", " ", title)
+        return re.sub(r"\s+", " ", title).strip()[:31].rstrip(" '")
+
+    @staticmethod
+    def form_sheet(wb):
+        """Şablondaki placeholder içeren form sayfasını bulur"""
+        for ws in wb.worksheets:
+            for row in ws.iter_rows():
+                if any(isinstance(c.value, str) and "[DEĞİŞTİR:" in c.value for c in row):
+                    return ws
+        return wb.active
+
+    @staticmethod
+    def copy_sheet_settings(source, target):
+        """copy_worksheet'in kopyalamadığı yazdırma ayarlarını aktarır"""
+        if source.print_area:
+            target.print_area = [ref.split("!")[-1].replace("$", "") for ref in source.print_area.split(",")]
+        target.print_title_rows = source.print_title_rows
+        target.print_title_cols = source.print_title_cols
+        target.HeaderFooter = copy.copy(source.HeaderFooter)
+        target.row_breaks = copy.copy(source.row_breaks)
+        target.col_breaks = copy.copy(source.col_breaks)
+        target.sheet_view.showGridLines = source.sheet_view.showGridLines
+        for cf in source.conditional_formatting:
+            for rule in cf.rules:
+                target.conditional_formatting.add(str(cf.sqref), copy.copy(rule))
+        for dv in source.data_validations.dataValidation:
+            target.add_data_validation(copy.copy(dv))
+
+    def run_consolidated(self, sgk_codes, faaliyet_tarihi="", output_folder=None, generate_pdf=False,
+                         on_result=None):
+        """Tüm firmaları tek çalışma kitabında ayrı sayfalar olarak üretir
+
+        Dizin sayfası eklenir, dosya bir kez yazılır ve istenirse tek PDF'e çevrilir.
+        (çıktı yolu veya None, sonuçlar) döndürür.
+        """
+        if not os.path.exists(self.TEMPLATE):
+            raise FileNotFoundError(f"Faaliyet formu şablonu bulunamadı: {self.TEMPLATE}")
+        output_folder = output_folder or self.default_output_folder(faaliyet_tarihi)
+        os.makedirs(output_folder, exist_ok=True)
+        output_path = self.consolidated_path(faaliyet_tarihi, output_folder)
+        jobs, results = self.prepare(sgk_codes, faaliyet_tarihi, output_folder)
+        if not jobs:
+            return None, results
+
+        from openpyxl import load_workbook
+        from openpyxl.styles import Font
+        from openpyxl.worksheet.hyperlink import Hyperlink
+        wb = load_workbook(TEMPLATE_CACHE.open(self.TEMPLATE))
+        template_sheets = list(wb.worksheets)
+        template_ws = self.form_sheet(wb)
+        index_ws = wb.create_sheet("DİZİN", 0)
+        index_ws.append(["Sıra", "SGK", "Şirket - Proje", "Sayfa"])
+        for cell in index_ws[1]:
+            cell.font = Font(bold=True)
+
+        sheet_results = []
+        for no, job in enumerate(jobs, start=1):
+            started = time.perf_counter()
+            try:
+                ws = wb.copy_worksheet(template_ws)
+                ws.title = self.sheet_title(job.sgk, job.replacements)
+                self.copy_sheet_settings(template_ws, ws)
+                DocumentProcessor.fill_worksheet(ws, job.replacements)
+                index_ws.append([no, job.sgk, job.replacements.get("[DEĞİŞTİR:ŞİRKETPROJE]", ""), ws.title])
+                link = index_ws.cell(row=index_ws.max_row, column=4)
+                # Dış ilişki oluşturmadan aynı dosya içindeki sayfaya bağlantı
+                link.hyperlink = Hyperlink(ref=link.coordinate,
+                                           location="'{}'!A1".format(ws.title.replace("'", "''")))
+                link.style = "Hyperlink"
+                sheet_results.append(FaaliyetResult(job.sgk, True, None, output_path,
+                                                    round(time.perf_counter() - started, 4)))
+            except Exception as e:
+                logging.error(f"Faaliyet sayfası hatası ({job.sgk}): {e}")
+                logging.error(traceback.format_exc())
+                sheet_results.append(FaaliyetResult(job.sgk, False, str(e), None,
+                                                    round(time.perf_counter() - started, 4)))
+
+        for ws in template_sheets:
+            wb.remove(ws)
+        for column, width in zip("ABCD", (6, 10, 60, 34)):
+            index_ws.column_dimensions[column].width = width
+        wb.active = 0
+        _write_bytes(output_path, package_bytes(wb))
+        wb.close()
+        self.generator._record_output(output_path)
+        logging.info(f"Birleşik faaliyet formu oluşturuldu: {output_path} ({len(jobs)} sayfa)")
+
+        for result in sheet_results:
+            results.append(result)
+            if on_result:
+                on_result(len(results), result)
+
+        if generate_pdf:
+            pdf_dir = os.path.join(output_folder, "PDF")
+            os.makedirs(pdf_dir, exist_ok=True)
+            pdf_path = os.path.join(pdf_dir, os.path.splitext(os.path.basename(output_path))[0] + ".pdf")
+            if self.generator.pdf_converter.export_pdf_from_xlsx(output_path, pdf_path):
+                self.generator._record_output(pdf_path)
+        return output_path, results
+
+
+class JobFileRunner:
+    """JSON-lines iş dosyasını satır satır okuyup işleri işçi havuzunda yürütür"""
+
+    JOB_TYPES = ("belgeler", "yillik", "faaliyet")
+
+    def __init__(self, workers=None):
+        if workers is None:
+            workers = default_workers()
+        self.workers = max(1, int(workers))
+        # Bellekte aynı anda tutulan en fazla iş sayısı
+        self.window = self.workers * 2
+
+    @staticmethod
+    def default_results_path(jobs_path):
+        stem, _ = os.path.splitext(jobs_path)
+        return f"{stem}.sonuc.jsonl"
+
+    @staticmethod
+    def journal_for(results_path, resume=False):
+        """Sonuç dosyasının yanındaki iş günlüğü (<sonuç>.gunluk.jsonl)"""
+        folder, name = os.path.split(os.path.abspath(results_path))
+        stem = name[:-len(".jsonl")] if name.endswith(".jsonl") else name
+        return JobJournal(folder, resume=resume, filename=f"{stem}.gunluk.jsonl")
+
+    @staticmethod
+    def job_key(job):
+        """Günlük anahtarı ve girdi özeti: satır numarası hariç iş tanımı"""
+        fingerprint = input_fingerprint({k: v for k, v in job.items() if k != "satir"})
+        return job["sgk"], f"{job['tur']}#{job['satir']}", fingerprint
+
+    def parse_line(self, line, line_no):
+        """Tek bir iş satırını doğrular; hatalıysa ValueError (alan türü yanlışsa TypeError) fırlatır"""
+        job = json.loads(line)
+        if not isinstance(job, dict):
+            raise ValueError("İş satırı JSON nesnesi olmalı")
+        sgk = str(job.get("sgk", "")).strip()
+        if len(sgk) != 7 or not sgk.isdigit():
+            raise ValueError(f"Geçersiz SGK (7 hane olmalı): {sgk!r}")
+        tur = job.get("tur", "belgeler")
+        if tur not in self.JOB_TYPES:
+            raise ValueError(f"Bilinmeyen iş türü: {tur!r} (geçerli: {', '.join(self.JOB_TYPES)})")
+        if job.get("rd_yontemi") not in (None, "", "Matris", "Fine Kinney"):
+            raise ValueError(f"Geçersiz RD yöntemi: {job['rd_yontemi']!r}")
+        for key in ("yillik_tarih", "rd_tarih", "faaliyet_tarihi"):
+            if job.get(key):
+                datetime.datetime.strptime(job[key], "%d.%m.%Y")
+        job.update({"sgk": sgk, "tur": tur, "satir": line_no})
+        return job
+
+    def iter_jobs(self, jobs_path):
+        """Dosyayı satır satır okur; (satır no, iş veya hata sonucu) üretir"""
+        with open(jobs_path, encoding="utf-8") as f:
+            for line_no, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                try:
+                    yield line_no, self.parse_line(line, line_no), None
+                except (ValueError, KeyError, TypeError) as e:
+                    # TypeError: alan beklenen türde değil (ör. "rd_tarih": 20260102)
+                    yield line_no, None, {"satir": line_no, "durum": "gecersiz", "ciktilar": [],
+                                          "hatalar": [str(e)], "sureler": {}}
+
+    def run(self, jobs_path, results_path=None, progress=None, resume=False, cancel_event=None,
+            bundle_path=None):
+        """İşleri yürütür, sonuçları girdi sırasıyla paralel bir .jsonl dosyasına yazar
+
+        resume=True ise önceki çalışmada tamamlanıp çıktıları doğrulanan satırlar yeniden
+        çalıştırılmaz, kayıtlı sonuçları yazılır. cancel_event set edilince yeni satır başlatılmaz.
+        bundle_path verilirse belge ve yıllık işleri diske yazılmaz: işçiler firma paketini bellekte
+        üretir, ana süreç bunları "<satır> - <sgk>/" klasörleri altında tek bir .zip dosyasına akıtır.
+        Paket her çalışmada baştan yazıldığından bu modda günlük kullanılmaz.
+        """
+        results_path = results_path or self.default_results_path(jobs_path)
+        summary = {"toplam": 0, "tamam": 0, "kismi": 0, "hata": 0, "gecersiz": 0, "atlanan": 0,
+                   "iptal": False, "sonuc_dosyasi": results_path}
+        if bundle_path and resume:
+            logging.info("Paket modunda devam edilemez; tüm satırlar yeniden çalıştırılacak")
+            resume = False
+        journal = self.journal_for(results_path, resume)
+        started = time.perf_counter()
+        metrics = {"belgeler": [], "genel": {}}
+        bundle = ZipBundle(bundle_path) if bundle_path else None
+        if bundle is not None:
+            summary["paket"] = os.path.abspath(bundle_path)
+        recorded = {}
+        executor = None
+        if self.workers > 1:
+            directory = CompanyDirectory()
+            try:
+                directory.load()
+            except Exception as e:
+                # İşçiler tabloyu kendileri yüklemeyi dener; hata iş sonucuna yazılır
+                logging.error(f"Firma dizini önceden yüklenemedi: {e}")
+            executor = _process_pool(self.workers, _init_worker, (directory,))
+        pending = deque()
+
+        def submit(job):
+            if executor is not None:
+                return executor.submit(instrumented(_execute_job), job)
+            future = Future()
+            future.set_result(_execute_job(job))
+            return future
+
+        def drain(out, limit):
+            while len(pending) > limit:
+                line_no, future = pending.popleft()
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logging.error(f"İşçi hatası (satır {line_no}): {e}")
+                    result = {"satir": line_no, "durum": "hata", "ciktilar": [],
+                              "hatalar": [str(e)], "sureler": {}}
+                # Günlükten tekrar yazılan (bu çalışmada üretilmeyen) sonuçlar geçmişe eklenmez
+                stages = result.get("asamalar")
+                if stages and (line_no in recorded or bundle is not None):
+                    StageMetrics.merge(metrics["genel"], stages.get("genel", {}))
+                    for doc, elapsed in result.get("sureler", {}).get("belgeler", {}).items():
+                        metrics["belgeler"].append({"belge": doc, "sure": elapsed,
+                                                    "asamalar": stages["belgeler"].get(doc, {})})
+                package = result.pop("_paket", None)
+                if package is not None and bundle is not None:
+                    prefix = f"{line_no:03d} - {result.get('sgk')}/"
+                    try:
+                        bundle.add_archive(prefix, package)
+                        result["ciktilar"] = [f"{summary['paket']}#{prefix}"]
+                    except Exception as e:
+                        logging.error(f"Pakete eklenemedi (satır {line_no}): {e}")
+                        result["durum"] = "hata"
+                        result["hatalar"].append(str(e))
+                if result.get("durum") == "tamam" and result.get("satir") in recorded:
+                    sgk, key, fingerprint = recorded.pop(result["satir"])
+                    journal.record(sgk, key, fingerprint, result["ciktilar"], {"sonuc": result})
+                out.write(json.dumps(result, ensure_ascii=False) + "\n")
+                out.flush()
+                summary["toplam"] += 1
+                summary[result["durum"]] += 1
+                if progress:
+                    progress(result)
+
+        try:
+            with open(results_path, "w", encoding="utf-8") as out:
+                for line_no, job, error in self.iter_jobs(jobs_path):
+                    if cancel_event is not None and cancel_event.is_set():
+                        # Yeni satır başlatılmaz; pencerede bekleyenler tamamlanıp yazılır
+                        summary["iptal"] = True
+                        logging.info(f"İş dosyası iptal edildi (satır {line_no} ve sonrası çalıştırılmadı)")
+                        break
+                    if error is not None:
+                        future = Future()
+                        future.set_result(error)
+                    elif bundle is not None:
+                        if job["tur"] != "faaliyet":
+                            job["zip"] = "bellek"
+                        future = submit(job)
+                    else:
+                        sgk, key, fingerprint = self.job_key(job)
+                        outputs = journal.completed(sgk, key, fingerprint)
+                        if outputs is not None:
+                            future = Future()
+                            future.set_result(journal.entry(sgk, key)["sonuc"])
+                            summary["atlanan"] += 1
+                        else:
+                            recorded[line_no] = (sgk, key, fingerprint)
+                            future = submit(job)
+                    pending.append((line_no, future))
+                    drain(out, self.window)
+                drain(out, 0)
+            if bundle is not None:
+                bundle.close()
+                bundle = None
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
+            if bundle is not None:
+                bundle.abort()
+        if not summary["iptal"] and not (summary["hata"] or summary["kismi"] or summary["gecersiz"]):
+            # Tüm işler başarıyla bitti: sonraki --resume eski çıktılara bakıp satır atlamasın
+            journal.discard()
+        StageMetrics.merge(metrics["genel"], METRICS.take())
+        MetricsHistory().append("is_dosyasi", metrics["belgeler"], time.perf_counter() - started,
+                                metrics["genel"])
+        logging.info(f"İş dosyası tamamlandı: {summary}")
+        return summary
+
 
 class EvrakGeneratorGUI:
     """Kullanıcı arayüzü sınıfı"""
     
+    # Ana pencerenin genişliği; yükseklik içeriğe göre hesaplanır
+    WINDOW_WIDTH = 560
+    # Bu yükseklikten alçak ekranlarda (ör. 1366x768) evrak efekti gösterilmez
+    EFFECT_MIN_SCREEN_HEIGHT = 900
+    # Görev çubuğu ve pencere başlığı için ekran yüksekliğinden ayrılan pay
+    SCREEN_MARGIN = 80
+    
     def __init__(self, root):
         self.root = root
         self.root.title("EVRAK GENERATOR")
-        self.root.geometry("560x830")
         self.root.configure(bg="#e0e0e0")
         
         self.generator = EvrakGenerator()
+        # Form modülü ilk açılışta yüklenir ve oturum boyunca saklanır
+        self._form_module = None
         # PDF oluşturma seçeneği (GUI üzerinden işaretlenebilir)
         self.generate_pdf_var = tk.BooleanVar(value=False)
+        # Belgeleri çok çekirdekte paralel oluşturma seçeneği
+        self.parallel_var = tk.BooleanVar(value=(os.cpu_count() or 1) > 1)
+        # Yalnızca girdileri (şablon veya kullandığı alanlar) değişen belgeleri yeniden oluşturma seçeneği
+        self.only_changed_var = tk.BooleanVar(value=False)
+        # Yedek olarak belge kopyası yerine yalnızca tarif (girdiler + şablon sürümleri) saklama seçeneği
+        self.recipe_backup_var = tk.BooleanVar(value=False)
+        # Belgeleri ayrı dosyalar yerine proje klasöründe tek bir .zip paketi olarak dışa aktarma seçeneği
+        self.zip_export_var = tk.BooleanVar(value=False)
+        # Belge oluşturmayı cProfile + tracemalloc ile profilleyip raporu proje klasörüne yazma seçeneği
+        self.profile_var = tk.BooleanVar(value=False)
+        # Çalışmanın zaman çizelgesini (Chrome Trace JSON) proje klasörüne yazma seçeneği
+        self.trace_var = tk.BooleanVar(value=False)
         
         self.create_ui()
+        self.fit_to_screen()
+    
+    def fit_to_screen(self):
+        """Pencereyi içeriğin istediği yüksekliğe göre boyutlandırır (ekrandan taşmayacak şekilde)"""
+        self.root.update_idletasks()
+        width = max(self.WINDOW_WIDTH, self.root.winfo_reqwidth())
+        height = min(self.root.winfo_reqheight(), self.root.winfo_screenheight() - self.SCREEN_MARGIN)
+        self.root.geometry(f"{width}x{height}")
     
     def create_ui(self):
         """Ana arayüzü oluşturur"""
         # Ana başlık frame
         title_frame = tk.Frame(self.root, bg="#e0e0e0")
-        title_frame.pack(pady=(30, 20))
+        title_frame.pack(pady=(20, 10))
         
         # Büyük ve dikkat çekici başlık
         tk.Label(title_frame, text="📋 EVRAK GENERATOR", 
@@ -1222,14 +3910,30 @@ class EvrakGeneratorGUI:
         
         # Butonlar
         btn_frame = tk.Frame(self.root, bg="#e0e0e0")
-        btn_frame.pack(pady=35)
-        # PDF çıktısı seçeneği (isteğe bağlı)
-        pdf_chk = tk.Checkbutton(btn_frame, text="Pdf",
-                                 variable=self.generate_pdf_var,
+        btn_frame.pack(pady=(5, 10))
+        # Üretim seçenekleri iki sütunlu ızgarada (pencere 768 piksellik ekranlara sığsın)
+        options_frame = tk.LabelFrame(btn_frame, text="Seçenekler",
+                                      bg="#e0e0e0", fg="#1a237e",
+                                      font=(DEFAULT_FONT, 10, "bold"),
+                                      bd=2, relief="groove")
+        options_frame.pack(fill="x", pady=(0, 10))
+        options = [
+            ("Pdf", self.generate_pdf_var),
+            ("Paralel", self.parallel_var),
+            ("Yalnızca değişenler", self.only_changed_var),
+            ("Tarif yedeği (belge kopyası alma)", self.recipe_backup_var),
+            ("Zip olarak dışa aktar", self.zip_export_var),
+            ("Profil (performans raporu)", self.profile_var),
+            ("Zaman çizelgesi (iz dosyası)", self.trace_var),
+        ]
+        for i, (text, variable) in enumerate(options):
+            chk = tk.Checkbutton(options_frame, text=text,
+                                 variable=variable,
                                  bg="#e0e0e0", fg="#1a237e",
                                  selectcolor="#e0e0e0",
                                  font=(DEFAULT_FONT, 10))
-        pdf_chk.pack(pady=(0, 10))
+            chk.grid(row=i // 2, column=i % 2, sticky="w", padx=8)
+        options_frame.grid_columnconfigure((0, 1), weight=1)
         
         buttons = [
             ("Form Bilgilerini Doldur", self.launch_form, "#1a237e"),
@@ -1241,11 +3945,12 @@ class EvrakGeneratorGUI:
         ]
         
         for text, command, color in buttons:
-            btn = self.create_styled_button(btn_frame, text, command, color)
-            btn.pack(pady=8)
+            btn = self.create_styled_button(btn_frame, text, command, color, height=2)
+            btn.pack(pady=4)
         
-        # Evrak efekti (alt kısımda)
-        self.create_document_effect()
+        # Evrak efekti (alt kısımda); alçak ekranlarda düğmelere yer kalsın diye gösterilmez
+        if self.root.winfo_screenheight() >= self.EFFECT_MIN_SCREEN_HEIGHT:
+            self.create_document_effect()
         
         # Alt bilgi
         tk.Label(self.root, text="Created by Hüseyin İLHAN", 
@@ -1276,13 +3981,13 @@ class EvrakGeneratorGUI:
             canvas.create_text(x_left, y, text="📄", font=(DEFAULT_FONT, 12), fill="#d0d0d0")
             canvas.create_text(x_right, y, text="📋", font=(DEFAULT_FONT, 12), fill="#d0d0d0")
     
-    def create_styled_button(self, parent, text, command, color):
+    def create_styled_button(self, parent, text, command, color, height=3):
         """3D görünümlü buton oluşturur"""
         btn = tk.Button(parent, text=text, command=command,
                        font=(DEFAULT_FONT, 12, "bold"),
                        bg="#f0f0f0", fg="#1a237e",
                        activebackground="#e0e0e0", activeforeground="#1a237e",
-                       width=40, height=3, bd=3, pady=5,
+                       width=40, height=height, bd=3, pady=5,
                        relief="raised")
         
         # macOS için özel ayarlar
@@ -1300,19 +4005,32 @@ class EvrakGeneratorGUI:
             return
         
         try:
-            # Modülü dinamik olarak yükle
-            spec = importlib.util.spec_from_file_location("form_module", script_path)
-            form_module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(form_module)
+            # Modülü oturumda bir kez yükle (sonraki açılışlar yeniden çalıştırmaz)
+            if self._form_module is None:
+                spec = importlib.util.spec_from_file_location("form_module", script_path)
+                form_module = importlib.util.module_from_spec(spec)
+                spec.loader.exec_module(form_module)
+                self._form_module = form_module
             
-            # Yeni pencerede formu aç
+            # Yeni pencerede formu aç; firma dizini ve veri tabloları ana uygulamayla paylaşılır
             top = Toplevel(self.root)
-            form_module.SadeFormApp(top)
+            self._form_module.SadeFormApp(top, host=FormHost(self.generator))
             
         except Exception as e:
             messagebox.showerror("Hata", f"Form yüklenemedi:\n{str(e)}")
             logging.error(f"Form yükleme hatası: {e}")
     
+    def report_startup(self, mode):
+        """Açılış ölçümü: pencere çizilince işaret yazdırır, istenirse formu açıp süresini ölçer ve kapanır"""
+        self.root.update()
+        print("ACILIS ilk_pencere", flush=True)
+        if mode == "form":
+            started = time.perf_counter()
+            self.launch_form()
+            self.root.update()
+            print(f"ACILIS form {time.perf_counter() - started:.4f}", flush=True)
+        self.root.destroy()
+
     def launch_batch_yearly(self):
         """Toplu yıllık oluşturma penceresini gösterir"""
         batch_win = Toplevel(self.root)
@@ -1340,6 +4058,7 @@ class EvrakGeneratorGUI:
         # Satırlar için frame ve liste
         self.batch_rows_frame = frm
         self.batch_rows = []
+        self.add_button = None
         # Başlangıçta 10 satır ekle ve '+' butonunu hazırla
         for _ in range(10):
             self._add_batch_row()
@@ -1351,12 +4070,12 @@ class EvrakGeneratorGUI:
         btn_save.pack(pady=(5,2))
         btn_run = self.create_styled_button(batch_win, "Oluştur", self.run_batch_yearly, "#1a237e")
         btn_run.pack(pady=2)
+        # Çok sayıda firma için JSON-lines iş dosyası
+        btn_jobs = self.create_styled_button(batch_win, "İş Dosyası Çalıştır (.jsonl)", self.run_job_file, "#1a237e")
+        btn_jobs.pack(pady=(2, 10))
 
     def _add_batch_row(self):
         """Yeni toplu yıllık satırı ekler"""
-        if len(self.batch_rows) >= 20:
-            messagebox.showwarning("Uyarı", "En fazla 20 firma girebilirsiniz!")
-            return
         idx = len(self.batch_rows)
         row = idx * 2 + 2
         sgk_var = tk.StringVar()
@@ -1375,98 +4094,73 @@ class EvrakGeneratorGUI:
             row=row+1, column=0, columnspan=5, sticky="w", padx=5, pady=(0,4)
         )
         self.batch_rows.append((sgk_var, rd_method_var, rd_date_var, phone_var, email_var, company_var))
+        # '+' butonu her zaman son satırın altında kalsın
+        if self.add_button is not None:
+            self.add_button.grid(row=2 + len(self.batch_rows)*2, column=0, pady=5)
+
+    def run_job_file(self):
+        """JSON-lines iş dosyasını seçip işleri arka planda işçi havuzunda yürütür"""
+        jobs_path = filedialog.askopenfilename(
+            title="İş Dosyası Seç",
+            filetypes=[("JSON Lines", "*.jsonl"), ("Tüm dosyalar", "*.*")],
+            initialdir=os.getcwd()
+        )
+        if not jobs_path:
+            return
+        runner = JobFileRunner()
+        results_path = runner.default_results_path(jobs_path)
+        journal = runner.journal_for(results_path, resume=True)
+        resume = False
+        if len(journal):
+            resume = messagebox.askyesno(
+                "Yarım Kalan Çalışma",
+                f"Bu iş dosyası için {len(journal)} tamamlanmış satır kaydı bulundu.\n\n"
+                f"Kaldığı yerden devam edilsin mi?\n(Hayır: tüm satırlar yeniden çalıştırılır)")
+        with open(jobs_path, encoding="utf-8") as f:
+            line_count = sum(1 for line in f if line.strip() and not line.strip().startswith("#"))
+        cancel_event = threading.Event()
+        prog_win, pb, status_var = self._create_progress_window("İş Dosyası Çalışıyor", max(1, line_count),
+                                                                cancel_event)
+
+        def progress(result):
+            mark = "✓" if result["durum"] == "tamam" else "✗"
+            prog_win.after(0, lambda t=f"{mark} satır {result['satir']} {result.get('sgk', '')}":
+                           (pb.step(1), status_var.set(t)))
+
+        def task():
+            try:
+                summary = runner.run(jobs_path, results_path, progress, resume, cancel_event)
+            except Exception as e:
+                logging.error(f"İş dosyası hatası: {e}")
+                logging.error(traceback.format_exc())
+                msg = str(e)
+                self.root.after(0, lambda: (prog_win.destroy(),
+                                            messagebox.showerror("Hata", f"İş dosyası çalıştırılamadı:\n{msg}")))
+                return
+            title = "İptal Edildi" if summary["iptal"] else "Tamamlandı"
+            self.root.after(0, lambda: (prog_win.destroy(), messagebox.showinfo(
+                title,
+                f"İş dosyası {'iptal edildi' if summary['iptal'] else 'tamamlandı'}!\n\n"
+                f"• {summary['tamam']}/{summary['toplam']} iş başarılı "
+                f"({summary['atlanan']} önceki çalışmadan)\n"
+                f"• Kısmi: {summary['kismi']}, Hatalı: {summary['hata']}, Geçersiz: {summary['gecersiz']}\n"
+                f"• Sonuçlar: {summary['sonuc_dosyasi']}"
+            )))
 
-    def apply_company_info(self, sgk, replacements, tbl_path, nace_path):
-        """FormModülü mantığıyla SGK No'ya göre firma verilerini ANKARA ve NACE tablolarından çeker."""
+        threading.Thread(target=task, daemon=True).start()
+
+    def apply_company_info(self, sgk, replacements):
+        """FormModülü mantığıyla SGK No'ya göre firma verilerini firma dizininden (ANKARA ve NACE) çeker."""
         try:
-            # Dosya adı farklı olabilir; önce literal, sonra klasörde ANKARA içeren satırı bul
-            if not os.path.exists(tbl_path):
-                for f in os.listdir():
-                    if "ANKARA" in f.upper() and f.lower().endswith(".xlsx"):
-                        tbl_path = f
-                        break
-            df_ank = pd.read_excel(tbl_path, dtype=str, engine='openpyxl')
-            sgk_col = "KISA SGK" if "KISA SGK" in df_ank.columns else df_ank.columns[15]
-            df_ank[sgk_col] = df_ank[sgk_col].astype(str).str.strip()
-            satir = df_ank[df_ank[sgk_col] == sgk]
-            if not satir.empty:
-                r = satir.iloc[0]
-                field_map = {
-                    "[DEĞİŞTİR:ŞİRKET UNVANI]": r.iloc[4],
-                    "[DEĞİŞTİR:PROJEADI]": r.iloc[6],
-                    "[DEĞİŞTİR:ADRES]": r.iloc[31],
-                    "[DEĞİŞTİR:SGKSİCİL]": r.iloc[10],
-                    "[DEĞİŞTİR:SGKSİCİL20PUNTO]": r.iloc[10],
-                    "[DEĞİŞTİR:NACE]": r.iloc[9],
-                    "[DEĞİŞTİR:TEHLİKESINIFI]": r.iloc[16],
-                    "[DEĞİŞTİR:ÇALIŞANSAYISI]": r.iloc[19],
-                    "[DEĞİŞTİR:ŞİRKET UNVANI20PUNTO]": r.iloc[4],
-                    "[DEĞİŞTİR:PROJEADI20PUNTO]": r.iloc[6]
-                }
-                if "GRUP DIŞI" in str(r.iloc[4]).upper():
-                    field_map["[DEĞİŞTİR:ŞİRKET UNVANI]"] = r.iloc[6]
-                    field_map["[DEĞİŞTİR:ŞİRKET UNVANI20PUNTO]"] = r.iloc[6]
-                    field_map["[DEĞİŞTİR:PROJEADI]"] = ""
-                    field_map["[DEĞİŞTİR:PROJEADI20PUNTO]"] = ""
-                field_map["[DEĞİŞTİR:ŞİRKETPROJE]"] = (
-                    f"{field_map['[DEĞİŞTİR:ŞİRKET UNVANI]']} - "
-                    f"{field_map.get('[DEĞİŞTİR:PROJEADI]', '')}"
-                )
-                replacements.update({k: str(v) for k, v in field_map.items()})
-                # benzer şekilde NACE tablosunu bul
-                if not os.path.exists(nace_path):
-                    for f in os.listdir():
-                        if "NACE" in f.upper() and f.lower().endswith(".xlsx"):
-                            nace_path = f
-                            break
-                df_nace = pd.read_excel(nace_path, dtype=str, engine='openpyxl')
-                kcol, acol = df_nace.columns[0], df_nace.columns[1]
-                df_nace[kcol] = df_nace[kcol].astype(str).str.strip()
-                found = df_nace[df_nace[kcol] == str(field_map['[DEĞİŞTİR:NACE]'])]
-                desc = str(found.iloc[0][acol]) if not found.empty else ""
-                replacements["[DEĞİŞTİR:NACEFAALİYET]"] = desc
-                if desc:
-                    replacements["[DEĞİŞTİR:NACEVEFAALİYET]"] = (
-                        f"{field_map['[DEĞİŞTİR:NACE]']} - {desc}"
-                    )
+            fields = self.generator.directory.company_fields(sgk)
+            if fields:
+                replacements.update(fields)
         except Exception as e:
             logging.error(f"Batch firma bilgisi yükleme hatası: {e}")
 
     def apply_dynamic_fields(self, replacements):
         """Tehlike sınıfına göre yıllık ve RD periyot/saat hesaplamalarını yapar"""
-        try:
-            tehlike = replacements.get("[DEĞİŞTİR:TEHLİKESINIFI]", "").strip()
-            # Yıl ekleme haritası
-            yil_map = {"AZ TEHLİKELİ": 6, "TEHLİKELİ": 4, "ÇOK TEHLİKELİ": 2}
-            ek_yil = yil_map.get(tehlike, 0)
-            fmt = "%d.%m.%Y"
-            # Tarih başlangıç bitiş
-            pairs = [("[DEĞİŞTİR:RDEKİPATAMAEĞİTİMHAZIRLANMA]", "[DEĞİŞTİR:RDGEÇERLİLİK]"),
-                     ("[DEĞİŞTİR:ADEPEK3ATAMAEĞİTİM]", "[DEĞİŞTİR:ADEPGEÇERLİLİK]")]
-            for inp, outp in pairs:
-                start = replacements.get(inp, "").strip()
-                if start:
-                    try:
-                        dt = datetime.datetime.strptime(start, fmt)
-                        end = (dt + relativedelta(years=ek_yil)).strftime(fmt)
-                        replacements[outp] = end
-                    except Exception:
-                        pass
-            # Yıllık saat
-            igu = "4 SAAT" if tehlike == "AZ TEHLİKELİ" else "8 SAAT"
-            replacements["[DEĞİŞTİR:YILLIK:İGU:SAAT]"] = igu
-            ih = "4 SAAT" if tehlike in ("AZ TEHLİKELİ", "TEHLİKELİ") else "8 SAAT"
-            replacements["[DEĞİŞTİR:YILLIK:İH:SAAT]"] = ih
-            # RD periyot ve muayene periyot
-            per = {
-                "AZ TEHLİKELİ": ("6 Yılda 1", "5 Yılda 1"),
-                "TEHLİKELİ": ("4 Yılda 1", "3 Yılda 1"),
-                "ÇOK TEHLİKELİ": ("2 Yılda 1", "Yılda 1")
-            }.get(tehlike, ("", ""))
-            replacements["[DEĞİŞTİR:YDR:RDPERİYOT]"] = per[0]
-            replacements["[DEĞİŞTİR:YDR:MUAYENEPERİYOT]"] = per[1]
-        except Exception as e:
-            logging.error(f"Dinamik alan hesaplama hatası: {e}")
+        self.generator.apply_dynamic_fields(replacements)
 
     def select_companies(self):
         """Tüm SGK kutucuklarından firma bilgilerini alıp unvanları gösterir"""
@@ -1479,7 +4173,7 @@ class EvrakGeneratorGUI:
             # Geçici replacements dict
             repl = {}
             # Firma adını getirmek için apply_company_info'tan yararlan
-            self.apply_company_info(kod, repl, "ANKARA İŞYERI TABLOSU.xlsx", "Nace Kod Listesi.xlsx")
+            self.apply_company_info(kod, repl)
             unvan = repl.get("[DEĞİŞTİR:ŞİRKET UNVANI]", "")
             company_var.set(unvan)
 
@@ -1488,21 +4182,19 @@ class EvrakGeneratorGUI:
         """Ekrandaki verileri alıp yıllıkverileri.xlsx dosyasına yazar."""
         try:
             # Şablon veri.xlsx'ten anahtarları al
-            df_base = pd.read_excel("veri.xlsx", dtype=str, engine='openpyxl')
-            df_out = pd.DataFrame({"Anahtar": df_base["Anahtar"]})
+            keys = KeyValueTable.read("veri.xlsx").column(KeyValueTable.KEY)
+            columns = {KeyValueTable.KEY: keys}
             # Her satır için replacements oluştur ve karşılıkları kolonlara yaz
             for idx, row in enumerate(self.batch_rows, start=1):
-                if idx > 20:
-                    break
                 sgk_var, rd_m_var, rd_d_var, phone_var, email_var, _ = row
                 kod = sgk_var.get().strip()
                 if not kod:
                     # boş bırak
-                    df_out[f"Karşılık{idx}"] = ""
+                    columns[f"Karşılık{idx}"] = [""] * len(keys)
                     continue
                 repl = {}
                 # Firma verisi
-                self.apply_company_info(kod, repl, "ANKARA İŞYERI TABLOSU.xlsx", "Nace Kod Listesi.xlsx")
+                self.apply_company_info(kod, repl)
                 # Yıllık/RD/Telefon/E-mail bilgileri
                 repl.update({
                     "[DEĞİŞTİR:YILLIK:TARİH]": self.batch_date_var.get().strip(),
@@ -1517,12 +4209,12 @@ class EvrakGeneratorGUI:
                 # Dinamik saat, periyot ve geçerlilik hesapla
                 self.apply_dynamic_fields(repl)
                 # Mapla karşılıkları
-                df_out[f"Karşılık{idx}"] = df_base["Anahtar"].map(lambda k: repl.get(k, ""))
+                columns[f"Karşılık{idx}"] = [repl.get(k, "") for k in keys]
             # Kaydet
             # Yıllık verileri program klasöründe sakla
             base_dir = os.getcwd()
             out_path = os.path.join(base_dir, "yıllıkverileri.xlsx")
-            df_out.to_excel(out_path, index=False, engine='openpyxl')
+            KeyValueTable(columns, zip(*columns.values())).write(out_path)
             messagebox.showinfo("Kaydedildi", f"Yıllık verileri kaydedildi:\n{out_path}")
             logging.info(f"Yıllık verileri dosyası oluşturuldu: {out_path}")
         except Exception as e:
@@ -1530,135 +4222,77 @@ class EvrakGeneratorGUI:
             messagebox.showerror("Hata", f"Veri kaydetme hatası:\n{e}")
 
     def run_batch_yearly(self):
-        """Girilen verilerle toplu yıllıkları oluşturur"""
-        # PDF oluşturma tercihini al
-        self.generator.generate_pdf = self.generate_pdf_var.get()
+        """Girilen verilerle toplu yıllıkları firma bazında paralel oluşturur"""
+        # Tk değişkenleri ana thread'de okunur; üretim arka planda yürür
+        generate_pdf = self.generate_pdf_var.get()
         date_str = self.batch_date_var.get().strip()
         try:
-            dt = datetime.datetime.strptime(date_str, "%d.%m.%Y")
-            year_str = str(dt.year)
+            datetime.datetime.strptime(date_str, "%d.%m.%Y")
         except Exception:
             messagebox.showerror("Hata", f"Tarih formatı yanlış: {date_str}")
             return
-        # Hedef klasör
         # Hedef klasör: proje dizini altında 'Yıllıklar'
         base_dir = os.getcwd()
         folder_name = f"{datetime.datetime.now().strftime('%Y-%m-%d')} Yıllıklar"
         out_folder = os.path.join(base_dir, folder_name)
         os.makedirs(out_folder, exist_ok=True)
-        # Şablon tablo dosyaları
-        tbl_path = "ANKARA İŞYERI TABLOSU.xlsx"
-        nace_path = "Nace Kod Listesi.xlsx"
         # Eğer kayıtlı yıllıkverileri.xlsx varsa, ondan oku
         yfile = os.path.join(os.getcwd(), "yıllıkverileri.xlsx")
-        if os.path.exists(yfile):
-            df_year = pd.read_excel(yfile, dtype=str, engine='openpyxl')
-            for idx in range(1, 21):
-                key = f"Karşılık{idx}"
-                if key not in df_year.columns:
-                    break
-                replacements = dict(zip(df_year['Anahtar'], df_year[key].fillna('').astype(str)))
-                sgk = replacements.get("[DEĞİŞTİR:SGKSİCİL]", "").strip()
-                if not sgk:
-                    continue
-                self.generator.process_yearly_plan_document(
-                    "Yıllık Eğitim Planı", replacements, sgk, out_folder, out_folder)
-                self.generator.process_yearly_plan_document(
-                    "Yıllık Çalışma Planı", replacements, sgk, out_folder, out_folder)
-                self.generator.process_document(
-                    "Yıllık Değerlendirme Raporu.xlsx", replacements, sgk, out_folder, out_folder)
-            messagebox.showinfo("Tamam", "Toplu yıllık oluşturma tamamlandı.")
-            return
-        # Her satır için oluştur (GUI girişleri)
+        use_file = os.path.exists(yfile)
+        rows = []
         for sgk_var, rd_method_var, rd_date_var, phone_var, email_var, _ in self.batch_rows:
             sgk = sgk_var.get().strip()
-            if not sgk:
-                continue
-            rd_method = rd_method_var.get()
-            rd_date = rd_date_var.get().strip()
-            phone = phone_var.get().strip()
-            email = email_var.get().strip()
-            # Temel verileri yükle
-            replacements, _ = self.generator.load_replacements()
-            # Firma bilgilerini ANKARA tablosundan çek (FormModülü mantığı)
-            try:
-                df_ank = pd.read_excel(tbl_path, dtype=str, engine='openpyxl')
-                sgk_col = "KISA SGK" if "KISA SGK" in df_ank.columns else df_ank.columns[15]
-                df_ank[sgk_col] = df_ank[sgk_col].astype(str).str.strip()
-                satir = df_ank[df_ank[sgk_col] == sgk]
-                if not satir.empty:
-                    r = satir.iloc[0]
-                    # Firma bilgileri - ANKARA tablosundan
-                    field_map = {
-                        "[DEĞİŞTİR:İL]": r.iloc[3],
-                        "[DEĞİŞTİR:ŞİRKET UNVANI]": r.iloc[4],
-                        "[DEĞİŞTİR:PROJEADI]": r.iloc[6],
-                        "[DEĞİŞTİR:ADRES]": r.iloc[31],
-                        "[DEĞİŞTİR:SGKSİCİL]": r.iloc[10],
-                        "[DEĞİŞTİR:SGKSİCİL20PUNTO]": r.iloc[10],
-                        "[DEĞİŞTİR:NACE]": r.iloc[9],
-                        "[DEĞİŞTİR:TEHLİKESINIFI]": r.iloc[16],
-                        "[DEĞİŞTİR:ÇALIŞANSAYISI]": r.iloc[19],
-                        # Uzman ve Hekim adları; V (22), Z (26) sütunlarından
-                        "[DEĞİŞTİR:UZMANADI]": r.iloc[21],
-                        "[DEĞİŞTİR:HEKİMADI]": r.iloc[25],
-                        "[DEĞİŞTİR:ŞİRKET UNVANI20PUNTO]": r.iloc[4],
-                        "[DEĞİŞTİR:PROJEADI20PUNTO]": r.iloc[6]
-                    }
-                    # Grup dışı kontrolü
-                    if "GRUP DIŞI" in str(r.iloc[4]).upper():
-                        # Şirket unvanı yerine proje adı
-                        field_map["[DEĞİŞTİR:ŞİRKET UNVANI]"] = r.iloc[6]
-                        field_map["[DEĞİŞTİR:ŞİRKET UNVANI20PUNTO]"] = r.iloc[6]
-                        field_map["[DEĞİŞTİR:PROJEADI]"] = ""
-                        field_map["[DEĞİŞTİR:PROJEADI20PUNTO]"] = ""
-                    # Şirket-Proje kombinasyonu
-                    field_map["[DEĞİŞTİR:ŞİRKETPROJE]"] = f"{field_map['[DEĞİŞTİR:ŞİRKET UNVANI]']} - {field_map.get('[DEĞİŞTİR:PROJEADI]', '')}"
-                    replacements.update({k: str(v) for k, v in field_map.items()})
-                    # NACE açıklaması ve kombinasyon
-                    df_nace = pd.read_excel(nace_path, dtype=str, engine='openpyxl')
-                    kcol, acol = df_nace.columns[0], df_nace.columns[1]
-                    df_nace[kcol] = df_nace[kcol].astype(str).str.strip()
-                    find = df_nace[df_nace[kcol] == str(field_map['[DEĞİŞTİR:NACE]'])]
-                    aciklama = str(find.iloc[0][acol]) if not find.empty else ""
-                    replacements["[DEĞİŞTİR:NACEFAALİYET]"] = aciklama
-                    # NACE ve faaliyet kombinasyonu
-                    if aciklama:
-                        replacements["[DEĞİŞTİR:NACEVEFAALİYET]"] = f"{field_map['[DEĞİŞTİR:NACE]']} - {aciklama}"
-            except Exception as e:
-                logging.error(f"Batch firma bilgisi yükleme hatası: {e}")
-            # Yıllık/RD/Telefon/E-mail bilgileri (firma SGKSİCİL ANKARA tablosundan çekildi)
-            replacements.update({
-                "[DEĞİŞTİR:YILLIK:TARİH]": date_str,
-                "[DEĞİŞTİR:YILLIK:YIL]": year_str,
-                "[DEĞİŞTİR:RDYONTEMI]": rd_method,
-                "[DEĞİŞTİR:YDR:TARİH]": rd_date,
-                "[DEĞİŞTİR:RDEKİPATAMAEĞİTİMHAZIRLANMA]": rd_date,
-                "[DEĞİŞTİR:TELEFON]": phone,
-                "[DEĞİŞTİR:MAİL]": email
-            })
-            # Dinamik periyot, saat, geçerlilik tarihleri hesapla
-            self.apply_dynamic_fields(replacements)
-            # Replacements Excel dosyası oluştur (veri.xlsx şablonuna benzer)
+            if sgk:
+                rows.append((sgk, rd_method_var.get(), rd_date_var.get().strip(),
+                             phone_var.get().strip(), email_var.get().strip()))
+        scheduler = YearlyBatchScheduler(self.generator, None if self.parallel_var.get() else 1)
+        journal = self._open_journal(out_folder)
+        cancel_event = threading.Event()
+        prog_win, pb, status_var = self._create_progress_window("Toplu Yıllık Oluşturuluyor", max(1, len(rows)),
+                                                                cancel_event)
+        status_var.set("Firma verileri hazırlanıyor…")
+
+        def task():
             try:
-                df_base = pd.read_excel("veri.xlsx", dtype=str, engine='openpyxl')
-                df_base.loc[df_base["Anahtar"].isin(replacements.keys()), "Karşılık"] = (
-                    df_base["Anahtar"].map(replacements)
-                )
-                temp_xls = os.path.join(out_folder, f"veri_{sgk}.xlsx")
-                df_base.to_excel(temp_xls, index=False, engine='openpyxl')
-                logging.info(f"Replacements dosyası oluşturuldu: {temp_xls}")
+                if use_file:
+                    jobs, failures = scheduler.jobs_from_yearly_file(yfile, out_folder, generate_pdf), []
+                else:
+                    jobs, failures = scheduler.jobs_from_rows(rows, date_str, out_folder, generate_pdf)
+                total = max(1, len(jobs))
+                prog_win.after(0, lambda: pb.config(maximum=total))
+
+                def on_result(done, result):
+                    mark = "✓" if result.ok else "✗"
+                    # ProgressBar'ı ana thread'de güncelle
+                    prog_win.after(0, lambda v=done, t=f"{mark} {result.sgk} ({done}/{total})":
+                                   (pb.config(value=v), status_var.set(t)))
+
+                results = failures + scheduler.run(jobs, on_result, journal, cancel_event)
             except Exception as e:
-                logging.error(f"Replacements dosyası oluşturma hatası: {e}")
-            # Yıllık Eğitim ve Çalışma Planı
-            self.generator.process_yearly_plan_document(
-                "Yıllık Eğitim Planı", replacements, sgk, out_folder, out_folder)
-            self.generator.process_yearly_plan_document(
-                "Yıllık Çalışma Planı", replacements, sgk, out_folder, out_folder)
-            # Yıllık Değerlendirme Raporu
-            self.generator.process_document(
-                "Yıllık Değerlendirme Raporu.xlsx", replacements, sgk, out_folder, out_folder)
-        messagebox.showinfo("Tamam", "Toplu yıllık oluşturma tamamlandı.")
+                logging.error(f"Toplu yıllık hatası: {e}")
+                logging.error(traceback.format_exc())
+                msg = str(e)
+                self.root.after(0, lambda: (prog_win.destroy(),
+                                            messagebox.showerror("Hata", f"Toplu yıllık oluşturulamadı:\n{msg}")))
+                return
+            if cancel_event.is_set():
+                msg = self._cancel_message(sum(1 for r in results if r.ok), len(jobs) + len(failures))
+                self.root.after(0, lambda: (prog_win.destroy(), messagebox.showinfo("İptal Edildi", msg)))
+                return
+            summary = YearlyBatchScheduler.summarize(results)
+            if all(r.ok for r in results):
+                journal.discard()
+            if any(not r.ok for r in results):
+                self.root.after(0, lambda: (prog_win.destroy(),
+                                            messagebox.showwarning("Tamamlandı (hatalarla)",
+                                                                   f"{summary}\n\n• Klasör: {out_folder}")))
+            else:
+                self.root.after(0, lambda: (prog_win.destroy(),
+                                            messagebox.showinfo("Tamam",
+                                                                f"Toplu yıllık oluşturma tamamlandı.\n\n"
+                                                                f"{summary}\n• Klasör: {out_folder}")))
+
+        threading.Thread(target=task, daemon=True).start()
     
     def launch_batch_faaliyet(self):
         """Toplu Faaliyet Formu oluşturma penceresini açar"""
@@ -1823,6 +4457,15 @@ class EvrakGeneratorGUI:
             olustur_btn.configure(highlightbackground="#e8f5e8")
         
         olustur_btn.pack(side="right")
+        
+        # Tüm firmaları tek çalışma kitabında (firma başına bir sayfa) toplama seçeneği
+        self.batch_faaliyet_single_var = tk.BooleanVar(value=False)
+        single_chk = tk.Checkbutton(button_frame, text="Tek dosyada birleştir",
+                                    variable=self.batch_faaliyet_single_var,
+                                    bg="#f8f9fa", fg="#2c3e50",
+                                    selectcolor="#f8f9fa",
+                                    font=(default_font, 10))
+        single_chk.pack(side="right", padx=(0, 15))
     
     def add_batch_sgk_entry(self):
         """Yeni SGK girişi ekler"""
@@ -1855,9 +4498,12 @@ class EvrakGeneratorGUI:
     
     def validate_batch_sgk_codes(self):
         """SGK kodlarını doğrular ve şirket-proje bilgilerini gösterir"""
-        # Ankara tablosunu yükle
-        df_ankara = self.load_ankara_table_for_batch()
-        if df_ankara is None:
+        # Ankara tablosunu yükle (değişmediyse önbellekten)
+        try:
+            self.generator.directory.load()
+        except Exception as e:
+            messagebox.showerror("Hata", f"Ankara tablosu açılamadı:\n{e}")
+            logging.error(f"Ankara tablosu yükleme hatası: {e}")
             return
         
         for i, (sgk_entry, label) in enumerate(zip(self.batch_sgk_entries, self.batch_sgk_labels)):
@@ -1871,53 +4517,21 @@ class EvrakGeneratorGUI:
                 label.config(text="❌ Geçersiz SGK (7 hane olmalı)", fg="#d32f2f")
                 continue
             
-            # SGK koduna göre satırı bul
-            satir = self.find_sgk_row_in_table(df_ankara, sgk_kod)
-            if satir is None:
+            # SGK koduna göre firma bilgilerini bul
+            fields = self.generator.directory.company_fields(sgk_kod)
+            if fields is None:
                 label.config(text="❌ SGK kodu bulunamadı", fg="#d32f2f")
                 continue
             
-            # Şirket ve proje bilgilerini göster
-            sirket = str(satir.iloc[4]) if not pd.isna(satir.iloc[4]) else ""
-            proje = str(satir.iloc[6]) if not pd.isna(satir.iloc[6]) else ""
-            
-            if "GRUP DIŞI" in sirket.upper():
-                text = f"✅ {proje}"
-            else:
-                text = f"✅ {sirket} - {proje}" if proje else f"✅ {sirket}"
-            
-            label.config(text=text, fg="#2e7d32")
-    
-    def load_ankara_table_for_batch(self):
-        """Ankara tablosunu yükler"""
-        try:
-            df = pd.read_excel("ANKARA İŞYERİ TABLOSU.xlsx", dtype=str, engine='openpyxl')
-            logging.info("Ankara tablosu batch için yüklendi")
-            return df
-        except Exception as e:
-            messagebox.showerror("Hata", f"Ankara tablosu açılamadı:\n{e}")
-            logging.error(f"Ankara tablosu yükleme hatası: {e}")
-            return None
+            # Şirket ve proje bilgilerini göster (grup dışında yalnızca proje adı)
+            label.config(text=f"✅ {fields['[DEĞİŞTİR:ŞİRKETPROJE]']}", fg="#2e7d32")
     
     def validate_sgk_code_format(self, kod):
         """SGK kodunu doğrular"""
         return len(kod) == 7 and kod.isdigit()
     
-    def find_sgk_row_in_table(self, df_ankara, kod):
-        """SGK koduna göre satırı bulur"""
-        # SGK sütununu bul
-        sgk_col = "KISA SGK" if "KISA SGK" in df_ankara.columns else df_ankara.columns[15]
-        df_ankara[sgk_col] = df_ankara[sgk_col].astype(str).str.strip()
-        
-        # Satırı bul
-        satirlar = df_ankara[df_ankara[sgk_col] == kod]
-        if satirlar.empty:
-            return None
-        
-        return satirlar.iloc[0]
-    
     def create_batch_faaliyet_forms(self):
-        """Toplu faaliyet formlarını oluşturur"""
+        """Toplu faaliyet formlarını faaliyet motoruyla arka planda oluşturur"""
         try:
             # Tarihi al (basit Entry widget'ından)
             selected_date = self.batch_faaliyet_tarihi.get().strip()
@@ -1934,7 +4548,7 @@ class EvrakGeneratorGUI:
             valid_sgk_codes = []
             for sgk_entry in self.batch_sgk_entries:
                 sgk_kod = sgk_entry.get().strip()
-                if sgk_kod and len(sgk_kod) == 7 and sgk_kod.isdigit():
+                if sgk_kod and self.validate_sgk_code_format(sgk_kod):
                     valid_sgk_codes.append(sgk_kod)
             
             if not valid_sgk_codes:
@@ -1942,14 +4556,8 @@ class EvrakGeneratorGUI:
                 return
             
             # Masaüstünde klasör oluştur
-            if selected_date:
-                folder_name = f"{selected_date} - Faaliyet Formları"
-            else:
-                folder_name = "Faaliyet Formları"
-            
-            desktop_path = self.get_desktop_path()
-            output_folder = os.path.join(desktop_path, folder_name)
-            
+            output_folder = FaaliyetBatchEngine.default_output_folder(selected_date)
+            folder_name = os.path.basename(output_folder)
             try:
                 os.makedirs(output_folder, exist_ok=True)
                 logging.info(f"Çıkış klasörü oluşturuldu: {output_folder}")
@@ -1957,26 +4565,70 @@ class EvrakGeneratorGUI:
                 logging.error(f"Klasör oluşturma hatası: {e}")
                 messagebox.showerror("Hata", f"Klasör oluşturulamadı: {str(e)}")
                 return
-            
-            # Her SGK kodu için faaliyet formu oluştur
-            created_files = []
-            for sgk_kod in valid_sgk_codes:
-                file_path = self.create_single_batch_faaliyet_form(sgk_kod, selected_date, output_folder)
-                if file_path:
-                    created_files.append(file_path)
-            
-            if created_files:
-                messagebox.showinfo("Başarılı", 
-                                  f"{len(created_files)} adet faaliyet formu oluşturuldu!\n\n"
-                                  f"Klasör: {folder_name}\n"
-                                  f"Masaüstünde dosyalar hazır.")
-                self.batch_faaliyet_window.destroy()
-            else:
-                messagebox.showerror("Hata", "Hiçbir form oluşturulamadı!")
-        
         except Exception as e:
             logging.error(f"Toplu faaliyet formu hatası: {e}")
             messagebox.showerror("Hata", f"Form oluşturma hatası: {str(e)}")
+            return
+        
+        engine = FaaliyetBatchEngine(self.generator, None if self.parallel_var.get() else 1)
+        single_file = self.batch_faaliyet_single_var.get()
+        generate_pdf = self.generate_pdf_var.get()
+        # Tek dosya modu tek yazmadır; günlük ve iptal yalnızca form başına modda kullanılır
+        journal = None if single_file else self._open_journal(output_folder)
+        cancel_event = None if single_file else threading.Event()
+        prog_win, pb, status_var = self._create_progress_window("Faaliyet Formları Oluşturuluyor",
+                                                                len(valid_sgk_codes), cancel_event)
+        prog_win.transient(self.batch_faaliyet_window)
+        
+        def on_result(done, result):
+            mark = "✓" if result.ok else "✗"
+            prog_win.after(0, lambda v=done, t=f"{mark} {result.sgk}": (pb.config(value=v), status_var.set(t)))
+        
+        def task():
+            try:
+                if single_file:
+                    _, results = engine.run_consolidated(valid_sgk_codes, selected_date, output_folder,
+                                                         generate_pdf, on_result)
+                else:
+                    results = engine.run(valid_sgk_codes, selected_date, output_folder, on_result,
+                                         journal, cancel_event)
+            except Exception as e:
+                logging.error(f"Toplu faaliyet formu hatası: {e}")
+                logging.error(traceback.format_exc())
+                msg = str(e)
+                self.root.after(0, lambda: (prog_win.destroy(),
+                                            messagebox.showerror("Hata", f"Form oluşturma hatası: {msg}")))
+                return
+            if cancel_event is not None and cancel_event.is_set():
+                msg = self._cancel_message(sum(1 for r in results if r.ok), len(valid_sgk_codes))
+                self.root.after(0, lambda: (prog_win.destroy(), messagebox.showinfo("İptal Edildi", msg)))
+                return
+            if journal is not None and all(r.ok for r in results):
+                journal.discard()
+            self.root.after(0, lambda: self._finish_batch_faaliyet(prog_win, results, folder_name, single_file))
+        
+        threading.Thread(target=task, daemon=True).start()
+    
+    def _finish_batch_faaliyet(self, prog_win, results, folder_name, single_file=False):
+        """Faaliyet motoru sonuçlarını kullanıcıya bildirir"""
+        prog_win.destroy()
+        created = [r for r in results if r.ok]
+        failed = [r for r in results if not r.ok]
+        if not created:
+            messagebox.showerror("Hata", "Hiçbir form oluşturulamadı!\n\n" +
+                                 "\n".join(f"• {r.sgk}: {r.error}" for r in failed[:10]))
+            return
+        if single_file:
+            header = f"{len(created)} firma tek dosyada birleştirildi!\n{os.path.basename(created[0].output_path)}\n\n"
+        else:
+            header = f"{len(created)} adet faaliyet formu oluşturuldu!\n\n"
+        message = (header +
+                   f"Klasör: {folder_name}\n"
+                   f"Masaüstünde dosyalar hazır.")
+        if failed:
+            message += "\n\nOluşturulamayanlar:\n" + "\n".join(f"• {r.sgk}: {r.error}" for r in failed[:10])
+        messagebox.showinfo("Başarılı", message)
+        self.batch_faaliyet_window.destroy()
     
     def get_desktop_path(self):
         """Masaüstü yolunu döndürür"""
@@ -1987,130 +4639,11 @@ class EvrakGeneratorGUI:
         else:
             return os.path.join(os.path.expanduser("~"), "Desktop")
     
-    def create_single_batch_faaliyet_form(self, sgk_kod, faaliyet_tarihi, output_folder):
-        """Tek bir SGK kodu için faaliyet formu oluşturur"""
-        try:
-            # Ankara tablosunu yükle
-            df_ankara = self.load_ankara_table_for_batch()
-            if df_ankara is None:
-                return None
-            
-            # SGK koduna göre satırı bul
-            satir = self.find_sgk_row_in_table(df_ankara, sgk_kod)
-            if satir is None:
-                logging.error(f"SGK kodu bulunamadı: {sgk_kod}")
-                return None
-            
-            # Form verilerini oluştur
-            replacements = self.create_replacements_from_row(satir, faaliyet_tarihi)
-            
-            # Faaliyet formu şablonunu kullan
-            template_path = os.path.join("Evraklar", "FAALİYET FORMU.xlsx")
-            if not os.path.exists(template_path):
-                logging.error(f"Faaliyet formu şablonu bulunamadı: {template_path}")
-                return None
-            
-            # Hedef dosya adını oluştur
-            sirket_proje = replacements.get("[DEĞİŞTİR:ŞİRKETPROJE]", f"SGK-{sgk_kod}")
-            output_name = f"{sirket_proje} - Faaliyet Formu.xlsx"
-            output_path = os.path.join(output_folder, output_name)
-            
-            # Template'i kopyala
-            shutil.copy2(template_path, output_path)
-            
-            # Placeholder'ları doldur
-            success = DocumentProcessor.process_excel_document(template_path, output_path, replacements)
-            if not success:
-                logging.error(f"Placeholder doldurma başarısız: {output_path}")
-                return None
-            
-            logging.info(f"Faaliyet formu oluşturuldu: {output_path}")
-            return output_path
-            
-        except Exception as e:
-            logging.error(f"Tek faaliyet formu hatası: {e}")
-            return None
-    
-    def create_replacements_from_row(self, satir, faaliyet_tarihi):
-        """Satır verilerinden replacement dictionary oluşturur"""
-        replacements = {}
-        
-        # Temel bilgiler
-        replacements["[DEĞİŞTİR:ŞİRKET UNVANI]"] = str(satir.iloc[4]) if not pd.isna(satir.iloc[4]) else ""
-        replacements["[DEĞİŞTİR:PROJEADI]"] = str(satir.iloc[6]) if not pd.isna(satir.iloc[6]) else ""
-        replacements["[DEĞİŞTİR:ADRES]"] = str(satir.iloc[31]) if not pd.isna(satir.iloc[31]) else ""
-        replacements["[DEĞİŞTİR:SGKSİCİL]"] = str(satir.iloc[10]) if not pd.isna(satir.iloc[10]) else ""
-        replacements["[DEĞİŞTİR:SGKSİCİL20PUNTO]"] = str(satir.iloc[10]) if not pd.isna(satir.iloc[10]) else ""
-        replacements["[DEĞİŞTİR:NACE]"] = str(satir.iloc[9]) if not pd.isna(satir.iloc[9]) else ""
-        replacements["[DEĞİŞTİR:TEHLİKESINIFI]"] = str(satir.iloc[16]) if not pd.isna(satir.iloc[16]) else ""
-        replacements["[DEĞİŞTİR:ÇALIŞANSAYISI]"] = str(satir.iloc[19]) if not pd.isna(satir.iloc[19]) else ""
-        replacements["[DEĞİŞTİR:ŞİRKET UNVANI20PUNTO]"] = str(satir.iloc[4]) if not pd.isna(satir.iloc[4]) else ""
-        replacements["[DEĞİŞTİR:PROJEADI20PUNTO]"] = str(satir.iloc[6]) if not pd.isna(satir.iloc[6]) else ""
-        
-        # Yeni placeholder'lar
-        replacements["[DEĞİŞTİR:İL]"] = str(satir.iloc[3]) if not pd.isna(satir.iloc[3]) else ""
-        replacements["[DEĞİŞTİR:UZMANADI]"] = str(satir.iloc[21]) if not pd.isna(satir.iloc[21]) else ""
-        replacements["[DEĞİŞTİR:HEKİMADI]"] = str(satir.iloc[25]) if not pd.isna(satir.iloc[25]) else ""
-        
-        # Faaliyet tarihi - tarih varsa ekle, yoksa hiç ekleme (placeholder silinsin)
-        if faaliyet_tarihi:
-            replacements["[DEĞİŞTİR:FAALİYETTARİH]"] = faaliyet_tarihi
-        # Tarih yoksa placeholder'ı replacement'a hiç eklememiz yeterli, DocumentProcessor otomatik silecek
-        
-        # Grup dışı kontrolü
-        sirket_unvani = replacements["[DEĞİŞTİR:ŞİRKET UNVANI]"]
-        proje_adi = replacements["[DEĞİŞTİR:PROJEADI]"]
-        
-        if "GRUP DIŞI" in sirket_unvani.upper():
-            replacements["[DEĞİŞTİR:ŞİRKET UNVANI]"] = proje_adi
-            replacements["[DEĞİŞTİR:ŞİRKET UNVANI20PUNTO]"] = proje_adi
-            replacements["[DEĞİŞTİR:PROJEADI]"] = ""
-            replacements["[DEĞİŞTİR:PROJEADI20PUNTO]"] = ""
-            replacements["[DEĞİŞTİR:ŞİRKETPROJE]"] = proje_adi
-        else:
-            if proje_adi:
-                replacements["[DEĞİŞTİR:ŞİRKETPROJE]"] = f"{sirket_unvani} - {proje_adi}"
-            else:
-                replacements["[DEĞİŞTİR:ŞİRKETPROJE]"] = sirket_unvani
-        
-        # NACE açıklamasını doldur
-        self.fill_nace_for_replacement(replacements)
-        
-        return replacements
-    
-    def fill_nace_for_replacement(self, replacements):
-        """NACE açıklamasını replacement'a ekler"""
-        nace_kod = replacements.get("[DEĞİŞTİR:NACE]", "")
-        
-        if not nace_kod:
-            return
-        
-        try:
-            # NACE tablosunu yükle
-            df_nace = pd.read_excel("Nace Kod Listesi.xlsx", dtype=str, engine='openpyxl')
-            col_kod, col_aciklama = df_nace.columns[0], df_nace.columns[1]
-            df_nace[col_kod] = df_nace[col_kod].astype(str).str.strip()
-            
-            # NACE açıklamasını bul
-            found = df_nace[df_nace[col_kod] == nace_kod]
-            aciklama = "" if found.empty else str(found.iloc[0][col_aciklama])
-            
-            replacements["[DEĞİŞTİR:NACEFAALİYET]"] = aciklama
-            
-            # NACE ve Faaliyet kombinasyonunu oluştur
-            if aciklama:
-                replacements["[DEĞİŞTİR:NACEVEFAALİYET]"] = f"{nace_kod} - {aciklama}"
-            
-            logging.info(f"NACE açıklaması bulundu: {nace_kod}")
-            
-        except Exception as e:
-            logging.error(f"NACE açıklama hatası: {e}")
-    
     def create_all_documents(self):
         """Tüm belgeleri oluşturur"""
         # 1) Yedek ve belge listesini hazırla
         try:
-            replacements, df = self.generator.load_replacements()
+            replacements, table = self.generator.load_replacements()
             project_name = self.generator.get_project_name(replacements)
         except Exception as e:
             messagebox.showerror("Hata", f"Veri yüklenirken hata oluştu:\n{e}")
@@ -2133,47 +4666,54 @@ class EvrakGeneratorGUI:
             messagebox.showwarning("Uyarı", "İşlenecek belge bulunamadı!")
             return
 
-        # 2) İlerleme penceresi oluştur
-        prog_win = Toplevel(self.root)
-        prog_win.title("Tüm Belgeler Oluşturuluyor…")
-        prog_win.geometry("400x100")
-        # Pencereyi ekranın tam ortasına yerleştir
-        prog_win.update_idletasks()
-        width = 400
-        height = 100
-        x = (prog_win.winfo_screenwidth() // 2) - (width // 2)
-        y = (prog_win.winfo_screenheight() // 2) - (height // 2)
-        prog_win.geometry(f"{width}x{height}+{x}+{y}")
-        tk.Label(prog_win, text="Lütfen bekleyin…", font=(DEFAULT_FONT, 10)).pack(pady=(10, 5))
-        pb = ttk.Progressbar(prog_win, orient="horizontal", length=300, mode="determinate")
-        pb.pack(pady=(0, 10))
-        pb["maximum"] = len(docs)
-        pb["value"] = 0
-
-        # 3) Arka planda belge işleme
-        def task():
-            # PDF oluşturma tercihini al
-            self.generator.generate_pdf = self.generate_pdf_var.get()
-            # Klasörleri oluştur ve yedeğe veri.xlsx kaydet
+        # 2) Klasörleri oluştur; yarım kalmış çalışma varsa devam edilip edilmeyeceğini sor
+        try:
             target_folder, backup_folder = self.generator.create_folders(project_name)
-            df.to_excel(os.path.join(backup_folder, "veri.xlsx"), index=False, engine='openpyxl')
+            journal = self._open_journal(target_folder)
+        except Exception as e:
+            messagebox.showerror("Hata", f"Klasör oluşturulamadı:\n{e}")
+            return
 
-            success_count = 0
-            for idx, doc in enumerate(docs, start=1):
-                if self.generator.process_document(doc, replacements,
-                        project_name, target_folder, backup_folder):
-                    success_count += 1
-                # ProgressBar güncelle
-                prog_win.after(0, lambda v=idx: pb.config(value=v))
+        # 3) İlerleme penceresi oluştur (iptal edilebilir)
+        cancel_event = threading.Event()
+        prog_win, pb, status_var = self._create_progress_window("Tüm Belgeler Oluşturuluyor…", len(docs),
+                                                                cancel_event)
+
+        # PDF ve üretim tercihlerini al (Tk değişkenleri yalnızca arayüz iş parçacığında okunur)
+        self.generator.generate_pdf = self.generate_pdf_var.get()
+        options = self.generation_options()
+
+        # 4) Arka planda belge işleme
+        def task():
+            try:
+                # Yedeğe veri.xlsx kaydet
+                table.write(os.path.join(backup_folder, "veri.xlsx"))
+                results = self._run_jobs_with_progress(docs, replacements, project_name,
+                                                       target_folder, backup_folder, prog_win, pb, status_var,
+                                                       journal, cancel_event, options)
+            except Exception as e:
+                logging.error(f"Genel hata: {e}")
+                logging.error(traceback.format_exc())
+                msg = str(e)
+                prog_win.after(0, prog_win.destroy)
+                self.root.after(0, lambda: messagebox.showerror("Hata", f"İşlem sırasında hata oluştu:\n{msg}"))
+                return
 
             # İşlem bitince pencereyi kapat
             prog_win.after(0, prog_win.destroy)
+            if cancel_event.is_set():
+                msg = self._cancel_message(sum(1 for r in results if r.ok), len(docs))
+                self.root.after(0, lambda: messagebox.showinfo("İptal Edildi", msg))
+                return
+            if all(r.ok for r in results):
+                journal.discard()
             # “Tamamlandı” mesajını ana/root penceresine schedule et
+            summary = self._summarize_results(results)
             self.root.after(0, lambda:
                 messagebox.showinfo(
                     "Tamamlandı",
                     f"İşlem tamamlandı!\n\n"
-                    f"• {success_count}/{len(docs)} belge başarıyla işlendi\n"
+                    f"{summary}\n"
                     f"• Belgeler masaüstünde '{project_name}' klasöründe"
                 )
             )
@@ -2183,12 +4723,12 @@ class EvrakGeneratorGUI:
     def create_selected_documents(self):
         """Belge seçim ekranını açar"""
         try:
-            replacements, df = self.generator.load_replacements()
+            replacements, table = self.generator.load_replacements()
             project_name = self.generator.get_project_name(replacements)
             target_folder, backup_folder = self.generator.create_folders(project_name)
             
             # veri.xlsx'i yedekle
-            df.to_excel(os.path.join(backup_folder, "veri.xlsx"), index=False, engine='openpyxl')
+            table.write(os.path.join(backup_folder, "veri.xlsx"))
 
 
             # Yıllık tarih/yıl bilgisi yoksa bugünün tarihiyle doldur (dinamik silme algoritması için)
@@ -2252,46 +4792,40 @@ class EvrakGeneratorGUI:
                 # Seçim penceresini kapat
                 selection_window.destroy()
 
-                # 1) İlerleme penceresi oluştur
-                prog_win = Toplevel(self.root)
-                prog_win.title("Belgeler Oluşturuluyor…")
-                prog_win.geometry("400x100")
-                # Pencereyi ekranın tam ortasına yerleştir
-                prog_win.update_idletasks()
-                width = 400
-                height = 100
-                x = (prog_win.winfo_screenwidth() // 2) - (width // 2)
-                y = (prog_win.winfo_screenheight() // 2) - (height // 2)
-                prog_win.geometry(f"{width}x{height}+{x}+{y}")
-                tk.Label(prog_win, text="Lütfen bekleyin…", font=(DEFAULT_FONT, 10)).pack(pady=(10, 5))
-                pb = ttk.Progressbar(prog_win, orient="horizontal",
-                                     length=300, mode="determinate")
-                pb.pack(pady=(0,10))
-                pb["maximum"] = len(selected_files)
-                pb["value"] = 0
-
-                # PDF oluşturma tercihini al
+                # 1) İlerleme penceresi oluştur (iptal edilebilir)
+                journal = self._open_journal(target_folder)
+                cancel_event = threading.Event()
+                prog_win, pb, status_var = self._create_progress_window("Belgeler Oluşturuluyor…",
+                                                                        len(selected_files), cancel_event)
+
+                # PDF ve üretim tercihlerini al
                 self.generator.generate_pdf = self.generate_pdf_var.get()
+                options = self.generation_options()
                 # 2) Arka planda çalışacak işlev
                 def task():
-                    success_count = 0
-                    for idx, doc in enumerate(selected_files, start=1):
-                        ok = self.generator.process_document(
-                            doc, replacements, project_name,
-                            target_folder, backup_folder
-                        )
-                        if ok:
-                            success_count += 1
-
-                        # ProgressBar'ı ana thread'de güncelle
-                        prog_win.after(0, lambda v=idx: pb.config(value=v))
+                    try:
+                        results = self._run_jobs_with_progress(selected_files, replacements, project_name,
+                                                               target_folder, backup_folder,
+                                                               prog_win, pb, status_var,
+                                                               journal, cancel_event, options)
+                    except Exception as e:
+                        logging.error(f"Belge oluşturma hatası: {e}")
+                        logging.error(traceback.format_exc())
+                        results = [DocumentResult(doc, False, str(e), [], 0.0) for doc in selected_files]
 
                     # İş bittiğinde pencereleri kapat ve sonucu göster
                     prog_win.after(0, prog_win.destroy)
-                    prog_win.after(0, lambda:
+                    if cancel_event.is_set():
+                        msg = self._cancel_message(sum(1 for r in results if r.ok), len(selected_files))
+                        self.root.after(0, lambda: messagebox.showinfo("İptal Edildi", msg))
+                        return
+                    if all(r.ok for r in results):
+                        journal.discard()
+                    summary = self._summarize_results(results)
+                    self.root.after(0, lambda:
                         messagebox.showinfo(
                             "Tamamlandı",
-                            f"İşlem tamamlandı!\n\n• {success_count}/{len(selected_files)} belge başarıyla işlendi"
+                            f"İşlem tamamlandı!\n\n{summary}"
                         )
                     )
 
@@ -2309,24 +4843,243 @@ class EvrakGeneratorGUI:
             messagebox.showerror("Hata", f"İşlem sırasında hata oluştu:\n{str(e)}")
             logging.error(f"Belge seçim hatası: {e}")
     
+    def _create_progress_window(self, title, maximum, cancel_event=None):
+        """Ekran ortasında ilerleme penceresi oluşturur: (pencere, progressbar, durum metni)
+
+        cancel_event verilirse 'İptal' butonu eklenir; basılınca event set edilir.
+        """
+        prog_win = Toplevel(self.root)
+        prog_win.title(title)
+        # Pencereyi ekranın tam ortasına yerleştir
+        prog_win.update_idletasks()
+        width = 400
+        height = 120 if cancel_event is None else 160
+        x = (prog_win.winfo_screenwidth() // 2) - (width // 2)
+        y = (prog_win.winfo_screenheight() // 2) - (height // 2)
+        prog_win.geometry(f"{width}x{height}+{x}+{y}")
+        tk.Label(prog_win, text="Lütfen bekleyin…", font=(DEFAULT_FONT, 10)).pack(pady=(10, 5))
+        pb = ttk.Progressbar(prog_win, orient="horizontal", length=300, mode="determinate")
+        pb.pack(pady=(0, 5))
+        pb["maximum"] = maximum
+        pb["value"] = 0
+        status_var = tk.StringVar(value="")
+        tk.Label(prog_win, textvariable=status_var, font=(DEFAULT_FONT, 9), fg="#555").pack()
+        if cancel_event is not None:
+            def cancel():
+                cancel_event.set()
+                cancel_btn.config(state="disabled")
+                status_var.set("İptal ediliyor… (çalışan belgeler tamamlanıyor)")
+            cancel_btn = tk.Button(prog_win, text="İptal", command=cancel, width=10)
+            cancel_btn.pack(pady=(5, 0))
+            prog_win.protocol("WM_DELETE_WINDOW", cancel)
+        return prog_win, pb, status_var
+
+    def _open_journal(self, folder):
+        """Klasörde yarım kalmış çalışma varsa devam edilip edilmeyeceğini sorar; iş günlüğünü döndürür"""
+        previous = JobJournal.pending_entries(folder)
+        resume = False
+        if previous:
+            resume = messagebox.askyesno(
+                "Yarım Kalan Çalışma",
+                f"Bu klasörde yarım kalmış bir çalışmaya ait {previous} tamamlanmış kayıt bulundu.\n\n"
+                f"Kaldığı yerden devam edilsin mi?\n"
+                f"(Hayır: tüm belgeler yeniden oluşturulur)")
+        return JobJournal(folder, resume=resume)
+
+    @staticmethod
+    def _cancel_message(done, total):
+        return (f"İşlem iptal edildi.\n\n• {done}/{total} tamamlandı\n"
+                f"• Aynı işlemi yeniden başlatıp 'Evet' derseniz kaldığı yerden devam eder")
+
+    def generation_options(self):
+        """Üretim seçeneklerini okur (arayüz iş parçacığında çağrılmalı)"""
+        return GenerationOptions(self.parallel_var.get(), self.only_changed_var.get(),
+                                 self.recipe_backup_var.get(), self.zip_export_var.get(),
+                                 self.profile_var.get(), self.trace_var.get())
+
+    def _run_jobs_with_progress(self, documents, replacements, project_name, target_folder, backup_folder,
+                                prog_win, pb, status_var, journal=None, cancel_event=None, options=None):
+        """Belgeleri (seçime göre paralel) oluşturur; ilerlemeyi tamamlanma sırasıyla gösterir
+
+        Arka plan iş parçacığında çalışır; seçenekler (GenerationOptions) önceden arayüz iş parçacığında
+        okunup verilir.
+        """
+        if options.profile and not profiling_active():
+            # Profil raporları (cProfile + belge başına bellek) proje klasörüne yazılır
+            with RunProfiler(target_folder, memory=True):
+                return self._run_jobs_with_progress(documents, replacements, project_name, target_folder,
+                                                    backup_folder, prog_win, pb, status_var, journal,
+                                                    cancel_event, options)
+        if options.trace and not TRACE.enabled:
+            # Belge/aşama aralıkları süreç ve iş parçacığı başına iz_<zaman>.json dosyasına yazılır
+            with TRACE.recording(target_folder):
+                return self._run_jobs_with_progress(documents, replacements, project_name, target_folder,
+                                                    backup_folder, prog_win, pb, status_var, journal,
+                                                    cancel_event, options)
+        if options.zip_export:
+            return self._export_bundle_with_progress(documents, replacements, project_name, target_folder,
+                                                     backup_folder, prog_win, pb, status_var, cancel_event)
+        # Belgeler yerel hazırlık klasörüne yazılır; yedekler arka planda alınır (tarif modunda alınmaz),
+        # iş parçacıkları kendi yedeğini almasın diye yedek klasörü hazırlık klasörüyle aynı verilir
+        staging = OutputStaging(target_folder, None if options.recipe_backup else backup_folder)
+        jobs = self.generator.build_document_jobs(documents, replacements, project_name,
+                                                  staging.path, staging.path)
+        workers = default_workers(len(jobs)) if options.parallel else 1
+        manifest = DependencyManifest(backup_folder)
+        try:
+            RecipeBackup().write(backup_folder, self.generator, jobs)
+        except Exception as e:
+            logging.error(f"Tarif yedeği yazılamadı: {e}")
+            logging.error(traceback.format_exc())
+
+        def on_result(done, result):
+            mark = "=" if result.skipped else ("✓" if result.ok else "✗")
+            # ProgressBar'ı ana thread'de güncelle
+            prog_win.after(0, lambda v=done, t=f"{mark} {result.filename}": (pb.config(value=v), status_var.set(t)))
+
+        return self.generator.run_document_jobs(jobs, workers, on_result, journal, cancel_event,
+                                                manifest, options.only_changed, staging)
+
+    def _export_bundle_with_progress(self, documents, replacements, project_name, target_folder, backup_folder,
+                                     prog_win, pb, status_var, cancel_event=None):
+        """Belgeleri bellekte üretip hedef klasörde '<proje>.zip' paketine yazar (ayrı belge dosyası oluşmaz)
+
+        Paket yalnızca tüm belgeler işlendiğinde yerine konur; iptal edilirse yarım paket silinir.
+        Yedek olarak tarif yazılır (paketin kendisi tariften yeniden üretilebilir).
+        """
+        jobs = self.generator.build_document_jobs(documents, replacements, project_name,
+                                                  target_folder, backup_folder)
+        try:
+            RecipeBackup().write(backup_folder, self.generator, jobs)
+        except Exception as e:
+            logging.error(f"Tarif yedeği yazılamadı: {e}")
+            logging.error(traceback.format_exc())
+        bundle_path = os.path.join(target_folder, f"{project_name}.zip")
+        bundle = ZipBundle(bundle_path)
+        results = []
+        try:
+            for doc in documents:
+                if cancel_event is not None and cancel_event.is_set():
+                    logging.info("Paket dışa aktarımı kullanıcı tarafından iptal edildi")
+                    break
+                _, ok, elapsed = self.generator.export_dossier(
+                    [doc], replacements, project_name, bundle,
+                    generate_pdf=bool(getattr(self.generator, 'generate_pdf', False)))[0]
+                result = DocumentResult(doc, ok, None if ok else "Belge oluşturulamadı",
+                                        [bundle_path] if ok else [], elapsed, metrics=METRICS.take(doc))
+                results.append(result)
+                mark = "✓" if ok else "✗"
+                prog_win.after(0, lambda v=len(results), t=f"{mark} {doc}": (pb.config(value=v), status_var.set(t)))
+        except BaseException:
+            bundle.abort()
+            raise
+        if cancel_event is not None and cancel_event.is_set():
+            bundle.abort()
+        else:
+            bundle.close()
+        MetricsHistory().append_results("zip", results, sum(r.elapsed for r in results))
+        return results
+
+    @staticmethod
+    def _summarize_results(results):
+        """Belge sonuçlarından kullanıcıya gösterilecek özet metni üretir"""
+        success_count = sum(1 for r in results if r.ok)
+        lines = [f"• {success_count}/{len(results)} belge başarıyla işlendi"]
+        skipped = sum(1 for r in results if r.skipped)
+        if skipped:
+            lines.append(f"• {skipped} belge değişmediği için yeniden oluşturulmadı")
+        failed = [r for r in results if not r.ok]
+        for r in failed[:5]:
+            lines.append(f"• Hata: {r.filename} ({r.error})")
+        if len(failed) > 5:
+            lines.append(f"• … ve {len(failed) - 5} belge daha")
+        return "\n".join(lines)
+
     def open_history(self):
-        """Evrak geçmişi klasörünü açar"""
+        """Evrak geçmişi: yedek klasörlerini listeler, tariften eski belgeleri yeniden üretir"""
         history_path = os.path.join(os.getcwd(), "yedekler")
         os.makedirs(history_path, exist_ok=True)
-        
+        folders = sorted((d for d in os.listdir(history_path)
+                          if not d.startswith(".") and os.path.isdir(os.path.join(history_path, d))),
+                         reverse=True)
+
+        win = Toplevel(self.root)
+        win.title("Evrak Geçmişi")
+        win.geometry("820x480")
+        win.configure(bg="#e0e0e0")
+        tk.Label(win, text="Yedekler (📜: tariften yeniden üretilebilir)", font=(DEFAULT_FONT, 10, "bold"),
+                 bg="#e0e0e0").grid(row=0, column=0, sticky="w", padx=10, pady=(10, 5))
+        tk.Label(win, text="Belgeler", font=(DEFAULT_FONT, 10, "bold"),
+                 bg="#e0e0e0").grid(row=0, column=1, sticky="w", padx=10, pady=(10, 5))
+        folder_list = tk.Listbox(win, width=50, exportselection=False)
+        folder_list.grid(row=1, column=0, sticky="nsew", padx=10)
+        doc_list = tk.Listbox(win, width=50, selectmode="extended", exportselection=False)
+        doc_list.grid(row=1, column=1, sticky="nsew", padx=10)
+        win.grid_rowconfigure(1, weight=1)
+        win.grid_columnconfigure(0, weight=1)
+        win.grid_columnconfigure(1, weight=1)
+        for name in folders:
+            has_recipe = os.path.isfile(os.path.join(history_path, name, RecipeBackup.FILENAME))
+            folder_list.insert("end", f"{'📜' if has_recipe else '   '} {name}")
+        state = {"recipe": None}
+
+        def selected_folder():
+            sel = folder_list.curselection()
+            return os.path.join(history_path, folders[sel[0]]) if sel else None
+
+        def on_select(event=None):
+            doc_list.delete(0, "end")
+            folder = selected_folder()
+            state["recipe"] = RecipeBackup.load(folder) if folder else None
+            for doc in (state["recipe"] or {}).get("belgeler", {}):
+                doc_list.insert("end", doc)
+
+        def regenerate():
+            folder = selected_folder()
+            if not folder or state["recipe"] is None:
+                messagebox.showwarning("Uyarı", "Tarifi olan bir yedek seçin.", parent=win)
+                return
+            docs = [doc_list.get(i) for i in doc_list.curselection()] or list(state["recipe"]["belgeler"])
+            generate_pdf = self.generate_pdf_var.get()
+
+            def task():
+                try:
+                    target, results = self.generator.regenerate_from_recipe(folder, docs, None, generate_pdf)
+                except Exception as e:
+                    logging.error(f"Tariften üretim hatası: {e}")
+                    logging.error(traceback.format_exc())
+                    msg = str(e)
+                    self.root.after(0, lambda: messagebox.showerror("Hata", f"Yeniden üretilemedi:\n{msg}"))
+                    return
+                summary = self._summarize_results(results)
+                self.root.after(0, lambda: messagebox.showinfo(
+                    "Tamamlandı", f"Belgeler yeniden üretildi!\n\n{summary}\n• Klasör: {target}"))
+
+            threading.Thread(target=task, daemon=True).start()
+
+        folder_list.bind("<<ListboxSelect>>", on_select)
+        btns = tk.Frame(win, bg="#e0e0e0")
+        btns.grid(row=2, column=0, columnspan=2, pady=10)
+        tk.Button(btns, text="Seçilenleri Yeniden Oluştur", command=regenerate,
+                  bg="#4caf50", fg="white", font=(DEFAULT_FONT, 10, "bold")).pack(side="left", padx=5)
+        tk.Button(btns, text="Klasörü Aç", command=lambda: self._open_folder(selected_folder() or history_path),
+                  font=(DEFAULT_FONT, 10)).pack(side="left", padx=5)
+
+    def _open_folder(self, path):
+        """Klasörü işletim sisteminin dosya yöneticisinde açar"""
         try:
             if IS_WINDOWS:
                 # Windows
-                os.startfile(history_path)
+                os.startfile(path)
             elif IS_MACOS:
                 # macOS
-                subprocess.run(["open", history_path], check=True)
+                subprocess.run(["open", path], check=True)
             else:
                 # Linux
-                subprocess.run(["xdg-open", history_path], check=True)
+                subprocess.run(["xdg-open", path], check=True)
         except Exception as e:
             logging.error(f"Klasör açma hatası: {e}")
-            messagebox.showinfo("Bilgi", f"Klasör yolu:\n{history_path}")
+            messagebox.showinfo("Bilgi", f"Klasör yolu:\n{path}")
     
     @staticmethod
     def darken_color(color):
@@ -2334,16 +5087,165 @@ class EvrakGeneratorGUI:
         return "#0d1235"
 
 
-# Ana program
-if __name__ == "__main__":
+def parse_args(argv=None):
+    """Komut satırı argümanlarını çözümler (argümansız çalıştırmada GUI açılır)"""
+    parser = argparse.ArgumentParser(description="EVRAK GENERATOR")
+    parser.add_argument("--jobs", metavar="DOSYA.jsonl",
+                        help="JSON-lines iş dosyasını GUI açmadan toplu çalıştırır")
+    parser.add_argument("--results", metavar="DOSYA.jsonl",
+                        help="Sonuç dosyası (varsayılan: <iş dosyası>.sonuc.jsonl)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="İşçi süreç sayısı (varsayılan: çekirdek sayısı - 1)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Yarım kalan çalışmaya devam eder: iş günlüğünde tamamlanmış ve "
+                             "çıktısı doğrulanan işler atlanır")
+    parser.add_argument("--zip", metavar="DOSYA.zip", default=None,
+                        help="İş dosyasındaki belgeleri diske ayrı ayrı yazmadan tek bir .zip paketinde toplar")
+    parser.add_argument("--faaliyet", nargs="+", metavar="SGK",
+                        help="Verilen SGK kodları için toplu faaliyet formu oluşturur")
+    parser.add_argument("--tarih", default="",
+                        help="Faaliyet tarihi (GG.AA.YYYY, boşsa tarih alanı silinir)")
+    parser.add_argument("--cikti", metavar="KLASÖR", default=None,
+                        help="Faaliyet formları çıkış klasörü (varsayılan: masaüstü)")
+    parser.add_argument("--tek-dosya", action="store_true",
+                        help="Faaliyet formlarını tek çalışma kitabında firma başına bir sayfa olarak üretir")
+    parser.add_argument("--pdf", action="store_true",
+                        help="Tek dosya modunda birleşik çalışma kitabını PDF'e de çevirir")
+    parser.add_argument("--tekrar-kontrol", action="store_true",
+                        help="Her belgeyi veri.xlsx ile iki kez üretip çıktıların bayt bayt aynı olduğunu doğrular")
+    parser.add_argument("--yedek-tekillestir", action="store_true",
+                        help="yedekler/ altındaki mevcut tarihli klasörleri içerik adresli depoya taşır")
+    parser.add_argument("--yedek-onar", metavar="KLASÖR",
+                        help="Tarihli yedek klasöründeki eksik dosyaları manifestten yeniden oluşturur")
+    parser.add_argument("--yeniden-uret", metavar="KLASÖR",
+                        help="Yedek klasöründeki tariften belgeleri yeniden üretir (--cikti, --pdf ile)")
+    parser.add_argument("--metrik-ozet", nargs="?", type=int, const=0, default=None, metavar="N",
+                        help="Metrik geçmişinden (son N çalışma) belge ve aşama başına p50/p95 sürelerini yazdırır")
+    parser.add_argument("--profile", action="store_true",
+                        help="Komutu cProfile ile çalıştırır; .pstats ve metin raporunu çıktı klasörüne yazar "
+                             "(GUI'de 'Profil' seçeneğini işaretler)")
+    parser.add_argument("--profile-bellek", action="store_true",
+                        help="--profile ile birlikte belge başına tracemalloc bellek raporu da üretir")
+    parser.add_argument("--trace", action="store_true",
+                        help="Belge/aşama/görev aralıklarını Chrome Trace JSON (iz_<zaman>.json) olarak "
+                             "çıktı klasörüne yazar")
+    parser.add_argument("--log-seviye", metavar="SEVİYE", default=None,
+                        help='Log seviyeleri, ör. "DEBUG" veya "INFO,evrak.hucre=DEBUG,evrak.filtre=DEBUG"')
+    return parser.parse_args(argv)
+
+
+def report_output_folder(args):
+    """--profile/--trace raporlarının klasörü: iş dosyasında sonuç dosyasının yanı, aksi halde --cikti"""
+    if args.jobs:
+        return os.path.dirname(os.path.abspath(args.results or JobFileRunner.default_results_path(args.jobs)))
+    return args.cikti or os.getcwd()
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.log_seviye:
+        apply_log_levels(args.log_seviye)
+
     # Gerekli klasörleri kontrol et
     required_folders = ["Evraklar", "yedekler"]
     for folder in required_folders:
         if not os.path.exists(folder):
             os.makedirs(folder)
             logging.info(f"{folder} klasörü oluşturuldu")
-    
+
+    has_command = any((args.jobs, args.faaliyet, args.yedek_tekillestir, args.yedek_onar, args.yeniden_uret,
+                       args.metrik_ozet is not None, args.tekrar_kontrol))
+    if has_command:
+        profiler = RunProfiler(report_output_folder(args), memory=args.profile_bellek) if args.profile else None
+        with ExitStack() as stack:
+            if profiler is not None:
+                stack.enter_context(profiler)
+            if args.trace:
+                stack.enter_context(TRACE.recording(report_output_folder(args)))
+            code = run_command(args)
+        reports = (profiler.paths if profiler is not None else []) + ([TRACE.path] if args.trace and TRACE.path else [])
+        if reports:
+            print(f"Raporlar: {', '.join(reports)}")
+        return code
+
     # Uygulamayı başlat
     root = tk.Tk()
     app = EvrakGeneratorGUI(root)
+    app.profile_var.set(args.profile)
+    app.trace_var.set(args.trace)
+    # Pencere açıldıktan sonra ağır kütüphaneler arka planda yüklenir
+    root.after_idle(preload_heavy_modules)
+    startup_probe = os.environ.get(STARTUP_PROBE_ENV)
+    if startup_probe:
+        root.after(0, lambda: app.report_startup(startup_probe))
     root.mainloop()
+    return 0
+
+
+def run_command(args):
+    """GUI açmadan verilen komut satırı işlemini yürütür, çıkış kodunu döndürür"""
+    if args.jobs:
+        summary = JobFileRunner(workers=args.workers).run(args.jobs, args.results, resume=args.resume,
+                                                          bundle_path=args.zip)
+        print(json.dumps(summary, ensure_ascii=False))
+        return 0 if summary["hata"] == 0 and summary["gecersiz"] == 0 else 1
+
+    if args.faaliyet:
+        if args.tarih:
+            try:
+                datetime.datetime.strptime(args.tarih, "%d.%m.%Y")
+            except ValueError:
+                print(f"Geçersiz tarih formatı: {args.tarih} (GG.AA.YYYY olmalı)", file=sys.stderr)
+                return 2
+        engine = FaaliyetBatchEngine(workers=args.workers)
+        if args.tek_dosya:
+            _, results = engine.run_consolidated(args.faaliyet, args.tarih, args.cikti, args.pdf)
+        else:
+            output_folder = args.cikti or FaaliyetBatchEngine.default_output_folder(args.tarih)
+            os.makedirs(output_folder, exist_ok=True)
+            journal = JobJournal(output_folder, resume=args.resume)
+            results = engine.run(args.faaliyet, args.tarih, output_folder, journal=journal)
+        for r in results:
+            print(json.dumps(r._asdict(), ensure_ascii=False))
+        return 0 if all(r.ok for r in results) else 1
+
+    if args.yedek_tekillestir:
+        files, saved = BACKUP_STORE.deduplicate_all()
+        print(f"{files} dosya depoya taşındı, {saved / 1e6:.1f} MB kazanıldı")
+        return 0
+
+    if args.yedek_onar:
+        restored, missing = BACKUP_STORE.rebuild_view(args.yedek_onar)
+        print(f"{restored} dosya yeniden oluşturuldu, {missing} nesne eksik")
+        return 0 if missing == 0 else 1
+
+    if args.yeniden_uret:
+        target, results = EvrakGenerator().regenerate_from_recipe(args.yeniden_uret, None, args.cikti, args.pdf)
+        for r in results:
+            print(json.dumps(r._asdict(), ensure_ascii=False))
+        return 0 if all(r.ok for r in results) else 1
+
+    if args.metrik_ozet is not None:
+        history = MetricsHistory()
+        rows = history.summary(args.metrik_ozet or None)
+        if not rows:
+            print(f"Metrik geçmişi boş: {history.path}")
+            return 0
+        width = max(len(name) for name, *_ in rows)
+        print(f"{'Belge':<{width}}  {'Aşama':<18} {'n':>5} {'p50 (sn)':>10} {'p95 (sn)':>10} {'ort. bayt':>12}")
+        for name, stage, count, p50, p95, nbytes in rows:
+            print(f"{name:<{width}}  {stage:<18} {count:>5} {p50:>10.4f} {p95:>10.4f} {nbytes:>12}")
+        return 0
+
+    if args.tekrar_kontrol:
+        checks = EvrakGenerator().verify_reproducible()
+        for doc, same, detail in checks:
+            print(f"{'AYNI  ' if same else 'FARKLI'}  {doc}  ({detail})")
+        return 0 if all(same for _, same, _ in checks) else 1
+    return 0
+
+
+# Ana program
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
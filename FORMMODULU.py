@@ -12,20 +12,26 @@ import pandas as pd
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import datetime
-from dateutil.relativedelta import relativedelta
 import logging
 import json
 import shutil
+import threading
 from openpyxl import load_workbook
 from openpyxl.styles import PatternFill, Font
 
+from derived_fields import DERIVED_FIELDS
+from company_search import CompanySearchIndex
+
 
 # Belge ve GUI için platformlar arası Türkçe karakter destekli font seçimi
+# (ana uygulama içinde açıldığında mevcut Tk kökü kullanılır, yeni kök oluşturulmaz)
 import tkinter.font as tkfont_det
-_font_root = tk.Tk()
-_font_root.withdraw()
+_font_root = None if tk._default_root is not None else tk.Tk()
+if _font_root is not None:
+    _font_root.withdraw()
 _available_fonts = set(tkfont_det.families())
-_font_root.destroy()
+if _font_root is not None:
+    _font_root.destroy()
 for _font in ("Arial", "Liberation Sans", "DejaVu Sans", "TkDefaultFont"):
     if _font in _available_fonts:
         DEFAULT_FONT = _font
@@ -39,6 +45,10 @@ IS_WINDOWS = SYSTEM == "Windows"
 IS_MACOS = SYSTEM == "Darwin"
 IS_LINUX = SYSTEM == "Linux"
 
+# SGK alanında anlık arama: son tuştan sonra bekleme (ms) ve gösterilecek öneri sayısı
+SGK_SEARCH_DELAY_MS = 120
+SGK_SEARCH_LIMIT = 20
+
 # Loglama ayarları
 logging.basicConfig(
     level=logging.INFO,
@@ -50,8 +60,11 @@ logging.basicConfig(
 )
 
 class SadeFormApp:
-    def __init__(self, root):
+    def __init__(self, root, host=None):
+        """host: ana uygulama içinde açıldığında firma dizinini ve veri tablolarını paylaşan nesne
+        (find_row, search_index, nace_description, config_table, saved); yoksa tablolar dosyadan okunur"""
         self.root = root
+        self.host = host
         self.root.title("Form Bilgilerini Doldur")
         self.root.geometry("900x700")  # Pencere boyutu büyütüldü
         self.root.configure(bg="#f8f9fa")
@@ -62,11 +75,6 @@ class SadeFormApp:
         
         # Sabitler
         self.TEHLIKE_SINIFLARI = ["AZ TEHLİKELİ", "TEHLİKELİ", "ÇOK TEHLİKELİ"]
-        self.TEHLIKE_YIL_MAP = {
-            "AZ TEHLİKELİ": 6,
-            "TEHLİKELİ": 4,
-            "ÇOK TEHLİKELİ": 2
-        }
         
         # RD Yöntemi seçimi
         self.rd_method = tk.StringVar(value="Matris")
@@ -74,12 +82,21 @@ class SadeFormApp:
         # Excel yolları - platform bağımsız
         self.ankara_tablosu_path = tk.StringVar(value=os.path.abspath("ANKARA İŞYERİ TABLOSU.xlsx"))
         self.nace_tablosu_path = tk.StringVar(value=os.path.abspath("Nace Kod Listesi.xlsx"))
+        self.default_tables = (self.ankara_tablosu_path.get(), self.nace_tablosu_path.get())
         
         # DataFrame'i yükle
         self.df = self.load_dataframe()
+        self.build_key_index()
+        
+        # SGK arama indeksi (arka planda kurulur) ve bekleyen sorgu
+        self.sgk_index = None
+        self._sgk_index_error = None
+        self._sgk_index_token = None
+        self._sgk_search_job = None
         
         # UI bileşenlerini oluştur
         self.create_ui()
+        self.start_sgk_index()
         
         # Pencereyi kapatırken SGK geçmişini kaydet
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
@@ -87,7 +104,12 @@ class SadeFormApp:
     def load_dataframe(self):
         """DataFrame'i güvenli bir şekilde yükler"""
         try:
-            df = pd.read_excel("veri_yapilandirma_GUNCEL.xlsx", dtype=str, engine='openpyxl')
+            if self.host is not None:
+                # Ana uygulamanın önbelleğindeki tablo; boş hücreler read_excel'deki gibi NaN olur
+                columns, rows = self.host.config_table()
+                df = pd.DataFrame(rows, columns=columns).replace("", float("nan")).astype(object)
+            else:
+                df = pd.read_excel("veri_yapilandirma_GUNCEL.xlsx", dtype=str, engine='openpyxl')
             logging.info("veri_yapilandirma_GUNCEL.xlsx başarıyla yüklendi")
             return df
         except FileNotFoundError:
@@ -99,6 +121,14 @@ class SadeFormApp:
             logging.error(f"DataFrame yükleme hatası: {e}")
             return pd.DataFrame(columns=["Anahtar", "Etiket", "Durum", "Karşılık"])
     
+    def build_key_index(self):
+        """Anahtar → satır konumları indeksi; değer okuma/yazma her anahtar için maske kurmaz
+        (tabloda tekrar eden anahtarların tüm satırları birlikte güncellenir)"""
+        self.key_rows = {}
+        for position, key in enumerate(self.df["Anahtar"]):
+            self.key_rows.setdefault(key, []).append(position)
+        self.value_col = self.df.columns.get_loc("Karşılık")
+    
     def load_sgk_history(self):
         """SGK geçmişini yükler"""
         try:
@@ -128,6 +158,8 @@ class SadeFormApp:
     
     def on_closing(self):
         """Pencere kapatılırken çağırılır"""
+        if self._sgk_search_job is not None:
+            self.root.after_cancel(self._sgk_search_job)
         self.save_sgk_history()
         self.root.destroy()
     
@@ -149,6 +181,9 @@ class SadeFormApp:
         # Scrollable form alanı
         self.create_form_area()
         
+        # SGK önerileri (diğer bileşenlerin üstünde görünmesi için en son oluşturulur)
+        self.create_sgk_suggestions()
+        
     def create_top_panel(self):
         """Üst panel (SGK girişi ve butonlar)"""
         top = tk.Frame(self.root, bg="#f8f9fa")
@@ -173,6 +208,15 @@ class SadeFormApp:
         self.sgk_combo['values'] = self.sgk_history
         self.sgk_combo.pack(pady=(2, 0))
         
+        # Kod veya şirket/proje adıyla anlık arama
+        self.sgk_combo.bind("<KeyRelease>", self.on_sgk_key)
+        self.sgk_combo.bind("<Down>", lambda e: self.move_sgk_suggestion(1))
+        self.sgk_combo.bind("<Up>", lambda e: self.move_sgk_suggestion(-1))
+        self.sgk_combo.bind("<Return>", self.on_sgk_return)
+        self.sgk_combo.bind("<Escape>", lambda e: self.hide_sgk_suggestions())
+        self.sgk_combo.bind("<FocusOut>", lambda e: self.root.after(200, self.hide_sgk_suggestions_if_unfocused))
+        self.sgk_combo.bind("<<ComboboxSelected>>", lambda e: self.hide_sgk_suggestions())
+        
         # Butonlar
         buttons = [
             ("SEÇ", self.on_select_sgk, "#1a237e"),
@@ -332,6 +376,7 @@ class SadeFormApp:
         if filename:
             self.ankara_tablosu_path.set(filename)
             logging.info(f"Ankara tablosu seçildi: {filename}")
+            self.start_sgk_index()
     
     def select_nace(self):
         """NACE kodları dosyasını seçer"""
@@ -344,8 +389,141 @@ class SadeFormApp:
             self.nace_tablosu_path.set(filename)
             logging.info(f"NACE tablosu seçildi: {filename}")
     
+    def create_sgk_suggestions(self):
+        """SGK alanının altında açılan öneri listesi (odak SGK alanında kalır)"""
+        self.sgk_suggestions = tk.Listbox(self.root, height=8, width=70, takefocus=0,
+                                          font=(DEFAULT_FONT, 10), activestyle="none",
+                                          bg="white", fg="#2c3e50", relief="solid", bd=1,
+                                          selectbackground="#1a237e", selectforeground="white")
+        self.sgk_suggestions.bind("<ButtonRelease-1>", self.on_sgk_suggestion_click)
+    
+    def start_sgk_index(self):
+        """Arama indeksini arka planda kurar: ana uygulamada firma dizininden, tek başına seçili tablodan"""
+        self.sgk_index = None
+        self._sgk_index_error = None
+        if self.uses_host_tables():
+            source = self.host.search_index
+        else:
+            path = self.ankara_tablosu_path.get()
+            source = lambda: self.build_sgk_index(path)
+        token = object()
+        self._sgk_index_token = token
+        
+        def build():
+            try:
+                index = source()
+            except Exception as e:
+                logging.error(f"SGK arama indeksi kurulamadı: {e}")
+                if self._sgk_index_token is token:
+                    self._sgk_index_error = str(e) or type(e).__name__
+                return
+            # Bu arada başka bir tablo seçildiyse eski indeks kullanılmaz
+            if self._sgk_index_token is token:
+                self.sgk_index = index
+        
+        threading.Thread(target=build, daemon=True).start()
+    
+    @staticmethod
+    def build_sgk_index(path):
+        """Ankara tablosundan arama indeksi kurar (iş parçacığında çalışır, mesaj kutusu açmaz)"""
+        df = pd.read_excel(path, dtype=str, engine='openpyxl')
+        sgk_col = df.columns.get_loc("KISA SGK") if "KISA SGK" in df.columns else 15
+        index = CompanySearchIndex.from_rows(df.fillna("").values.tolist(), sgk_col=sgk_col,
+                                             sirket_col=4, isyeri_col=5, proje_col=6)
+        logging.info(f"SGK arama indeksi kuruldu: {len(index)} firma")
+        return index
+    
+    def on_sgk_key(self, event):
+        """Her tuşta sorguyu erteler; yazma sürerken arama yapılmaz"""
+        if event.keysym in ("Up", "Down", "Return", "KP_Enter", "Escape", "Tab"):
+            return
+        if self._sgk_search_job is not None:
+            self.root.after_cancel(self._sgk_search_job)
+        self._sgk_search_job = self.root.after(SGK_SEARCH_DELAY_MS, self.run_sgk_search)
+    
+    def run_sgk_search(self):
+        """SGK alanındaki metinle indeksi sorgular ve önerileri gösterir"""
+        self._sgk_search_job = None
+        query = self.kisa_sgk_var.get().strip()
+        if not query:
+            self.hide_sgk_suggestions()
+            return
+        if self._sgk_index_error is not None:
+            # Kurulum başarısız: tekrar denenmez, SEÇ ile doğrudan kod girişi çalışmaya devam eder
+            self.show_sgk_suggestions([f"Firma araması kullanılamıyor: {self._sgk_index_error}"])
+            return
+        if self.sgk_index is None:
+            # İndeks henüz kurulmadı; hazır olunca aynı sorgu tekrar denenir
+            self._sgk_search_job = self.root.after(SGK_SEARCH_DELAY_MS, self.run_sgk_search)
+            return
+        results = self.sgk_index.search(query, SGK_SEARCH_LIMIT)
+        if not results or (len(results) == 1 and results[0][0] == query):
+            self.hide_sgk_suggestions()
+            return
+        self.show_sgk_suggestions([label for _, label in results])
+    
+    def show_sgk_suggestions(self, labels):
+        self.sgk_suggestions.delete(0, "end")
+        for label in labels:
+            self.sgk_suggestions.insert("end", label)
+        self.sgk_suggestions.configure(height=min(len(labels), 10))
+        self.sgk_suggestions.place(in_=self.sgk_combo, x=0, rely=1.0, y=2, anchor="nw")
+        self.sgk_suggestions.lift()
+    
+    def sgk_suggestions_visible(self):
+        return bool(self.sgk_suggestions.winfo_ismapped())
+    
+    def hide_sgk_suggestions(self):
+        self.sgk_suggestions.place_forget()
+    
+    def hide_sgk_suggestions_if_unfocused(self):
+        if not self.sgk_suggestions.winfo_exists():
+            return  # Pencere bu arada kapandı
+        try:
+            focused = self.root.focus_get()
+        except KeyError:
+            focused = None  # Combobox açılır listesi gibi Tk iç pencereleri
+        if focused not in (self.sgk_combo, self.sgk_suggestions):
+            self.hide_sgk_suggestions()
+    
+    def move_sgk_suggestion(self, step):
+        """Ok tuşlarıyla öneriler arasında gezinir; öneri yoksa geçmiş listesi açılır"""
+        if not self.sgk_suggestions_visible():
+            return None
+        size = self.sgk_suggestions.size()
+        current = self.sgk_suggestions.curselection()
+        position = (current[0] + step) % size if current else (0 if step > 0 else size - 1)
+        self.sgk_suggestions.selection_clear(0, "end")
+        self.sgk_suggestions.selection_set(position)
+        self.sgk_suggestions.see(position)
+        return "break"
+    
+    def on_sgk_return(self, event):
+        """Enter: seçili (yoksa ilk) öneriyi alır ya da yazılan kodu seçer"""
+        if self.sgk_suggestions_visible() and self.sgk_index is not None:
+            current = self.sgk_suggestions.curselection()
+            self.accept_sgk_suggestion(current[0] if current else 0)
+        else:
+            self.on_select_sgk()
+        return "break"
+    
+    def on_sgk_suggestion_click(self, event):
+        self.accept_sgk_suggestion(self.sgk_suggestions.nearest(event.y))
+    
+    def accept_sgk_suggestion(self, position):
+        """Öneriden SGK kodunu alır ve firmayı yükler"""
+        kod = CompanySearchIndex.code_from_label(self.sgk_suggestions.get(position))
+        self.hide_sgk_suggestions()
+        if self.sgk_index is None:
+            return  # Listede öneri değil hata mesajı vardı
+        if kod:
+            self.kisa_sgk_var.set(kod)
+            self.sgk_combo.icursor("end")
+            self.on_select_sgk()
+    
     def on_select_sgk(self):
         """SGK koduna göre verileri doldurur"""
+        self.hide_sgk_suggestions()
         kod = self.kisa_sgk_var.get().strip()
         
         # Validasyon
@@ -357,15 +535,19 @@ class SadeFormApp:
         # ComboBox'u güncelle
         self.sgk_combo['values'] = self.sgk_history
         
-        # Ankara tablosunu yükle
-        df_ankara = self.load_ankara_table()
-        if df_ankara is None:
-            return
-        
-        # SGK koduna göre satırı bul
-        satir = self.find_sgk_row(df_ankara, kod)
-        if satir is None:
-            return
+        # SGK koduna göre satırı bul (ana uygulamanın firma dizininden veya Ankara tablosundan)
+        if self.uses_host_tables():
+            satir = self.host.find_row(kod)
+            if satir is None:
+                messagebox.showerror("Hata", f"KISA SGK bulunamadı: {kod}")
+                return
+        else:
+            df_ankara = self.load_ankara_table()
+            if df_ankara is None:
+                return
+            satir = self.find_sgk_row(df_ankara, kod)
+            if satir is None:
+                return
         
         # Verileri doldur
         self.fill_form_data(satir)
@@ -379,6 +561,11 @@ class SadeFormApp:
         messagebox.showinfo("Başarılı", "Veriler başarıyla yüklendi!")
         logging.info(f"SGK {kod} için veriler yüklendi")
     
+    def uses_host_tables(self):
+        """Ana uygulamanın tabloları yalnızca kullanıcı başka bir tablo seçmediyse kullanılır"""
+        return (self.host is not None and
+                (self.ankara_tablosu_path.get(), self.nace_tablosu_path.get()) == self.default_tables)
+    
     def validate_sgk_code(self, kod):
         """SGK kodunu doğrular"""
         if len(kod) != 7 or not kod.isdigit():
@@ -398,7 +585,7 @@ class SadeFormApp:
             return None
     
     def find_sgk_row(self, df_ankara, kod):
-        """SGK koduna göre satırı bulur"""
+        """SGK koduna göre satırı bulur (boş hücreler "" olan metin tuple'ı)"""
         # SGK sütununu bul
         sgk_col = "KISA SGK" if "KISA SGK" in df_ankara.columns else df_ankara.columns[15]
         df_ankara[sgk_col] = df_ankara[sgk_col].astype(str).str.strip()
@@ -409,65 +596,62 @@ class SadeFormApp:
             messagebox.showerror("Hata", f"KISA SGK bulunamadı: {kod}")
             return None
         
-        return satirlar.iloc[0]
+        return tuple("" if pd.isna(v) else str(v) for v in satirlar.iloc[0])
     
     def fill_form_data(self, satir):
         """Form verilerini doldurur"""
         # Veri eşlemeleri
         field_mappings = {
-            "[DEĞİŞTİR:ŞİRKET UNVANI]": satir.iloc[4],
-            "[DEĞİŞTİR:PROJEADI]": satir.iloc[6],
-            "[DEĞİŞTİR:ADRES]": satir.iloc[31],
-            "[DEĞİŞTİR:SGKSİCİL]": satir.iloc[10],
-            "[DEĞİŞTİR:SGKSİCİL20PUNTO]": satir.iloc[10],
-            "[DEĞİŞTİR:NACE]": satir.iloc[9],
-            "[DEĞİŞTİR:TEHLİKESINIFI]": satir.iloc[16],
-            "[DEĞİŞTİR:ÇALIŞANSAYISI]": satir.iloc[19],
-            "[DEĞİŞTİR:ŞİRKET UNVANI20PUNTO]": satir.iloc[4],
-            "[DEĞİŞTİR:PROJEADI20PUNTO]": satir.iloc[6],
+            "[DEĞİŞTİR:ŞİRKET UNVANI]": satir[4],
+            "[DEĞİŞTİR:PROJEADI]": satir[6],
+            "[DEĞİŞTİR:ADRES]": satir[31],
+            "[DEĞİŞTİR:SGKSİCİL]": satir[10],
+            "[DEĞİŞTİR:SGKSİCİL20PUNTO]": satir[10],
+            "[DEĞİŞTİR:NACE]": satir[9],
+            "[DEĞİŞTİR:TEHLİKESINIFI]": satir[16],
+            "[DEĞİŞTİR:ÇALIŞANSAYISI]": satir[19],
+            "[DEĞİŞTİR:ŞİRKET UNVANI20PUNTO]": satir[4],
+            "[DEĞİŞTİR:PROJEADI20PUNTO]": satir[6],
             # Yeni placeholder'lar
-            "[DEĞİŞTİR:İL]": satir.iloc[3],           # D sütunu (3. index)
-            "[DEĞİŞTİR:UZMANADI]": satir.iloc[21],    # V sütunu (21. index)
-            "[DEĞİŞTİR:HEKİMADI]": satir.iloc[25]     # Z sütunu (25. index)
+            "[DEĞİŞTİR:İL]": satir[3],           # D sütunu (3. index)
+            "[DEĞİŞTİR:UZMANADI]": satir[21],    # V sütunu (21. index)
+            "[DEĞİŞTİR:HEKİMADI]": satir[25]     # Z sütunu (25. index)
         }
         
-        # Verileri form alanlarına ve DataFrame'e yaz
-        for key, value in field_mappings.items():
-            str_value = "" if pd.isna(value) else str(value)
-            
-            # Form alanını güncelle
+        # Form alanlarını güncelle
+        for key, str_value in field_mappings.items():
             widget = self.entries.get(key)
             if widget:
                 self.update_widget_value(widget, str_value)
-            
-            # DataFrame'i güncelle
-            self.df.loc[self.df["Anahtar"] == key, "Karşılık"] = str_value
         
-        # Şirket-Proje kombinasyonunu oluştur
+        # Şirket-Proje kombinasyonunu oluştur ve DataFrame'i tek seferde güncelle
         sirket = field_mappings["[DEĞİŞTİR:ŞİRKET UNVANI]"]
         proje = field_mappings["[DEĞİŞTİR:PROJEADI]"]
-        kombine = f"{sirket} - {proje}"
-        self.df.loc[self.df["Anahtar"] == "[DEĞİŞTİR:ŞİRKETPROJE]", "Karşılık"] = kombine
+        field_mappings["[DEĞİŞTİR:ŞİRKETPROJE]"] = f"{sirket} - {proje}"
+        self.update_values(field_mappings)
     
     def fill_nace_description(self, satir):
         """NACE açıklamasını doldurur"""
-        nace_kod = str(satir.iloc[9]) if not pd.isna(satir.iloc[9]) else ""
+        nace_kod = satir[9].strip()
         
         if not nace_kod:
             return
         
         try:
-            # NACE tablosunu yükle
-            df_nace = pd.read_excel(self.nace_tablosu_path.get(), dtype=str, engine='openpyxl')
-            col_kod, col_aciklama = df_nace.columns[0], df_nace.columns[1]
-            df_nace[col_kod] = df_nace[col_kod].astype(str).str.strip()
-            
-            # NACE açıklamasını bul
-            found = df_nace[df_nace[col_kod] == nace_kod]
-            aciklama = "" if found.empty else str(found.iloc[0][col_aciklama])
+            if self.uses_host_tables():
+                aciklama = self.host.nace_description(nace_kod)
+            else:
+                # NACE tablosunu yükle
+                df_nace = pd.read_excel(self.nace_tablosu_path.get(), dtype=str, engine='openpyxl')
+                col_kod, col_aciklama = df_nace.columns[0], df_nace.columns[1]
+                df_nace[col_kod] = df_nace[col_kod].astype(str).str.strip()
+                
+                # NACE açıklamasını bul
+                found = df_nace[df_nace[col_kod] == nace_kod]
+                aciklama = "" if found.empty else str(found.iloc[0][col_aciklama])
             
             # DataFrame'i güncelle
-            self.df.loc[self.df["Anahtar"] == "[DEĞİŞTİR:NACEFAALİYET]", "Karşılık"] = aciklama
+            self.update_value("[DEĞİŞTİR:NACEFAALİYET]", aciklama)
             
             # Form alanını güncelle
             widget = self.entries.get("[DEĞİŞTİR:NACEFAALİYET]")
@@ -478,7 +662,7 @@ class SadeFormApp:
             # NACE ve Faaliyet kombinasyonunu oluştur
             if aciklama:
                 kombine = f"{nace_kod} - {aciklama}"
-                self.df.loc[self.df["Anahtar"] == "[DEĞİŞTİR:NACEVEFAALİYET]", "Karşılık"] = kombine
+                self.update_value("[DEĞİŞTİR:NACEVEFAALİYET]", kombine)
             
             logging.info(f"NACE açıklaması bulundu: {nace_kod}")
             
@@ -487,19 +671,21 @@ class SadeFormApp:
     
     def check_grup_disi(self, satir):
         """Grup dışı firma kontrolü yapar"""
-        sirket_unvani = str(satir.iloc[4]) if not pd.isna(satir.iloc[4]) else ""
-        proje_adi = str(satir.iloc[6]) if not pd.isna(satir.iloc[6]) else ""
+        sirket_unvani = satir[4]
+        proje_adi = satir[6]
         
         if "GRUP DIŞI" in sirket_unvani.upper():
             logging.info(f"GRUP DIŞI firma tespit edildi: {sirket_unvani}")
             
-            # Şirket unvanını proje adı ile değiştir
-            self.df.loc[self.df["Anahtar"] == "[DEĞİŞTİR:ŞİRKET UNVANI]", "Karşılık"] = proje_adi
-            self.df.loc[self.df["Anahtar"] == "[DEĞİŞTİR:ŞİRKET UNVANI20PUNTO]", "Karşılık"] = proje_adi
-            
-            # Proje adı alanlarını boşalt
-            self.df.loc[self.df["Anahtar"] == "[DEĞİŞTİR:PROJEADI]", "Karşılık"] = ""
-            self.df.loc[self.df["Anahtar"] == "[DEĞİŞTİR:PROJEADI20PUNTO]", "Karşılık"] = ""
+            # Şirket unvanını proje adı ile değiştir, proje adı alanlarını boşalt;
+            # kombine alan proje adı olur
+            self.update_values({
+                "[DEĞİŞTİR:ŞİRKET UNVANI]": proje_adi,
+                "[DEĞİŞTİR:ŞİRKET UNVANI20PUNTO]": proje_adi,
+                "[DEĞİŞTİR:PROJEADI]": "",
+                "[DEĞİŞTİR:PROJEADI20PUNTO]": "",
+                "[DEĞİŞTİR:ŞİRKETPROJE]": proje_adi,
+            })
             
             # Form alanlarını güncelle
             w_sirket = self.entries.get("[DEĞİŞTİR:ŞİRKET UNVANI]")
@@ -509,9 +695,6 @@ class SadeFormApp:
             w_proje = self.entries.get("[DEĞİŞTİR:PROJEADI]")
             if w_proje:
                 self.update_widget_value(w_proje, "")
-            
-            # Kombine alanı güncelle
-            self.df.loc[self.df["Anahtar"] == "[DEĞİŞTİR:ŞİRKETPROJE]", "Karşılık"] = proje_adi
     
     def update_widget_value(self, widget, value):
         """Widget değerini günceller"""
@@ -546,8 +729,8 @@ class SadeFormApp:
             messagebox.showerror("Hata", "Dosyalar kaydedilemedi!")
     
     def update_dataframe_from_form(self):
-        """Form verilerini DataFrame'e aktarır"""
-        updated_count = 0
+        """Form verilerini DataFrame'e aktarır (tüm alanlar tek seferde yazılır)"""
+        values = {}
         
         for key, widget in self.entries.items():
             try:
@@ -559,33 +742,20 @@ class SadeFormApp:
                     if value is None:
                         value = ""
                     value = str(value).strip()
-                
-                # DataFrame'i güncelle
-                mask = (self.df["Anahtar"] == key)
-                if mask.any():
-                    self.df.loc[mask, "Karşılık"] = value
-                    updated_count += 1
+                values[key] = value
                     
             except Exception as e:
                 logging.error(f"Widget okuma hatası {key}: {e}")
         
+        updated_count = self.update_values(values)
         logging.info(f"Toplam {updated_count} alan güncellendi")
     
     def perform_auto_calculations(self):
         """Otomatik hesaplamaları yapar"""
         logging.info("=== OTOMATİK HESAPLAMALAR ===")
         
-        # Tehlike sınıfını al
-        tehlike_sinifi = self.get_tehlike_sinifi()
-        
-        # Tarih hesaplamaları
-        self.calculate_dates(tehlike_sinifi)
-        
-        # Saat hesaplamaları
-        self.calculate_hours(tehlike_sinifi)
-        
-        # Periyot hesaplamaları
-        self.calculate_periods(tehlike_sinifi)
+        # Geçerlilik tarihleri, saatler ve periyotlar (tehlike sınıfına göre)
+        self.calculate_derived_fields()
         
         # Kombine alanları hesapla
         self.calculate_combined_fields()
@@ -593,63 +763,20 @@ class SadeFormApp:
         # Normal belge oluşturma için faaliyet tarihi placeholder'ını temizle
         self.clear_faaliyet_tarihi_for_normal_operations()
     
-    def get_tehlike_sinifi(self):
-        """Tehlike sınıfını alır"""
-        mask = (self.df["Anahtar"] == "[DEĞİŞTİR:TEHLİKESINIFI]")
-        if mask.any():
-            return str(self.df.loc[mask, "Karşılık"].iloc[0]).strip()
-        return ""
-    
-    def calculate_dates(self, tehlike_sinifi):
-        """Geçerlilik tarihlerini hesaplar"""
-        ek_yil = self.TEHLIKE_YIL_MAP.get(tehlike_sinifi, 0)
-        date_format = "%d.%m.%Y"
-        
-        date_pairs = [
-            ("[DEĞİŞTİR:RDEKİPATAMAEĞİTİMHAZIRLANMA]", "[DEĞİŞTİR:RDGEÇERLİLİK]"),
-            ("[DEĞİŞTİR:ADEPEK3ATAMAEĞİTİM]", "[DEĞİŞTİR:ADEPGEÇERLİLİK]")
-        ]
-        
-        for input_key, output_key in date_pairs:
-            try:
-                mask = (self.df["Anahtar"] == input_key)
-                if mask.any():
-                    start_date = str(self.df.loc[mask, "Karşılık"].iloc[0]).strip()
-                    
-                    if start_date and start_date != "nan":
-                        dt = datetime.datetime.strptime(start_date, date_format)
-                        end_date = (dt + relativedelta(years=ek_yil)).strftime(date_format)
-                        
-                        out_mask = (self.df["Anahtar"] == output_key)
-                        if out_mask.any():
-                            self.df.loc[out_mask, "Karşılık"] = end_date
-                            logging.info(f"{output_key}: {end_date}")
-                            
-            except Exception as e:
-                logging.error(f"Tarih hesaplama hatası {input_key}: {e}")
-    
-    def calculate_hours(self, tehlike_sinifi):
-        """Yıllık saat hesaplamalarını yapar"""
-        # İGU Saat
-        igu_saat = "4 SAAT" if tehlike_sinifi == "AZ TEHLİKELİ" else "8 SAAT"
-        self.update_value("[DEĞİŞTİR:YILLIK:İGU:SAAT]", igu_saat)
-        
-        # İH Saat
-        ih_saat = "4 SAAT" if tehlike_sinifi in ("AZ TEHLİKELİ", "TEHLİKELİ") else "8 SAAT"
-        self.update_value("[DEĞİŞTİR:YILLIK:İH:SAAT]", ih_saat)
-    
-    def calculate_periods(self, tehlike_sinifi):
-        """Periyot hesaplamalarını yapar"""
-        periods = {
-            "AZ TEHLİKELİ": ("6 Yılda 1", "5 Yılda 1"),
-            "TEHLİKELİ": ("4 Yılda 1", "3 Yılda 1"),
-            "ÇOK TEHLİKELİ": ("2 Yılda 1", "Yılda 1")
-        }
-        
-        rd_periyot, muayene_periyot = periods.get(tehlike_sinifi, ("", ""))
-        
-        self.update_value("[DEĞİŞTİR:YDR:RDPERİYOT]", rd_periyot)
-        self.update_value("[DEĞİŞTİR:YDR:MUAYENEPERİYOT]", muayene_periyot)
+    def calculate_derived_fields(self):
+        """Tehlike sınıfından türetilen alanları ortak kural tablosuyla hesaplar"""
+        context = {}
+        for key in DERIVED_FIELDS.inputs:
+            value = self.get_value(key)
+            context[key] = "" if value == "nan" else value
+        try:
+            derived = DERIVED_FIELDS.derive(context)
+        except Exception as e:
+            logging.error(f"Türetilen alan hesaplama hatası: {e}")
+            return
+        self.update_values(derived)
+        for key, value in derived.items():
+            logging.info(f"{key}: {value}")
     
     def calculate_combined_fields(self):
         """Kombine alanları hesaplar"""
@@ -684,16 +811,28 @@ class SadeFormApp:
     
     def get_value(self, key):
         """DataFrame'den değer alır"""
-        mask = (self.df["Anahtar"] == key)
-        if mask.any():
-            return str(self.df.loc[mask, "Karşılık"].iloc[0])
-        return ""
+        positions = self.key_rows.get(key)
+        if not positions:
+            return ""
+        return str(self.df.iat[positions[0], self.value_col])
     
     def update_value(self, key, value):
         """DataFrame'de değer günceller"""
-        mask = (self.df["Anahtar"] == key)
-        if mask.any():
-            self.df.loc[mask, "Karşılık"] = value
+        for position in self.key_rows.get(key, ()):
+            self.df.iat[position, self.value_col] = value
+    
+    def update_values(self, values):
+        """Birden çok anahtarı tek atamayla günceller; güncellenen anahtar sayısını döndürür"""
+        positions, new_values, updated = [], [], 0
+        for key, value in values.items():
+            rows = self.key_rows.get(key)
+            if rows:
+                positions.extend(rows)
+                new_values.extend([value] * len(rows))
+                updated += 1
+        if positions:
+            self.df.iloc[positions, self.value_col] = new_values
+        return updated
     
     def save_files(self):
         """Dosyaları kaydeder"""
@@ -709,6 +848,11 @@ class SadeFormApp:
             # SGK geçmişini kaydet
             self.save_sgk_history()
             
+            # Ana uygulama verileri dosyayı yeniden okumadan kullanır
+            if self.host is not None:
+                self.host.saved(list(self.df.columns),
+                                self.df.fillna("").astype(str).itertuples(index=False, name=None))
+            
             return True
             
         except PermissionError:
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+benchmark_batch.py
+
+Toplu akışların firma sayısıyla nasıl ölçeklendiğini ekransız ölçer:
+
+- yillik:    Toplu Yıllık Oluştur (YearlyBatchScheduler; jobs_from_rows + run)
+- faaliyet:  toplu faaliyet formları (FaaliyetBatchEngine.run)
+- belgeler:  firma başına "Tüm Belgeleri Oluştur" (hazırlık klasörü, manifest ve tarif yedeğiyle
+             run_document_jobs)
+
+Her ölçüm geçici bir çalışma klasöründe, synthetic_portfolio.py ile üretilmiş ANKARA tablosu ve
+NACE listesiyle yapılır (şablonlar, veri.xlsx ve silme kuralları kopyalanır). PDF dönüştürücü yerine
+sahte dönüştürücü kullanılır: küçük bir PDF yazar ve --pdf-gecikme kadar bekler (LibreOffice/Office
+gerekmez). Sahte dönüştürücü bu modül içe aktarıldığında kurulur; 'spawn' işçi süreçleri ana modülü
+yeniden içe aktardığı için işçilerde de geçerlidir.
+
+Kullanım:
+    python benchmark_batch.py                                   # 10, 100, 1000 firma; tüm akışlar
+    python benchmark_batch.py --firma 10 100 --akis yillik faaliyet --isci 1 4
+    python benchmark_batch.py --firma 50 --pdf-gecikme 1.5      # dönüştürücü maliyetini taklit et
+"""
+
+import argparse
+import datetime
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import EVRAKGENERATOR as E
+from synthetic_portfolio import write_portfolio
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+BENCHMARK_DIR = os.path.join(REPO_DIR, "benchmarks")
+FLOWS = ("yillik", "faaliyet", "belgeler")
+WORKSPACE_FILES = ("veri.xlsx", "YILLIK_SILME_KURALLARI.csv")
+PDF_DELAY_ENV = "EVRAK_SAHTE_PDF_GECIKME"
+STUB_PDF = b"%PDF-1.4\n1 0 obj<</Type/Catalog/Pages 2 0 R>>endobj\n2 0 obj<</Type/Pages/Kids[]/Count 0>>endobj\n" \
+           b"trailer<</Root 1 0 R>>\n%%EOF\n"
+
+YILLIK_TARIH = "15.06.2026"
+RD_TARIH = "02.01.2026"
+FAALIYET_TARIHI = "15.01.2026"
+
+
+@E.METRICS.timed("pdf")
+def stub_export_pdf(src_path, pdf_path):
+    """Sahte PDF dönüştürücü: ortam değişkenindeki süre kadar bekler ve geçerli küçük bir PDF yazar"""
+    time.sleep(float(os.environ.get(PDF_DELAY_ENV, "0") or 0))
+    os.makedirs(os.path.dirname(pdf_path) or ".", exist_ok=True)
+    with open(pdf_path, "wb") as f:
+        f.write(STUB_PDF)
+    return True
+
+
+# İçe aktarılınca (ana süreçte ve her işçide) gerçek dönüştürücünün yerine geçer
+E.PDFConverter.export_pdf_from_docx = staticmethod(stub_export_pdf)
+E.PDFConverter.export_pdf_from_xlsx = staticmethod(stub_export_pdf)
+
+
+def prepare_workspace(company_count, seed):
+    """Şablonlar ve sentetik tablolarla geçici çalışma klasörü hazırlar: (klasör, SGK kodları)"""
+    workspace = tempfile.mkdtemp(prefix="evrak_toplu_bench_")
+    shutil.copytree(os.path.join(REPO_DIR, "Evraklar"), os.path.join(workspace, "Evraklar"))
+    for name in WORKSPACE_FILES:
+        shutil.copy2(os.path.join(REPO_DIR, name), workspace)
+    os.makedirs(os.path.join(workspace, "yedekler"))
+    _, _, codes = write_portfolio(workspace, company_count, seed)
+    return workspace, codes
+
+
+def reset_caches():
+    """Ölçümler birbirinin önbelleğinden yararlanmasın"""
+    E.TEMPLATE_CACHE.clear()
+    E.RENDER_CACHE.clear()
+    E.METRICS.take()
+
+
+def run_yearly(codes, workers, out_folder, generate_pdf):
+    generator = E.EvrakGenerator()
+    scheduler = E.YearlyBatchScheduler(generator, workers)
+    rows = [(sgk, "Matris" if i % 2 else "Fine Kinney", RD_TARIH, "0312 000 00 00", "isg@firma.com")
+            for i, sgk in enumerate(codes)]
+    jobs, failures = scheduler.jobs_from_rows(rows, YILLIK_TARIH, out_folder, generate_pdf)
+    results = failures + scheduler.run(jobs)
+    documents = sum(len(r.documents) for r in results)
+    return documents, sum(not r.ok for r in results)
+
+
+def run_faaliyet(codes, workers, out_folder, generate_pdf):
+    engine = E.FaaliyetBatchEngine(E.EvrakGenerator(), workers)
+    results = engine.run(codes, FAALIYET_TARIHI, out_folder)
+    return len(results), sum(not r.ok for r in results)
+
+
+def run_documents(codes, workers, out_folder, generate_pdf):
+    generator = E.EvrakGenerator()
+    generator.generate_pdf = generate_pdf
+    base = generator.load_replacements()
+    documents = errors = 0
+    try:
+        for i, sgk in enumerate(codes):
+            fields = generator.directory.company_fields(sgk)
+            job = {"sgk": sgk, "yillik_tarih": YILLIK_TARIH, "rd_yontemi": "Matris" if i % 2 else "Fine Kinney"}
+            replacements, _ = generator.build_job_replacements(job, fields, base)
+            docs = generator.get_available_documents(replacements.get("[DEĞİŞTİR:RDYONTEMI]", "Matris"))
+            target_folder = os.path.join(out_folder, sgk)
+            backup_folder = os.path.join("yedekler", sgk)
+            os.makedirs(target_folder, exist_ok=True)
+            os.makedirs(backup_folder, exist_ok=True)
+            # GUI'deki "Tüm Belgeleri Oluştur" akışı: hazırlık klasörü, tarif yedeği, manifest
+            staging = E.OutputStaging(target_folder, backup_folder)
+            jobs = generator.build_document_jobs(docs, replacements, sgk, staging.path, staging.path)
+            E.RecipeBackup().write(backup_folder, generator, jobs)
+            results = generator.run_document_jobs(jobs, workers, manifest=E.DependencyManifest(backup_folder),
+                                                  staging=staging)
+            documents += len(results)
+            errors += sum(not r.ok for r in results)
+    finally:
+        if generator._pool is not None:
+            generator._pool.shutdown(wait=True)
+    return documents, errors
+
+
+RUNNERS = {"yillik": run_yearly, "faaliyet": run_faaliyet, "belgeler": run_documents}
+
+
+def measure(flow, codes, workers, generate_pdf):
+    """Akışı verilen firmalarla bir kez çalıştırır ve ölçümü döndürür"""
+    out_folder = os.path.abspath(os.path.join("cikti", f"{flow}_{len(codes)}_{workers}"))
+    os.makedirs(out_folder, exist_ok=True)
+    reset_caches()
+    started = time.perf_counter()
+    documents, errors = RUNNERS[flow](codes, workers, out_folder, generate_pdf)
+    elapsed = time.perf_counter() - started
+    shutil.rmtree(out_folder, ignore_errors=True)
+    return {"akis": flow, "firma": len(codes), "isci": workers, "sure_sn": round(elapsed, 3),
+            "belge": documents, "hata": errors,
+            "firma_sn": round(len(codes) / elapsed, 2), "belge_sn": round(documents / elapsed, 2),
+            "firma_basina_ms": round(elapsed * 1000 / len(codes), 1)}
+
+
+def print_curves(measurements):
+    """Akış ve işçi sayısı başına ölçeklenme eğrisi: firma başına süre ve en küçük boyuta göre oran"""
+    print("\nÖlçeklenme (firma başına ms; parantezde en küçük portföye göre oran)")
+    for flow in FLOWS:
+        rows = [m for m in measurements if m["akis"] == flow]
+        for workers in sorted({m["isci"] for m in rows}):
+            series = sorted((m for m in rows if m["isci"] == workers), key=lambda m: m["firma"])
+            if not series:
+                continue
+            first = series[0]["firma_basina_ms"] or 1
+            points = "  ".join(f"{m['firma']}: {m['firma_basina_ms']} ({m['firma_basina_ms'] / first:.2f}x)"
+                               for m in series)
+            print(f"  {flow:<9} {workers} işçi  {points}")
+    print("\nParalel hızlanma (1 işçiye göre)")
+    for m in measurements:
+        single = next((s for s in measurements if s["akis"] == m["akis"] and s["firma"] == m["firma"]
+                       and s["isci"] == 1), None)
+        if single and m["isci"] > 1:
+            print(f"  {m['akis']:<9} {m['firma']:>5} firma  {m['isci']} işçi: "
+                  f"{single['sure_sn'] / m['sure_sn']:.2f}x")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Toplu akışların sentetik portföyle ölçeklenme ölçümü")
+    parser.add_argument("--firma", type=int, nargs="+", default=[10, 100, 1000], help="Portföy boyutları")
+    parser.add_argument("--akis", nargs="+", choices=FLOWS, default=list(FLOWS), help="Ölçülecek akışlar")
+    parser.add_argument("--isci", type=int, nargs="+", default=None,
+                        help="İşçi sayıları (varsayılan: 1 ve çekirdek sayısı - 1)")
+    parser.add_argument("--pdf-yok", action="store_true", help="PDF adımını atla")
+    parser.add_argument("--pdf-gecikme", type=float, default=0.0,
+                        help="Sahte dönüştürücünün belge başına bekleme süresi (sn)")
+    parser.add_argument("--tohum", type=int, default=42, help="Sentetik portföy tohumu")
+    parser.add_argument("--sonuc", default=None, help="Sonuç JSON yolu (varsayılan benchmarks/toplu_<zaman>.json)")
+    parser.add_argument("--klasoru-tut", action="store_true", help="Geçici çalışma klasörünü silme")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    # Ölçüm sırasında hücre/belge ayrıntıları günlüğü şişirmesin (işçilere de aktarılır)
+    E.apply_log_levels("WARNING")
+    os.environ[PDF_DELAY_ENV] = str(args.pdf_gecikme)
+    worker_counts = args.isci or sorted({1, E.default_workers()})
+    sizes = sorted(set(args.firma))
+
+    workspace, codes = prepare_workspace(max(sizes), args.tohum)
+    # Ölçüm kayıtları depodaki evrak_generator.log'a değil, geçici çalışma klasörüne yazılır
+    E.redirect_log_file(os.path.join(workspace, E.LOG_FILE))
+    print(f"Çalışma klasörü: {workspace} ({len(codes)} sentetik firma)")
+    previous_cwd = os.getcwd()
+    os.chdir(workspace)
+    measurements = []
+    try:
+        for flow in args.akis:
+            for size in sizes:
+                for workers in worker_counts:
+                    m = measure(flow, codes[:size], workers, not args.pdf_yok)
+                    measurements.append(m)
+                    print(f"{flow:<9} {size:>5} firma  {workers} işçi  {m['sure_sn']:>9.2f} sn  "
+                          f"{m['firma_sn']:>7.2f} firma/sn  {m['belge_sn']:>7.2f} belge/sn  {m['hata']} hata")
+    finally:
+        os.chdir(previous_cwd)
+        if not args.klasoru_tut:
+            shutil.rmtree(workspace, ignore_errors=True)
+
+    print_curves(measurements)
+    report = {"zaman": datetime.datetime.now().isoformat(timespec="seconds"), "cpu": os.cpu_count(),
+              "pdf": not args.pdf_yok, "pdf_gecikme": args.pdf_gecikme, "tohum": args.tohum,
+              "olcumler": measurements}
+    os.makedirs(BENCHMARK_DIR, exist_ok=True)
+    output = args.sonuc or os.path.join(BENCHMARK_DIR, f"toplu_{datetime.datetime.now():%Y%m%d_%H%M%S}.json")
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\nSonuçlar kaydedildi: {output}")
+    return 1 if any(m["hata"] for m in measurements) else 0
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
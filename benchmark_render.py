@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+benchmark_render.py
+
+Evraklar/ ve Evraklar/YILLIKLAR/ altındaki gerçek şablonlar üzerinde belge üretim motorunun
+mikro ölçümlerini yapar:
+
+- process_word_document / process_excel_document (Evraklar/*.docx, *.xlsx)
+- update_rd_method_in_excel (Yıllık Değerlendirme Raporu; çalışma kitabı ölçüm dışında açılır)
+- yıllık hattı (render_yearly_plan / render_yearly_report) ve aşamaları
+  (sablon_okuma, doldurma, dinamik_algoritma, silme_kurallari, paketleme)
+
+Her vaka ayrı bir süreçte çalışır; böylece tepe RSS vakaya özgüdür. Şablon önbelleği ısınma
+turunda dolar, doldurulmuş belge önbelleği (RENDER_CACHE) her turdan önce temizlenir.
+Sonuçlar JSON olarak yazılır ve kayıtlı temel ölçümle (baseline) karşılaştırılır.
+
+Kullanım:
+    python benchmark_render.py                       # ölç, benchmarks/render_baseline.json ile karşılaştır
+    python benchmark_render.py --baseline-kaydet     # sonucu yeni temel ölçüm olarak kaydet
+    python benchmark_render.py --filtre YILLIK --tekrar 10
+"""
+
+import argparse
+import datetime
+import glob
+import hashlib
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+BENCHMARK_DIR = "benchmarks"
+DEFAULT_BASELINE = os.path.join(BENCHMARK_DIR, "render_baseline.json")
+
+# Ölçümlerin yıldan yıla karşılaştırılabilir olması için sabit iş tanımı (dinamik algoritma çalışır)
+BENCHMARK_JOB = {
+    "tur": "yillik",
+    "yillik_tarih": "15.06.2026",
+    "yillik_yil": "2026",
+    "rd_yontemi": "Fine Kinney",
+    "rd_tarih": "02.01.2026",
+    "telefon": "0312 000 00 00",
+    "mail": "isg@firma.com",
+}
+PROJECT_NAME = "BENCHMARK"
+
+
+def template_sha256(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def peak_rss_mb():
+    """Sürecin tepe RSS değeri (MB); ölçülemeyen platformlarda None"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux'ta KB, macOS'ta bayt
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def yearly_target(path):
+    """YILLIKLAR şablonunun belge adı ve kurullu olup olmadığı; yıllık hattına ait değilse None"""
+    name = unicodedata.normalize("NFC", os.path.basename(path)).upper()
+    if "DEĞERLENDİRME" in name:
+        return "Yıllık Değerlendirme Raporu", None
+    kurullu = "KURULSUZ" not in name
+    if "EĞİTİM" in name:
+        return "Yıllık Eğitim Planı", kurullu
+    if "ÇALIŞMA" in name:
+        return "Yıllık Çalışma Planı", kurullu
+    return None
+
+
+def collect_cases(name_filter=None):
+    """Ölçülecek vakaları (tür, ad, şablon yolu) listeler"""
+    cases = []
+    for path in sorted(glob.glob(os.path.join("Evraklar", "*.docx"))):
+        cases.append({"tur": "word", "ad": f"word: {os.path.basename(path)}", "sablon": path})
+    for path in sorted(glob.glob(os.path.join("Evraklar", "*.xlsx"))):
+        cases.append({"tur": "excel", "ad": f"excel: {os.path.basename(path)}", "sablon": path})
+    for path in sorted(glob.glob(os.path.join("Evraklar", "YILLIKLAR", "*.xlsx"))):
+        target = yearly_target(path)
+        if target and target[1] is None:
+            # RD yöntemi hücresi (G15) yalnızca değerlendirme raporunda güncellenir
+            cases.append({"tur": "rd_yontemi", "ad": f"rd_yontemi: {os.path.basename(path)}", "sablon": path})
+        if target:
+            cases.append({"tur": "yillik", "ad": f"yillik: {os.path.basename(path)}", "sablon": path})
+    if name_filter:
+        key = unicodedata.normalize("NFC", name_filter).casefold()
+        cases = [c for c in cases if key in unicodedata.normalize("NFC", c["ad"]).casefold()]
+    return cases
+
+
+def build_replacements(sgk=None):
+    """veri.xlsx ve (verilirse) firma tablosundan temsili değiştirme seti"""
+    import EVRAKGENERATOR as E
+    generator = E.EvrakGenerator()
+    fields = {}
+    if sgk:
+        fields = generator.directory.company_fields(sgk)
+        if fields is None:
+            raise SystemExit(f"SGK kodu bulunamadı: {sgk}")
+    replacements, _ = generator.build_job_replacements(dict(BENCHMARK_JOB, sgk=sgk or ""), fields)
+    return replacements
+
+
+def run_case(case, replacements, iterations):
+    """Vakayı ayrı süreçte ısınma + iterations tur çalıştırır ve ölçümleri döndürür"""
+    import EVRAKGENERATOR as E
+    from openpyxl import load_workbook
+
+    generator = E.EvrakGenerator()
+    src = case["sablon"]
+    work_dir = tempfile.mkdtemp(prefix="evrak_bench_")
+    replacements = dict(replacements)
+    if case["tur"] == "yillik":
+        doc, kurullu = yearly_target(src)
+        if kurullu is not None:
+            # Şablon seçimi çalışan sayısına göre yapılır (>= 50 kurullu)
+            replacements["[DEĞİŞTİR:ÇALIŞANSAYISI]"] = "60" if kurullu else "10"
+            selected = generator.select_yearly_template(doc, kurullu)
+            if not selected or os.path.abspath(selected) != os.path.abspath(src):
+                return dict(case, hata=f"Şablon seçimi farklı: {selected}")
+
+    def once():
+        """Tek tur: (süre, çıktı boyutu)"""
+        E.RENDER_CACHE.clear()
+        if case["tur"] == "word":
+            dst = os.path.join(work_dir, "cikti.docx")
+            started = time.perf_counter()
+            ok = E.DocumentProcessor.process_word_document(src, dst, replacements)
+            elapsed = time.perf_counter() - started
+            return elapsed, os.path.getsize(dst) if ok else None
+        if case["tur"] == "excel":
+            dst = os.path.join(work_dir, "cikti.xlsx")
+            started = time.perf_counter()
+            ok = E.DocumentProcessor.process_excel_document(src, dst, replacements)
+            elapsed = time.perf_counter() - started
+            return elapsed, os.path.getsize(dst) if ok else None
+        if case["tur"] == "rd_yontemi":
+            wb = load_workbook(E.TEMPLATE_CACHE.open(src))
+            started = time.perf_counter()
+            E.DocumentProcessor.update_rd_method_in_excel(wb, replacements)
+            elapsed = time.perf_counter() - started
+            wb.close()
+            return elapsed, None
+        started = time.perf_counter()
+        if doc == "Yıllık Değerlendirme Raporu":
+            rendered = generator.render_yearly_report(replacements, PROJECT_NAME)
+        else:
+            rendered = generator.render_yearly_plan(doc, replacements, PROJECT_NAME)
+        elapsed = time.perf_counter() - started
+        return elapsed, len(rendered[1]) if rendered else None
+
+    try:
+        # İçe aktarmalar sonrası tepe değer; artış vakanın kendi bellek ihtiyacını gösterir
+        rss_before = peak_rss_mb()
+        once()
+        E.METRICS.take()
+        times, stages, size = [], {}, None
+        for _ in range(iterations):
+            elapsed, size = once()
+            times.append(elapsed)
+            for name, values in E.METRICS.take().items():
+                stages.setdefault(name, []).append(values["sure"])
+        median = statistics.median(times)
+        rss_after = peak_rss_mb()
+        return dict(case,
+                    sablon_sha256=template_sha256(src),
+                    ops_sn=round(1 / median, 2) if median else None,
+                    medyan_sn=round(median, 5),
+                    min_sn=round(min(times), 5),
+                    tepe_rss_mb=rss_after,
+                    rss_artisi_mb=round(rss_after - rss_before, 1) if rss_after is not None else None,
+                    cikti_bayt=size,
+                    asamalar={name: round(statistics.median(values), 5) for name, values in sorted(stages.items())})
+    except Exception as e:
+        return dict(case, hata=f"{type(e).__name__}: {e}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_suite(cases, replacements, iterations):
+    results = {}
+    context = multiprocessing.get_context("spawn")
+    for index, case in enumerate(cases, 1):
+        # Her vaka temiz bir süreçte: tepe RSS önceki vakalardan etkilenmez
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            result = executor.submit(run_case, case, replacements, iterations).result()
+        results[case["ad"]] = result
+        if "hata" in result:
+            print(f"[{index}/{len(cases)}] {case['ad']}: HATA {result['hata']}")
+        else:
+            print(f"[{index}/{len(cases)}] {case['ad']}: {result['ops_sn']} işlem/sn, "
+                  f"tepe RSS {result['tepe_rss_mb']} MB, {result['cikti_bayt'] or '-'} bayt")
+    return {
+        "zaman": datetime.datetime.now().isoformat(timespec="seconds"),
+        "surum": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu": os.cpu_count(),
+        "tekrar": iterations,
+        "vakalar": results,
+    }
+
+
+def compare(current, baseline, tolerance):
+    """Temel ölçüme göre yavaşlayan vakaları yazdırır; gerileme sayısını döndürür"""
+    regressions = 0
+    print(f"\nTemel ölçüm: {baseline.get('zaman')} (sürüm {baseline.get('surum')})")
+    for name, result in current["vakalar"].items():
+        base = baseline.get("vakalar", {}).get(name)
+        if base is None or "hata" in result or "hata" in base or not base.get("ops_sn"):
+            print(f"  YENİ/ATLANDI  {name}")
+            continue
+        ratio = result["ops_sn"] / base["ops_sn"]
+        notes = []
+        if result.get("sablon_sha256") != base.get("sablon_sha256"):
+            notes.append("şablon değişti")
+        if base.get("cikti_bayt") and result.get("cikti_bayt"):
+            size_change = result["cikti_bayt"] / base["cikti_bayt"] - 1
+            if abs(size_change) > 0.1:
+                notes.append(f"çıktı boyutu {size_change:+.0%}")
+        status = "GERİLEME" if ratio < 1 - tolerance else ("HIZLANMA" if ratio > 1 + tolerance else "AYNI")
+        regressions += status == "GERİLEME"
+        note = f" ({', '.join(notes)})" if notes else ""
+        print(f"  {status:<9} {ratio:6.2f}x  {name}{note}")
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Şablon üretim motoru mikro ölçümleri")
+    parser.add_argument("--tekrar", type=int, default=5, help="Vaka başına ölçülen tur sayısı (ısınma hariç)")
+    parser.add_argument("--filtre", default=None, help="Yalnızca adında bu metin geçen vakalar")
+    parser.add_argument("--sgk", default=None, help="Değiştirme setine eklenecek firmanın SGK kodu")
+    parser.add_argument("--sonuc", default=None, help="Sonuç JSON yolu (varsayılan benchmarks/render_<zaman>.json)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Karşılaştırılacak temel ölçüm dosyası")
+    parser.add_argument("--baseline-kaydet", action="store_true", help="Sonucu temel ölçüm olarak kaydet")
+    parser.add_argument("--tolerans", type=float, default=0.2,
+                        help="Gerileme eşiği: işlem/sn bu oranda düşerse gerileme sayılır")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    cases = collect_cases(args.filtre)
+    if not cases:
+        print("Ölçülecek şablon bulunamadı")
+        return 1
+    replacements = build_replacements(args.sgk)
+    report = run_suite(cases, replacements, args.tekrar)
+
+    os.makedirs(BENCHMARK_DIR, exist_ok=True)
+    output = args.sonuc or os.path.join(BENCHMARK_DIR, f"render_{datetime.datetime.now():%Y%m%d_%H%M%S}.json")
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\nSonuçlar kaydedildi: {output}")
+
+    if args.baseline_kaydet:
+        shutil.copyfile(output, args.baseline)
+        print(f"Temel ölçüm güncellendi: {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"Temel ölçüm yok ({args.baseline}); kaydetmek için --baseline-kaydet")
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare(report, baseline, args.tolerans)
+    print(f"\n{regressions} gerileme (tolerans %{args.tolerans * 100:.0f})")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+benchmark_startup.py
+
+Uygulamanın açılış maliyetini ölçer ve bütçeyle karşılaştırır:
+
+- ice_aktarma_sn:  "import EVRAKGENERATOR" süren yeni bir yorumlayıcının toplam süresi
+                   (pandas/openpyxl/python-docx, Tk yazı tipi yoklaması, soffice --version)
+- ilk_pencere_sn:  "python EVRAKGENERATOR.py" başlatılmasından ana pencerenin çizilmesine kadar
+- form_acilis_sn:  ana pencereden "Form Bilgilerini Doldur" (launch_form) penceresinin açılması
+- ilk_belge_sn:    "--jobs" ile tek belgelik işin başlatılmasından sürecin bitmesine kadar
+
+Pencere ölçümleri için ekran gerekir (Linux'ta DISPLAY/WAYLAND_DISPLAY yoksa atlanır); uygulama
+EVRAK_ACILIS_OLCUMU ortam değişkeniyle başlatılır, pencere çizilince işaret yazıp kapanır.
+Ayrıca "-X importtime" çıktısından en pahalı üst düzey paketler ve modül gövdesinin kendi süresi
+raporlanır. Her ölçüm --tekrar kez yapılır, medyan bütçeyle (benchmarks/acilis_butcesi.json)
+karşılaştırılır; aşan ya da ölçülemeyen (ekran yokluğu dışında) ölçüm varsa çıkış kodu 1 olur.
+
+Ölçümler depo klasöründe çalışır (kullanıcının başlattığı gibi); ilk belge geçici klasöre yazılır,
+yedeği her zamanki gibi yedekler/ altına alınır.
+
+Kullanım:
+    python benchmark_startup.py
+    python benchmark_startup.py --tekrar 5 --sinir ilk_pencere_sn=3.5 --sinir ilk_belge_sn=6
+"""
+
+import argparse
+import datetime
+import glob
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from openpyxl import load_workbook
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+BENCHMARK_DIR = os.path.join(REPO_DIR, "benchmarks")
+DEFAULT_BUDGET = os.path.join(BENCHMARK_DIR, "acilis_butcesi.json")
+MAIN_SCRIPT = os.path.join(REPO_DIR, "EVRAKGENERATOR.py")
+PROBE_ENV = "EVRAK_ACILIS_OLCUMU"
+MARKER = "ACILIS"
+TIMEOUT = 120
+TOP_PACKAGES = 12
+WINDOW_METRICS = ("ilk_pencere_sn", "form_acilis_sn")
+
+
+def has_display():
+    if sys.platform.startswith("linux"):
+        return bool(os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY"))
+    return True
+
+
+def run_process(args, env=None):
+    """Süreci çalıştırır: (toplam süre, {işaret: (alındığı an, değer)}, çıkış kodu)
+
+    İşaret satırları "ACILIS <ad> [değer]" biçimindedir; alındığı an başlangıçtan geçen süredir.
+    """
+    started = time.perf_counter()
+    process = subprocess.Popen(args, cwd=REPO_DIR, env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                               stdin=subprocess.DEVNULL, text=True, encoding="utf-8", errors="replace")
+    timer = threading.Timer(TIMEOUT, process.kill)
+    timer.start()
+    markers = {}
+    try:
+        for line in process.stdout:
+            parts = line.split()
+            if len(parts) >= 2 and parts[0] == MARKER:
+                markers[parts[1]] = (time.perf_counter() - started, parts[2] if len(parts) > 2 else None)
+        code = process.wait()
+    finally:
+        timer.cancel()
+    return time.perf_counter() - started, markers, code
+
+
+def first_sgk():
+    """ANKARA tablosundaki ilk KISA SGK kodu (ilk belge işi için)"""
+    path = os.path.join(REPO_DIR, "ANKARA İŞYERİ TABLOSU.xlsx")
+    wb = load_workbook(path, read_only=True, data_only=True)  # KISA SGK formül sütunu
+    try:
+        rows = wb.worksheets[0].iter_rows(values_only=True)
+        column = list(next(rows)).index("KISA SGK")
+        for row in rows:
+            if row[column]:
+                return str(row[column]).strip()
+    finally:
+        wb.close()
+    raise SystemExit("ANKARA tablosunda SGK kodu bulunamadı")
+
+
+def measure_import():
+    elapsed, _, code = run_process([sys.executable, "-c", "import EVRAKGENERATOR"])
+    return elapsed if code == 0 else None
+
+
+def measure_window():
+    """(ilk pencere süresi, form açılış süresi); ekran yoksa veya işaret gelmezse None"""
+    env = dict(os.environ, **{PROBE_ENV: "form"})
+    _, markers, _ = run_process([sys.executable, MAIN_SCRIPT], env)
+    window = markers.get("ilk_pencere", (None, None))[0]
+    form = markers.get("form", (None, None))[1]
+    return window, float(form) if form is not None else None
+
+
+def measure_first_document(sgk, document, work_dir):
+    os.makedirs(work_dir, exist_ok=True)
+    jobs_path = os.path.join(work_dir, "ilk_belge.jsonl")
+    out_folder = os.path.join(work_dir, "cikti")
+    with open(jobs_path, "w", encoding="utf-8") as f:
+        f.write(json.dumps({"sgk": sgk, "tur": "belgeler", "belgeler": [document], "cikti": out_folder},
+                           ensure_ascii=False) + "\n")
+    elapsed, _, code = run_process([sys.executable, MAIN_SCRIPT, "--jobs", jobs_path, "--workers", "1"])
+    produced = glob.glob(os.path.join(out_folder, "**", "*.*"), recursive=True)
+    return elapsed if code == 0 and produced else None
+
+
+def import_breakdown(module="EVRAKGENERATOR"):
+    """-X importtime çıktısından modülün gövde süresi ve en pahalı üst düzey paketler (ms)"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], cwd=REPO_DIR,
+                            capture_output=True, text=True, encoding="utf-8", errors="replace", timeout=TIMEOUT)
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+            entries.append((int(self_us), int(cumulative_us), name))
+        except ValueError:
+            continue  # başlık satırı
+    position = next((i for i, (_, _, n) in enumerate(entries) if n.strip() == module), None)
+    if position is None:
+        return {"govde_ms": None, "paketler_ms": {}}
+    body_ms = entries[position][0] / 1000
+    # Alt içe aktarmalar modülün satırından önce, daha girintili yazılır; doğrudan içe aktarılanlar
+    # bir seviye (iki boşluk) daha girintilidir
+    depth = len(entries[position][2]) - len(entries[position][2].lstrip())
+    packages = {}
+    for _, cumulative, name in reversed(entries[:position]):
+        indent = len(name) - len(name.lstrip())
+        if indent <= depth:
+            break
+        if indent == depth + 2:
+            root = name.strip().split(".")[0]
+            packages[root] = packages.get(root, 0) + cumulative / 1000
+    top = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:TOP_PACKAGES]
+    return {"govde_ms": round(body_ms, 1),
+            "paketler_ms": {name: round(ms, 1) for name, ms in top}}
+
+
+def load_budget(path, overrides):
+    budget = {}
+    if path and os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            budget = json.load(f)
+    for item in overrides or []:
+        name, _, value = item.partition("=")
+        budget[name.strip()] = float(value)
+    return budget
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Açılış ve içe aktarma süresi ölçümü (bütçe kontrollü)")
+    parser.add_argument("--tekrar", type=int, default=3, help="Her ölçümün tekrar sayısı (medyan alınır)")
+    parser.add_argument("--butce", default=DEFAULT_BUDGET, help="Bütçe dosyası (ölçüm adı -> en fazla saniye)")
+    parser.add_argument("--sinir", action="append", metavar="AD=SN", help="Bütçe değerini geçersiz kıl")
+    parser.add_argument("--sgk", default=None, help="İlk belge işinin SGK kodu (varsayılan tablodaki ilk kod)")
+    parser.add_argument("--belge", default="ACİL DURUM PLANI.docx", help="İlk belge işinde üretilecek belge")
+    parser.add_argument("--sonuc", default=None, help="Sonuç JSON yolu (varsayılan benchmarks/acilis_<zaman>.json)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    budget = load_budget(args.butce, args.sinir)
+    samples = {"ice_aktarma_sn": [], "ilk_pencere_sn": [], "form_acilis_sn": [], "ilk_belge_sn": []}
+    display = has_display()
+    if not display:
+        print("Ekran yok: ilk_pencere_sn ve form_acilis_sn ölçülmeyecek")
+    sgk = args.sgk or first_sgk()
+
+    with tempfile.TemporaryDirectory(prefix="evrak_acilis_") as work_dir:
+        for attempt in range(args.tekrar):
+            samples["ice_aktarma_sn"].append(measure_import())
+            if display:
+                window, form = measure_window()
+                samples["ilk_pencere_sn"].append(window)
+                samples["form_acilis_sn"].append(form)
+            samples["ilk_belge_sn"].append(measure_first_document(sgk, args.belge,
+                                                                 os.path.join(work_dir, str(attempt))))
+            print(f"Tur {attempt + 1}/{args.tekrar} tamamlandı")
+
+    results = {}
+    for name, values in samples.items():
+        values = [v for v in values if v is not None]
+        results[name] = round(statistics.median(values), 3) if values else None
+    breakdown = import_breakdown()
+
+    print("\nAçılış ölçümleri (medyan)")
+    failures = []
+    for name, value in results.items():
+        limit = budget.get(name)
+        if value is None and not display and name in WINDOW_METRICS:
+            status = "ATLANDI"
+        elif value is None:
+            # Çöken veya çıktı üretmeyen açılış bütçeyi geçmiş sayılmaz
+            status = "ÖLÇÜLEMEDİ"
+            if limit is not None:
+                failures.append(name)
+        elif limit is None:
+            status = "bütçe yok"
+        elif value > limit:
+            status = f"BÜTÇE AŞILDI (sınır {limit} sn)"
+            failures.append(name)
+        else:
+            status = f"tamam (sınır {limit} sn)"
+        shown = f"{value:.3f} sn" if value is not None else "-"
+        print(f"  {name:<16} {shown:>10}  {status}")
+    print(f"\nEVRAKGENERATOR modül gövdesi (Tk yoklaması, soffice --version, loglama): {breakdown['govde_ms']} ms")
+    print("En pahalı içe aktarmalar (kümülatif ms):")
+    for package, ms in breakdown["paketler_ms"].items():
+        print(f"  {package:<20} {ms:>8.1f}")
+
+    report = {"zaman": datetime.datetime.now().isoformat(timespec="seconds"), "tekrar": args.tekrar,
+              "python": sys.version.split()[0], "ekran": display, "olcumler": results,
+              "ornekler": samples, "ice_aktarma": breakdown, "butce": budget, "asilan": failures}
+    os.makedirs(BENCHMARK_DIR, exist_ok=True)
+    output = args.sonuc or os.path.join(BENCHMARK_DIR, f"acilis_{datetime.datetime.now():%Y%m%d_%H%M%S}.json")
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\nSonuçlar kaydedildi: {output}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
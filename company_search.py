@@ -0,0 +1,100 @@
+"""
+company_search.py
+
+Formdaki SGK alanı için anlık firma araması. KISA SGK kodları ile şirket türü, işyeri ve proje
+adlarındaki kelimeler Türkçe küçük harfe çevrilip sıralı bir diziye yazılır; her sorgu bisect ile önek
+aralığını bulur (tablo taranmaz, sorgu süresi firma sayısıyla logaritmik büyür).
+
+    index = CompanySearchIndex.from_rows(rows, sirket_col=4, isyeri_col=5, proje_col=6)
+    index.search("tepe dekor")    # [(sgk, etiket), ...]
+
+Birden çok kelimelik sorguda her kelime, firmanın kodunun veya bir kelimesinin öneki olmalıdır.
+İndeks bir kez kurulur ve yalnızca okunur; arka plan iş parçacığında kurulup Tk döngüsüne
+hazır nesne olarak verilebilir.
+"""
+
+import bisect
+import heapq
+import re
+import unicodedata
+
+# Python'un lower() işlemi "İ" → "i̇" (noktalı birleşik karakter) ve "I" → "i" üretir
+TURKISH_CASE = str.maketrans({"İ": "i", "I": "ı"})
+WORD_PATTERN = re.compile(r"\w+")
+LABEL_WIDTH = 90
+
+
+def turkish_fold(text):
+    """Metni Türkçe kurallarıyla küçük harfe çevirir (İ → i, I → ı)"""
+    return unicodedata.normalize("NFC", str(text)).translate(TURKISH_CASE).lower()
+
+
+class CompanySearchIndex:
+    """SGK kodu ve şirket türü/işyeri/proje adı kelimeleri üzerinde önek indeksi"""
+
+    def __init__(self, records):
+        """records: (sgk, şirket türü, işyeri adı, proje adı) dörtlüleri; tablo sırası sonuç sırasını belirler"""
+        self.records = []
+        self._words = []
+        entries = set()
+        seen = set()
+        for sgk, sirket, isyeri, proje in records:
+            sgk = str(sgk).strip()
+            # Aynı SGK birden fazla satırda ise ilk satır geçerlidir (CompanyDirectory gibi)
+            if not sgk or sgk in seen:
+                continue
+            seen.add(sgk)
+            position = len(self.records)
+            self.records.append((sgk, sirket, isyeri, proje))
+            # Kodun kendisi ayrıca tutulur: kod eşleşmeleri ad eşleşmelerinden önce gösterilir
+            words = {turkish_fold(sgk)} | set(WORD_PATTERN.findall(turkish_fold(f"{sirket} {isyeri} {proje}")))
+            self._words.append(words)
+            entries.update((word, position) for word in words)
+        entries = sorted(entries)
+        self._keys = [word for word, _ in entries]
+        self._positions = [position for _, position in entries]
+
+    @classmethod
+    def from_rows(cls, rows, sgk_col=None, sirket_col=4, isyeri_col=5, proje_col=6):
+        """ANKARA satırlarından kurar; rows bir (sgk → satır) sözlüğü ya da satır listesi olabilir"""
+        if hasattr(rows, "items"):
+            items = rows.items()
+        else:
+            items = ((row[sgk_col], row) for row in rows)
+        return cls((sgk, row[sirket_col], row[isyeri_col], row[proje_col]) for sgk, row in items)
+
+    def __len__(self):
+        return len(self.records)
+
+    def _prefix_positions(self, prefix):
+        """Bir kelimesi (veya kodu) prefix ile başlayan kayıtların konumları"""
+        start = bisect.bisect_left(self._keys, prefix)
+        end = bisect.bisect_left(self._keys, prefix + "\U0010ffff", start)
+        return set(self._positions[start:end])
+
+    def search(self, query, limit=20):
+        """Sorguya uyan firmalar: [(sgk, etiket), ...]; kod öneki eşleşmeleri önce gelir"""
+        terms = WORD_PATTERN.findall(turkish_fold(query))
+        if not terms:
+            return []
+        # En uzun kelime en dar aralığı verir; diğer kelimeler adaylar üzerinde denetlenir
+        terms.sort(key=len, reverse=True)
+        candidates = self._prefix_positions(terms[0])
+        rest = terms[1:]
+        matches = [p for p in candidates
+                   if all(any(word.startswith(term) for word in self._words[p]) for term in rest)]
+        code = turkish_fold(query).strip()
+        best = heapq.nsmallest(limit, matches, key=lambda p: (not self.records[p][0].startswith(code), p))
+        return [(self.records[p][0], self.label(p)) for p in best]
+
+    def label(self, position):
+        sgk, sirket, isyeri, proje = self.records[position]
+        name = (isyeri or "").strip() or (sirket or "").strip()
+        proje = (proje or "").strip()
+        text = f"{sgk}  {name}" + (f" – {proje}" if proje and proje != name else "")
+        return text if len(text) <= LABEL_WIDTH else text[:LABEL_WIDTH - 1] + "…"
+
+    @staticmethod
+    def code_from_label(label):
+        """Öneri etiketinin başındaki SGK kodu"""
+        return label.split(None, 1)[0] if label.strip() else ""
@@ -0,0 +1,159 @@
+"""
+derived_fields.py
+
+Tehlike sınıfından türetilen alanların (geçerlilik tarihleri, yıllık İGU/İH saatleri, RD ve muayene
+periyotları) tek kural tablosu. Form (FORMMODULU), generator ve toplu akışlar aynı kuralları kullanır:
+
+- derive / apply:   tek firma bağlamı (replacements sözlüğü)
+- derive_frame:     firma başına bir satırlık DataFrame üzerinde vektörel (pandas tarih aritmetiği)
+- apply_many:       bir portföyün tüm replacements sözlüklerini tek geçişte günceller
+
+Kurallar modül yüklenirken bir kez derlenir (DERIVED_FIELDS). pandas yalnızca vektörel yolda
+içe aktarılır.
+"""
+
+import datetime
+
+from dateutil.relativedelta import relativedelta
+
+TEHLIKE_KEY = "[DEĞİŞTİR:TEHLİKESINIFI]"
+DATE_FORMAT = "%d.%m.%Y"
+# apply_many bu sayıdan az bağlamda tek tek uygular (vektörel yol ancak binlerce firmada kazandırır)
+VECTOR_MIN_ROWS = 2000
+# Vektörel tarih aritmetiğinin güvenli yıl aralığı (pandas ns zaman damgası 1677-2262); dışında kalan
+# tarihler (ör. 01.02.2924 yazım hatası) satır satır hesaplanır
+VECTOR_YEARS = (1700, 2200)
+
+# Tehlike sınıfına göre geçerlilik süresi (yıl); bilinmeyen sınıfta tarih aynen kalır
+VALIDITY_YEARS = {"AZ TEHLİKELİ": 6, "TEHLİKELİ": 4, "ÇOK TEHLİKELİ": 2}
+
+# (çıktı anahtarı, tehlike sınıfı → değer, varsayılan)
+VALUE_RULES = (
+    ("[DEĞİŞTİR:YILLIK:İGU:SAAT]", {"AZ TEHLİKELİ": "4 SAAT"}, "8 SAAT"),
+    ("[DEĞİŞTİR:YILLIK:İH:SAAT]", {"AZ TEHLİKELİ": "4 SAAT", "TEHLİKELİ": "4 SAAT"}, "8 SAAT"),
+    ("[DEĞİŞTİR:YDR:RDPERİYOT]",
+     {"AZ TEHLİKELİ": "6 Yılda 1", "TEHLİKELİ": "4 Yılda 1", "ÇOK TEHLİKELİ": "2 Yılda 1"}, ""),
+    ("[DEĞİŞTİR:YDR:MUAYENEPERİYOT]",
+     {"AZ TEHLİKELİ": "5 Yılda 1", "TEHLİKELİ": "3 Yılda 1", "ÇOK TEHLİKELİ": "Yılda 1"}, ""),
+)
+
+# (başlangıç tarihi anahtarı, geçerlilik bitişi anahtarı, tehlike sınıfı → eklenecek yıl)
+DATE_RULES = (
+    ("[DEĞİŞTİR:RDEKİPATAMAEĞİTİMHAZIRLANMA]", "[DEĞİŞTİR:RDGEÇERLİLİK]", VALIDITY_YEARS),
+    ("[DEĞİŞTİR:ADEPEK3ATAMAEĞİTİM]", "[DEĞİŞTİR:ADEPGEÇERLİLİK]", VALIDITY_YEARS),
+)
+
+
+class DerivedFieldRules:
+    """Kural tablosunu tehlike sınıfı başına hazır çıktı sözlüklerine derler
+
+    Değer kuralları her zaman yazılır; tarih kuralının çıktısı yalnızca başlangıç tarihi
+    okunabildiğinde yazılır (okunamazsa mevcut değer korunur).
+    """
+
+    def __init__(self, value_rules=VALUE_RULES, date_rules=DATE_RULES):
+        self.value_rules = tuple(value_rules)
+        self.date_rules = tuple(date_rules)
+        classes = set()
+        for _, mapping, _ in self.value_rules:
+            classes.update(mapping)
+        for _, _, years in self.date_rules:
+            classes.update(years)
+        self._default_values = {key: default for key, _, default in self.value_rules}
+        self._values_by_class = {
+            cls: {key: mapping.get(cls, default) for key, mapping, default in self.value_rules}
+            for cls in classes
+        }
+        self._years_by_class = {
+            cls: tuple(years.get(cls, 0) for _, _, years in self.date_rules) for cls in classes
+        }
+        self._default_years = (0,) * len(self.date_rules)
+        self.inputs = (TEHLIKE_KEY,) + tuple(inp for inp, _, _ in self.date_rules)
+        self.outputs = tuple(self._default_values) + tuple(outp for _, outp, _ in self.date_rules)
+
+    def derive(self, context):
+        """Bağlamdaki (anahtar → değer) girdilerden türetilen alanları sözlük olarak döndürür"""
+        tehlike = (context.get(TEHLIKE_KEY) or "").strip()
+        derived = dict(self._values_by_class.get(tehlike, self._default_values))
+        years = self._years_by_class.get(tehlike, self._default_years)
+        for (inp, outp, _), ek_yil in zip(self.date_rules, years):
+            end = self.shift_date(context.get(inp), ek_yil)
+            if end is not None:
+                derived[outp] = end
+        return derived
+
+    @staticmethod
+    def shift_date(start, ek_yil):
+        """"gg.aa.yyyy" tarihine yıl ekler; boş, okunamayan veya taşan (9999 sonrası) tarihte None"""
+        start = (start or "").strip()
+        if not start:
+            return None
+        try:
+            dt = datetime.datetime.strptime(start, DATE_FORMAT)
+            return (dt + relativedelta(years=ek_yil)).strftime(DATE_FORMAT)
+        except (ValueError, OverflowError):
+            return None
+
+    def apply(self, replacements):
+        """Türetilen alanları replacements sözlüğüne yazar"""
+        replacements.update(self.derive(replacements))
+        return replacements
+
+    def derive_frame(self, df):
+        """Firma başına bir satırlık DataFrame'den türetilen alanları vektörel hesaplar
+
+        Sütunlar anahtarlardır; tarihi okunamayan satırlarda tarih çıktısı NaN olur. VECTOR_YEARS
+        dışındaki tarihler shift_date ile satır satır hesaplanır (sonuç derive ile aynıdır).
+        """
+        import pandas as pd
+
+        def text_column(key):
+            if key not in df:
+                return pd.Series("", index=df.index, dtype=object)
+            return df[key].fillna("").astype(str).str.strip()
+
+        tehlike = text_column(TEHLIKE_KEY)
+        out = pd.DataFrame(index=df.index)
+        for key, mapping, default in self.value_rules:
+            out[key] = tehlike.map(mapping).fillna(default)
+        for inp, outp, years in self.date_rules:
+            text = text_column(inp)
+            start = pd.to_datetime(text, format=DATE_FORMAT, errors="coerce")
+            offsets = tehlike.map(years).fillna(0).astype(int)
+            # Okunamayan ya da güvenli aralık dışındaki dolu tarihler vektörel yoldan çıkarılır
+            outside = (text != "") & (start.isna() | ~start.dt.year.between(*VECTOR_YEARS))
+            start = start.where(~outside)
+            end = pd.Series(pd.NaT, index=df.index, dtype="datetime64[ns]")
+            # Aynı yıl eklemesini alan satırlar birlikte kaydırılır (DateOffset, relativedelta gibi
+            # 29 Şubat'ı 28 Şubat'a yuvarlar)
+            for ek_yil in offsets.unique():
+                mask = offsets == ek_yil
+                end[mask] = start[mask] + pd.DateOffset(years=int(ek_yil))
+            out[outp] = end.dt.strftime(DATE_FORMAT).where(end.notna())
+            for row in outside[outside].index:
+                shifted = self.shift_date(text[row], int(offsets[row]))
+                if shifted is not None:
+                    out.at[row, outp] = shifted
+        return out
+
+    def apply_many(self, contexts):
+        """Replacements sözlüklerinin hepsini tek vektörel geçişte günceller"""
+        contexts = list(contexts)
+        if not contexts:
+            return contexts
+        if len(contexts) < VECTOR_MIN_ROWS:
+            # Küçük portföyde DataFrame kurulumu kazancı aşar
+            for context in contexts:
+                self.apply(context)
+            return contexts
+        import pandas as pd
+        frame = pd.DataFrame({key: [context.get(key) for context in contexts] for key in self.inputs})
+        derived = self.derive_frame(frame)
+        for key in derived.columns:
+            for context, value in zip(contexts, derived[key].tolist()):
+                if isinstance(value, str):
+                    context[key] = value
+        return contexts
+
+
+DERIVED_FIELDS = DerivedFieldRules()
@@ -0,0 +1,440 @@
+"""
+instrumentation.py
+
+Belge üretiminin ölçüm araçları: aşama metrikleri, çalışma geçmişi, profilleme ve zaman çizelgesi.
+
+- METRICS (StageMetrics):   süreç içi aşama sayaçları (belge ve aşama başına adet, süre, bayt)
+- MetricsHistory:           her çalışmanın metriklerini evrak_metrikleri.jsonl dosyasına ekler, özetler
+- TRACE (TraceRecorder):    belge/aşama/görev aralıklarını Chrome Trace JSON olarak kaydeder
+- RunProfiler:              çalışmayı cProfile (ve istenirse tracemalloc) altında yürütür
+- instrumented():           süreç havuzuna gönderilen görevleri açık olan ölçümlerle sarar
+
+Kapalı ölçümler yalnızca bayrak kontrolüne mal olur. İşçi süreçleri bu modülü kendileri içe aktarır;
+sonuçlar ana sürece dosya (iz, profil) veya görev sonucu (metrikler) olarak taşınır.
+"""
+
+import cProfile
+import datetime
+import functools
+import io
+import itertools
+import json
+import logging
+import os
+import pstats
+import shutil
+import tempfile
+import threading
+import time
+import traceback
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+
+# Kapalı izleyicinin döndürdüğü, hiçbir şey yapmayan bağlam
+_NO_SPAN = nullcontext()
+
+
+class TraceRecorder:
+    """Belge, aşama ve görev aralıklarını Chrome Trace Event (JSON) biçiminde kaydeder
+
+    Kapalıyken her çağrı yalnızca enabled bayrağını kontrol eder. Açıkken olaylar süreç içinde
+    biriktirilir; işçi süreçleri her görevin sonunda olaylarını iz klasörüne ekler (instrumented()),
+    ana süreç çalışma sonunda hepsini iz_<zaman>.json dosyasında birleştirir. Dosya chrome://tracing
+    veya Perfetto ile açılır. Zaman damgaları perf_counter (sistem geneli monoton saat) mikrosaniyesidir.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.worker_dir = None
+        self.path = None
+        self._events = []
+        self._threads = set()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def company(self, name):
+        """Bu iş parçacığında açılan aralıklara firma bilgisini ekler"""
+        if not self.enabled:
+            return _NO_SPAN
+        return self._company(name)
+
+    @contextmanager
+    def _company(self, name):
+        previous = getattr(self._local, "company", None)
+        self._local.company = name
+        try:
+            yield
+        finally:
+            self._local.company = previous
+
+    def span(self, name, category):
+        """Bloğu tek bir aralık olarak kaydeder"""
+        if not self.enabled:
+            return _NO_SPAN
+        return self._span(name, category)
+
+    @contextmanager
+    def _span(self, name, category):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.complete(name, category, started, time.perf_counter() - started)
+
+    def complete(self, name, category, started, elapsed, args=None):
+        """Başlangıcı (perf_counter) ve süresi (saniye) bilinen aralığı ekler"""
+        thread = threading.current_thread()
+        event_args = {"firma": getattr(self._local, "company", None)}
+        if args:
+            event_args.update(args)
+        event = {"name": name, "cat": category, "ph": "X", "pid": os.getpid(), "tid": thread.ident,
+                 "ts": round(started * 1e6, 1), "dur": round(elapsed * 1e6, 1),
+                 "args": {k: v for k, v in event_args.items() if v not in (None, "")}}
+        with self._lock:
+            if thread.ident not in self._threads:
+                self._threads.add(thread.ident)
+                self._events.append({"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": thread.ident,
+                                     "args": {"name": thread.name}})
+            self._events.append(event)
+
+    def take(self):
+        with self._lock:
+            events, self._events = self._events, []
+        return events
+
+    def dump(self, path):
+        """Biriken olayları JSON-lines dosyasına ekler (işçi süreçleri)"""
+        events = self.take()
+        if events:
+            with open(path, "a", encoding="utf-8") as f:
+                for event in events:
+                    f.write(json.dumps(event, ensure_ascii=False) + "\n")
+
+    @contextmanager
+    def recording(self, output_folder):
+        """Blok boyunca izi açar; çıkışta ana süreç ve işçi olaylarını tek iz dosyasına yazar"""
+        self.worker_dir = tempfile.mkdtemp(prefix="evrak_iz_")
+        self.path = None
+        self.take()
+        self.enabled = True
+        try:
+            yield self
+        finally:
+            self.enabled = False
+            try:
+                self.write(output_folder)
+            except Exception as e:
+                logging.error(f"İz dosyası yazılamadı: {e}")
+                logging.error(traceback.format_exc())
+            finally:
+                shutil.rmtree(self.worker_dir, ignore_errors=True)
+                self.worker_dir = None
+
+    def write(self, output_folder):
+        events = self.take()
+        processes = {os.getpid(): "Ana süreç"}
+        for name in sorted(os.listdir(self.worker_dir)):
+            with open(os.path.join(self.worker_dir, name), encoding="utf-8") as f:
+                events.extend(json.loads(line) for line in f if line.strip())
+        for event in events:
+            processes.setdefault(event["pid"], f"İşçi {event['pid']}")
+        metadata = [{"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": label}}
+                    for pid, label in processes.items()]
+        os.makedirs(output_folder, exist_ok=True)
+        self.path = os.path.join(output_folder, f"iz_{datetime.datetime.now():%Y%m%d_%H%M%S}.json")
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": metadata + events, "displayTimeUnit": "ms"}, f, ensure_ascii=False)
+        logging.info(f"İz dosyası kaydedildi: {self.path} ({len(events)} olay, {len(processes)} süreç)")
+
+
+# Süreç başına iz kaydedici (kapalıyken yalnızca bayrak kontrolü)
+TRACE = TraceRecorder()
+
+
+class StageMetrics:
+    """Süreç içi aşama sayaçları: belge ve aşama başına adet, süre ve bayt
+
+    Belge bağlamı iş parçacığı başına tutulur (document()); bağlam dışındaki aşamalar (firma tablosu,
+    veri.xlsx yükleme, arka plan yedekleri) genel ("") kayda yazılır. İşçi süreçleri kendi sayaçlarını
+    take() ile sonuçlarına koyar, ana süreç çalışma sonunda geçmiş dosyasına ekler.
+    """
+
+    GENERAL = ""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._data = {}
+
+    @contextmanager
+    def document(self, name):
+        previous = getattr(self._local, "document", self.GENERAL)
+        self._local.document = name
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._local.document = previous
+            if TRACE.enabled:
+                TRACE.complete(name, "belge", started, time.perf_counter() - started)
+
+    @contextmanager
+    def stage(self, name):
+        """Aşama süresini ölçer; bayt sayısı verilen sözlüğe yazılabilir: m["bayt"] = len(data)"""
+        info = {"bayt": 0}
+        started = time.perf_counter()
+        try:
+            yield info
+        finally:
+            elapsed = time.perf_counter() - started
+            self.add(name, elapsed, info["bayt"])
+            if TRACE.enabled:
+                TRACE.complete(name, "asama", started, elapsed,
+                               {"belge": getattr(self._local, "document", self.GENERAL), "bayt": info["bayt"] or None})
+
+    def add(self, name, seconds, nbytes=0, count=1):
+        document = getattr(self._local, "document", self.GENERAL)
+        with self._lock:
+            entry = self._data.setdefault(document, {}).setdefault(name, [0, 0.0, 0])
+            entry[0] += count
+            entry[1] += seconds
+            entry[2] += nbytes
+
+    def timed(self, name):
+        """Fonksiyonun her çağrısını verilen aşama olarak ölçen dekoratör"""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.stage(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def take(self, document=GENERAL):
+        """Belgenin sayaçlarını {aşama: {adet, sure, bayt}} olarak döndürür ve sıfırlar"""
+        with self._lock:
+            stages = self._data.pop(document, {})
+        return {name: {"adet": c, "sure": round(s, 4), "bayt": b} for name, (c, s, b) in stages.items()}
+
+    @staticmethod
+    def merge(into, stages):
+        """take() çıktısını başka bir aşama sözlüğüne ekler (ör. işçi süreçlerinden gelen genel aşamalar)"""
+        for name, values in stages.items():
+            entry = into.setdefault(name, {"adet": 0, "sure": 0.0, "bayt": 0})
+            entry["adet"] += values["adet"]
+            entry["sure"] = round(entry["sure"] + values["sure"], 4)
+            entry["bayt"] += values["bayt"]
+        return into
+
+
+# Süreç başına aşama sayaçları
+METRICS = StageMetrics()
+
+
+class MetricsHistory:
+    """Her çalışmanın aşama metriklerini yerel bir JSON-lines geçmiş dosyasına ekler ve özetler"""
+
+    FILENAME = "evrak_metrikleri.jsonl"
+
+    def __init__(self, path=None):
+        self.path = path or self.FILENAME
+
+    def append(self, kind, documents, elapsed, general=None):
+        """documents: [{"belge", "sure", "asamalar"}]; genel aşamalar yoksa METRICS'ten alınır"""
+        record = {"zaman": datetime.datetime.now().isoformat(timespec="seconds"), "tur": kind,
+                  "sure": round(elapsed, 4), "belgeler": documents,
+                  "genel": METRICS.take() if general is None else general}
+        try:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        except OSError as e:
+            logging.error(f"Metrik geçmişi yazılamadı: {e}")
+        return record
+
+    def append_results(self, kind, results, elapsed):
+        """DocumentResult listesinden (atlananlar hariç) kayıt ekler"""
+        documents = [{"belge": r.filename, "sure": r.elapsed, "asamalar": r.metrics or {}}
+                     for r in results if r.ok and not r.skipped]
+        return self.append(kind, documents, elapsed)
+
+    def records(self, last=None):
+        records = []
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        continue
+        except FileNotFoundError:
+            return []
+        return records[-last:] if last else records
+
+    @staticmethod
+    def percentile(values, pct):
+        """En yakın sıra yöntemiyle yüzdelik"""
+        ordered = sorted(values)
+        index = max(0, min(len(ordered) - 1, -(-pct * len(ordered) // 100) - 1))
+        return ordered[int(index)]
+
+    def summary(self, last=None):
+        """Şablon (belge) ve aşama başına süre dağılımı: [(belge, aşama, n, p50, p95, ort. bayt)]"""
+        samples = {}
+        for record in self.records(last):
+            groups = [(d["belge"], d.get("sure"), d.get("asamalar", {})) for d in record.get("belgeler", [])]
+            groups.append(("(genel)", None, record.get("genel", {})))
+            for name, total, stages in groups:
+                if total is not None:
+                    samples.setdefault((name, "toplam"), []).append((total, 0))
+                for stage, values in stages.items():
+                    samples.setdefault((name, stage), []).append((values["sure"], values.get("bayt", 0)))
+        rows = []
+        for (name, stage), values in sorted(samples.items()):
+            times = [t for t, _ in values]
+            rows.append((name, stage, len(values), self.percentile(times, 50), self.percentile(times, 95),
+                         sum(b for _, b in values) // len(values)))
+        return rows
+
+
+# Etkin çalışma profilleyicisi (yalnızca ana süreçte, RunProfiler içinde ayarlı)
+ACTIVE_PROFILER = None
+# Bellek izlemede belge başına ölçümler (ana süreçte ve her işçi görevinde ayrı tutulur)
+MEMORY_REPORT = []
+_PROFILE_COUNTER = itertools.count()
+
+
+@contextmanager
+def memory_probe(name):
+    """tracemalloc açıksa belgenin bellek artışını, tepe değerini ve en çok ayıran satırları kaydeder"""
+    if not tracemalloc.is_tracing():
+        yield
+        return
+    before_current, _ = tracemalloc.get_traced_memory()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    try:
+        yield
+    finally:
+        current, peak = tracemalloc.get_traced_memory()
+        top = tracemalloc.take_snapshot().compare_to(before, "lineno")[:5]
+        MEMORY_REPORT.append({"belge": name, "artis": current - before_current, "tepe": peak - before_current,
+                              "satirlar": [[str(stat.traceback[0]), stat.size_diff] for stat in top]})
+
+
+def profiling_active():
+    """Ana süreçte bir RunProfiler açık mı"""
+    return ACTIVE_PROFILER is not None
+
+
+def instrumented(func):
+    """Profil veya iz kaydı açıksa havuza gönderilecek fonksiyonu ölçen sarmalayıcılarla değiştirir"""
+    if TRACE.enabled:
+        func = functools.partial(_traced_call, TRACE.worker_dir, func)
+    if ACTIVE_PROFILER is not None:
+        func = functools.partial(_profiled_call, ACTIVE_PROFILER.worker_dir, ACTIVE_PROFILER.memory, func)
+    return func
+
+
+def _traced_call(trace_dir, func, *args):
+    """İşçi sürecinde tek görevi iz kaydı açık olarak çalıştırır, olayları iz klasörüne ekler"""
+    TRACE.enabled = True
+    try:
+        with TRACE.span(func.__name__, "gorev"):
+            return func(*args)
+    finally:
+        TRACE.enabled = False
+        TRACE.dump(os.path.join(trace_dir, f"{os.getpid()}.jsonl"))
+
+
+def _profiled_call(profile_dir, memory, func, *args):
+    """İşçi sürecinde tek görevi cProfile (ve istenirse tracemalloc) altında çalıştırıp sonuçları dosyaya yazar"""
+    profiler = cProfile.Profile()
+    if memory:
+        tracemalloc.start()
+    profiler.enable()
+    try:
+        return func(*args)
+    finally:
+        profiler.disable()
+        stem = os.path.join(profile_dir, f"{os.getpid()}_{next(_PROFILE_COUNTER)}")
+        profiler.dump_stats(stem + ".pstats")
+        if memory:
+            with open(stem + ".bellek.json", "w", encoding="utf-8") as f:
+                json.dump(MEMORY_REPORT, f, ensure_ascii=False)
+            MEMORY_REPORT.clear()
+            tracemalloc.stop()
+
+
+class RunProfiler:
+    """Bir çalışmayı cProfile altında yürütür; .pstats, metin raporu ve isteğe bağlı bellek raporu yazar
+
+    İşçi süreçleri görev başına ayrı profillenir (instrumented()), dosyaları çalışma sonunda ana sürecin
+    profiliyle birleştirilir. Raporlar çıktı klasörüne profil_<zaman>.* adlarıyla kaydedilir.
+    """
+
+    TOP_N = 40
+
+    def __init__(self, output_folder, memory=False):
+        self.output_folder = output_folder
+        self.memory = memory
+        self.worker_dir = None
+        self.profiler = cProfile.Profile()
+        self.paths = []
+
+    def __enter__(self):
+        global ACTIVE_PROFILER
+        self.worker_dir = tempfile.mkdtemp(prefix="evrak_profil_")
+        MEMORY_REPORT.clear()
+        if self.memory:
+            tracemalloc.start()
+        ACTIVE_PROFILER = self
+        self.profiler.enable()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        global ACTIVE_PROFILER
+        self.profiler.disable()
+        ACTIVE_PROFILER = None
+        try:
+            self.write_reports()
+        except Exception as e:
+            logging.error(f"Profil raporu yazılamadı: {e}")
+            logging.error(traceback.format_exc())
+        finally:
+            if self.memory:
+                tracemalloc.stop()
+            shutil.rmtree(self.worker_dir, ignore_errors=True)
+        return False
+
+    def write_reports(self):
+        os.makedirs(self.output_folder, exist_ok=True)
+        stem = os.path.join(self.output_folder, f"profil_{datetime.datetime.now():%Y%m%d_%H%M%S}")
+        stats = pstats.Stats(self.profiler)
+        memory = list(MEMORY_REPORT)
+        worker_files = sorted(os.listdir(self.worker_dir))
+        for name in worker_files:
+            path = os.path.join(self.worker_dir, name)
+            if name.endswith(".pstats"):
+                stats.add(path)
+            elif name.endswith(".bellek.json"):
+                with open(path, encoding="utf-8") as f:
+                    memory.extend(json.load(f))
+        stats.dump_stats(stem + ".pstats")
+        report = io.StringIO()
+        report.write(f"Ana süreç + {sum(n.endswith('.pstats') for n in worker_files)} işçi görevi\n\n")
+        for order in ("cumulative", "tottime"):
+            stats.stream = report
+            stats.sort_stats(order).print_stats(self.TOP_N)
+        with open(stem + ".txt", "w", encoding="utf-8") as f:
+            f.write(report.getvalue())
+        self.paths = [stem + ".pstats", stem + ".txt"]
+        if self.memory:
+            with open(stem + "_bellek.txt", "w", encoding="utf-8") as f:
+                f.write("Belge başına bellek (tepe / kalıcı artış, MB) ve en çok ayıran satırlar\n\n")
+                for entry in sorted(memory, key=lambda e: e["tepe"], reverse=True):
+                    f.write(f"{entry['tepe'] / 1e6:8.2f} / {entry['artis'] / 1e6:8.2f}  {entry['belge']}\n")
+                    for line, size in entry["satirlar"]:
+                        f.write(f"{'':22}{size / 1e6:+8.2f}  {line}\n")
+            self.paths.append(stem + "_bellek.txt")
+        logging.info(f"Profil raporları kaydedildi: {', '.join(self.paths)}")
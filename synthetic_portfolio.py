@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+synthetic_portfolio.py
+
+Kapasite ölçümleri için sentetik firma portföyü üretir:
+
+- ANKARA İŞYERİ TABLOSU.xlsx ile aynı 34 sütunlu düzende işyeri tablosu (Türkçe unvan, proje,
+  adres ve kişi adları; GRUP DIŞI satırları; AZ TEHLİKELİ / TEHLİKELİ / ÇOK TEHLİKELİ sınıfları;
+  50 altı ve üstü çalışan sayıları, arada sayı olmayan hücreler)
+- tablodaki her NACE kodunu içeren Nace Kod Listesi.xlsx
+
+Aynı tohum (--tohum) aynı portföyü üretir.
+
+Kullanım:
+    python synthetic_portfolio.py 1000 --cikti sentetik/
+"""
+
+import argparse
+import datetime
+import os
+import random
+import sys
+import uuid
+
+from openpyxl import Workbook
+
+ANKARA_FILENAME = "ANKARA İŞYERİ TABLOSU.xlsx"
+NACE_FILENAME = "Nace Kod Listesi.xlsx"
+
+# Gerçek tablonun başlıkları (ilk iki sütun başlıksızdır); CompanyDirectory.COL_* sıraları bu düzene göredir
+ANKARA_COLUMNS = [
+    None, None, "BÖLGE", "İL", "ŞİRKETTÜRÜ", "İŞYERİ ADI ", "PROJE ADI ", "Meditek İşyeri Adı",
+    "Meditek İşyeri Kodu", "Nace Kodu", "SGK NO KISA", "SGK NO", "PROJE ENLEM", "PROJE BOYLAM", "Sütun1",
+    "KISA SGK", "TEHLİKE SINIFI", "PROJE AÇILIŞ TARİHİ", "Sütun2", "KATİP KİŞİ SAYISI",
+    "Uzman Görevlendirme Tarihi", "UZMAN", "UZMAN İSG KATİP ONAY DURUMU", "MASKE UZMAN",
+    "İşyeri Hekimi Görevlendirme Tarihi", "HEKİM", "HEKİM İSG KATİP ONAY DURUMU", "MASKE HEKİM",
+    "UZMAN DK", "HEKİM DK", "DSP", "ADRES", "SEMT", "OPERASYON SORUMLUSU",
+]
+
+# (NACE kodu, açıklama, tehlike sınıfı); sınıflar sırayla karışık dizilir, küçük portföylerde de üçü bulunur
+NACE_CODES = [
+    ("80.10.01", "Özel güvenlik faaliyetleri", "AZ TEHLİKELİ"),
+    ("81.21.01", "Binaların genel temizliği", "TEHLİKELİ"),
+    ("41.20.01", "Konut inşaatı", "ÇOK TEHLİKELİ"),
+    ("64.19.01", "Bankaların faaliyetleri", "AZ TEHLİKELİ"),
+    ("56.29.01", "Yemek hizmeti sunumu (catering)", "TEHLİKELİ"),
+    ("43.21.01", "Elektrik tesisatı", "ÇOK TEHLİKELİ"),
+    ("68.32.02", "Site yönetimi faaliyetleri", "AZ TEHLİKELİ"),
+    ("31.01.01", "Büro ve mağaza mobilyaları imalatı", "TEHLİKELİ"),
+    ("25.11.03", "Metal yapı ve yapı parçaları imalatı", "ÇOK TEHLİKELİ"),
+    ("47.11.02", "Süpermarket perakende ticareti", "AZ TEHLİKELİ"),
+    ("52.10.02", "Depolama ve ambarlama faaliyetleri", "TEHLİKELİ"),
+    ("23.61.01", "İnşaat amaçlı beton ürünleri imalatı", "ÇOK TEHLİKELİ"),
+    ("81.10.01", "Tesis bünyesindeki kombine destek hizmetleri", "AZ TEHLİKELİ"),
+    ("86.10.01", "Hastane hizmetleri", "TEHLİKELİ"),
+    ("05.10.01", "Taş kömürü madenciliği", "ÇOK TEHLİKELİ"),
+    ("62.01.01", "Bilgisayar programlama faaliyetleri", "AZ TEHLİKELİ"),
+    ("49.41.02", "Karayolu ile yük taşımacılığı", "TEHLİKELİ"),
+    ("29.32.01", "Motorlu kara taşıtları için parça ve aksesuar imalatı", "TEHLİKELİ"),
+    ("85.31.02", "Genel ortaöğretim (lise)", "AZ TEHLİKELİ"),
+    ("10.71.01", "Ekmek ve taze pastane ürünleri imalatı", "TEHLİKELİ"),
+]
+
+GROUP_COMPANIES = [
+    ("TEPE SAVUNMA VE GÜVENLİK SİSTEMLERİ A.Ş.", "SAV"),
+    ("TEPE SERVİS VE YÖNETİM A.Ş.", "SER"),
+    ("BİLKENT HOLDİNG ŞİRKETLERİ", "HLD"),
+    ("BCC TOPLU YEMEK ÜRETİM HİZMETLERİ A.Ş.", "BCC"),
+]
+GROUP_OUT = "GRUP DIŞI"
+
+NAME_WORDS = ["ANADOLU", "BAŞKENT", "KIZILIRMAK", "ÇANKAYA", "GÜNEŞ", "ÖZDEMİR", "YILDIZ", "ERCİYES",
+              "SAKARYA", "DOĞUŞ", "İLKE", "ÜMİT", "ŞAFAK", "GÖKKUŞAĞI", "KARTAL", "TUNA", "ÇINAR", "AKDAĞ"]
+SECTORS = ["İNŞAAT", "GIDA", "TEKSTİL", "LOJİSTİK", "MOBİLYA", "MAKİNE", "OTOMOTİV", "TEMİZLİK HİZMETLERİ",
+           "ENERJİ", "SAĞLIK HİZMETLERİ", "BİLİŞİM", "MADENCİLİK"]
+LEGAL_SUFFIXES = ["SANAYİ VE TİCARET A.Ş.", "SANAYİ TİCARET LTD. ŞTİ.", "ANONİM ŞİRKETİ", "TİCARET LİMİTED ŞİRKETİ"]
+CLIENTS = ["AKBANK T.A.Ş.", "YAPI VE KREDİ BANKASI A.Ş.", "TÜRKİYE İŞ BANKASI A.Ş.", "ŞEHİR HASTANESİ",
+           "BREZİLYA BÜYÜKELÇİLİĞİ", "PARK JOVEN SİTE YÖNETİMİ", "ÇAYYOLU İLKOKULU", "OSTİM SANAYİ SİTESİ"]
+SITES = ["Fabrika", "Şantiye", "Depo", "Mağaza", "Genel Müdürlük", "Şube", "Kampüs", "Yemekhane"]
+FIRST_NAMES = ["AYŞE", "MEHMET", "ÇAĞRI", "GÜLŞEN", "İSMAİL", "ŞÜKRÜ", "ÖZLEM", "ÜMİT", "ZEYNEP", "HÜSEYİN",
+               "ELİF", "OĞUZ", "İREM", "BURAK", "SEDA", "ÇİĞDEM"]
+SURNAMES = ["YILMAZ", "KAYA", "DEMİR", "ŞAHİN", "ÇELİK", "ÖZTÜRK", "AYDIN", "ARSLAN", "DOĞAN", "KILIÇ",
+            "ÇAKIR", "GÜNDOĞDU", "KOÇ", "ŞİMŞEK", "ERDOĞAN", "YÜCEL"]
+DISTRICTS = [("ÇANKAYA", "KIZILAY"), ("ÇANKAYA", "BİLKENT"), ("YENİMAHALLE", "OSTİM"), ("KEÇİÖREN", "ETLİK"),
+             ("ETİMESGUT", "ERYAMAN"), ("SİNCAN", "FATİH"), ("ALTINDAĞ", "ULUS"), ("GÖLBAŞI", "İNCEK")]
+STREETS = ["Atatürk Bulvarı", "Gazi Mustafa Kemal Bulvarı", "Eskişehir Yolu", "Konya Yolu", "1071. Cadde",
+           "Turan Güneş Bulvarı", "Şehit Ömer Halisdemir Caddesi", "Çetin Emeç Bulvarı"]
+PROVINCES = ["ANKARA"] * 17 + ["BOLU", "ÇANKIRI", "KIRIKKALE"]
+
+
+def mask_name(name):
+    """'TAŞTAN CAMCIOĞLU' -> 'T****N C*******U' (gerçek tablodaki maske biçimi)"""
+    return " ".join(w[0] + "*" * (len(w) - 2) + w[-1] if len(w) > 2 else w for w in name.split())
+
+
+def turkish_title(text):
+    """Türkçe büyük/küçük harf kurallarıyla baş harfi büyük yazım (str.title() 'ÇINAR'ı 'Çinar' yapar)"""
+    return " ".join(w[:1] + w[1:].replace("I", "ı").replace("İ", "i").lower() for w in text.split())
+
+
+def person(rng):
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(SURNAMES)}"
+
+
+def timestamp(rng, start_year, end_year):
+    start = datetime.datetime(start_year, 1, 1)
+    span = (datetime.datetime(end_year, 12, 31) - start).total_seconds()
+    return (start + datetime.timedelta(seconds=rng.uniform(0, span))).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def company_rows(count, seed=42):
+    """Sentetik ANKARA tablosu satırları (başlık sırasıyla listeler)"""
+    rng = random.Random(seed)
+    codes = rng.sample(range(10000, 2000000), count)
+    rows = []
+    for index, code in enumerate(codes):
+        kisa_sgk = str(code).zfill(7)
+        nace_code, _, tehlike = NACE_CODES[index % len(NACE_CODES)]
+        district, semt = rng.choice(DISTRICTS)
+        project = f"{turkish_title(rng.choice(NAME_WORDS))} {rng.choice(SITES)}"
+        if index % 7 == 3:
+            # GRUP DIŞI: şirket türü sütununda "GRUP DIŞI", işyeri adı firmanın tam unvanı
+            group, abbr = GROUP_OUT, "GD"
+            workplace = f"{rng.choice(NAME_WORDS)} {rng.choice(SECTORS)} {rng.choice(LEGAL_SUFFIXES)}"
+        else:
+            group, abbr = rng.choice(GROUP_COMPANIES)
+            workplace = f"{rng.choice(CLIENTS)} {semt} {rng.choice(['ŞB', 'MERKEZ', 'TESİSİ'])}"
+        nace4 = nace_code.replace(".", "")[:4]
+        kind, serial = rng.randint(1, 4), rng.randint(1, 99)
+        # Arada sayı olmayan çalışan sayısı hücreleri gerçek tabloda da bulunur
+        employees = "işlendi" if index % 50 == 49 else str(rng.choice([rng.randint(1, 49), rng.randint(50, 600)]))
+        expert, doctor = person(rng), person(rng)
+        rows.append([
+            None, None,
+            f"İÇ ANADOLU BÖLGE {1 + index % 2}",
+            rng.choice(PROVINCES),
+            group,
+            workplace,
+            project,
+            f"{kisa_sgk.lstrip('0')}-{abbr}-{workplace}",
+            str(uuid.UUID(int=rng.getrandbits(128))),
+            nace_code,
+            f"{kind} {nace4} 2 2 {kisa_sgk} 06 07 {serial:02d} 0",
+            f"{kind}{nace4}0202{kisa_sgk}00607{serial:02d}000",
+            f"{rng.uniform(39.80, 40.05):.6f}",
+            f"{rng.uniform(32.55, 32.95):.6f}",
+            None,
+            kisa_sgk,
+            tehlike,
+            timestamp(rng, 2010, 2025),
+            None,
+            employees,
+            timestamp(rng, 2023, 2025),
+            expert,
+            expert,
+            mask_name(expert),
+            timestamp(rng, 2023, 2025),
+            doctor,
+            doctor,
+            mask_name(doctor),
+            str(rng.randint(2, 60) * 10),
+            str(rng.randint(1, 30) * 10),
+            None,
+            f"{turkish_title(semt)} Mah. {rng.choice(STREETS)} No:{rng.randint(1, 250)}/{rng.choice('ABCDE')} "
+            f"{turkish_title(district)}/Ankara",
+            semt,
+            "0" if rng.random() < 0.7 else person(rng),
+        ])
+    return rows
+
+
+def write_portfolio(output_folder, count, seed=42):
+    """Sentetik işyeri tablosunu ve NACE listesini yazar, (tablo yolu, NACE yolu, SGK kodları) döndürür"""
+    os.makedirs(output_folder, exist_ok=True)
+    rows = company_rows(count, seed)
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Sayfa1")
+    ws.append(ANKARA_COLUMNS)
+    for row in rows:
+        ws.append(row)
+    ankara_path = os.path.join(output_folder, ANKARA_FILENAME)
+    wb.save(ankara_path)
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Sayfa1")
+    ws.append(["A", "B"])
+    for code, description, _ in NACE_CODES:
+        ws.append([code, description])
+    nace_path = os.path.join(output_folder, NACE_FILENAME)
+    wb.save(nace_path)
+    return ankara_path, nace_path, [row[ANKARA_COLUMNS.index("KISA SGK")] for row in rows]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sentetik ANKARA işyeri tablosu ve NACE listesi üretir")
+    parser.add_argument("firma", type=int, help="Firma (satır) sayısı")
+    parser.add_argument("--cikti", default="sentetik", help="Çıkış klasörü")
+    parser.add_argument("--tohum", type=int, default=42, help="Rastgele üreteç tohumu")
+    args = parser.parse_args(argv)
+    ankara_path, nace_path, codes = write_portfolio(args.cikti, args.firma, args.tohum)
+    print(f"{len(codes)} firma yazıldı: {ankara_path}\nNACE listesi: {nace_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
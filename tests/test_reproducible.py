@@ -0,0 +1,113 @@
+"""
+Deterministik kayıt testleri: aynı belge farklı zamanlarda kaydedilse de package_bytes aynı baytları üretir.
+
+Saat, zip üye tarihlerinin (2 sn çözünürlük) ve docProps zamanlarının değişeceği kadar ileri alınır;
+kullanıcı verisine (veri.xlsx, Evraklar/) ihtiyaç duyulmaz.
+
+    python -m pytest -q tests
+"""
+
+import datetime
+import os
+import sys
+import time
+import types
+import zipfile
+from io import BytesIO
+
+import openpyxl.writer.excel
+import pytest
+from docx import Document
+from openpyxl import Workbook
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import EVRAKGENERATOR as E  # noqa: E402
+
+
+class ShiftedClock(datetime.datetime):
+    """İleri alınabilen saat (zipfile time.time, openpyxl datetime.now kullanır)"""
+
+    offset = 0.0
+
+    @classmethod
+    def now(cls, tz=None):
+        return datetime.datetime.now(tz) + datetime.timedelta(seconds=cls.offset)
+
+
+@pytest.fixture(autouse=True)
+def log_file(tmp_path):
+    """Kayıtlar depodaki evrak_generator.log'a yazılmaz"""
+    E.redirect_log_file(str(tmp_path / E.LOG_FILE))
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    real_time = time.time
+    monkeypatch.setattr(ShiftedClock, "offset", 0.0)
+    monkeypatch.setattr(time, "time", lambda: real_time() + ShiftedClock.offset)
+    monkeypatch.setattr(openpyxl.writer.excel, "datetime",
+                        types.SimpleNamespace(datetime=ShiftedClock, timezone=datetime.timezone))
+    return ShiftedClock
+
+
+def make_docx():
+    document = Document()
+    document.add_paragraph("Firma: [DEĞİŞTİR:FİRMA]")
+    document.add_table(rows=2, cols=2).cell(0, 0).text = "Çalışan sayısı"
+    return document
+
+
+def make_xlsx():
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet["A1"] = "Yıllık Çalışma Planı"
+    sheet["B2"] = 42
+    workbook.create_sheet("Eğitim")
+    return workbook
+
+
+def save_twice(document, clock):
+    """Belgeyi kaydeder, saati bir saat ileri alıp yeniden kaydeder (Word'ün değiştirme zamanı gibi)"""
+    first = E.package_bytes(document)
+    clock.offset += 3600
+    if hasattr(document, "core_properties"):
+        document.core_properties.modified = clock.now().replace(microsecond=0)
+    return first, E.package_bytes(document)
+
+
+@pytest.mark.parametrize("make", [make_docx, make_xlsx], ids=["docx", "xlsx"])
+def test_package_bytes_ignore_save_time(make, clock):
+    first, second = save_twice(make(), clock)
+    assert first == second
+
+
+@pytest.mark.parametrize("make", [make_docx, make_xlsx], ids=["docx", "xlsx"])
+def test_plain_save_depends_on_save_time(make, clock, monkeypatch):
+    """Saatin gerçekten ilerlediğinin denetimi: normalleştirme olmadan baytlar farklıdır"""
+    monkeypatch.setattr(E, "DETERMINISTIC_SAVE", False)
+    first, second = save_twice(make(), clock)
+    assert first != second
+
+
+def test_normalize_package_sorts_members_and_fixes_times():
+    core = (b'<cp:coreProperties xmlns:cp="cp" xmlns:dcterms="dcterms" xmlns:xsi="xsi">'
+            b'<dcterms:created xsi:type="dcterms:W3CDTF">2024-05-06T07:08:09Z</dcterms:created>'
+            b'<dcterms:modified xsi:type="dcterms:W3CDTF">2025-01-02T03:04:05Z</dcterms:modified>'
+            b'</cp:coreProperties>')
+    raw = BytesIO()
+    with zipfile.ZipFile(raw, "w") as z:
+        z.writestr(zipfile.ZipInfo("word/document.xml", (2025, 1, 2, 3, 4, 6)), b"<w:document/>")
+        z.writestr(zipfile.ZipInfo("docProps/core.xml", (2025, 1, 2, 3, 4, 6)), core)
+        z.writestr(zipfile.ZipInfo("_rels/.rels", (2025, 1, 2, 3, 4, 6)), b"<Relationships/>")
+        z.writestr(zipfile.ZipInfo("[Content_Types].xml", (2025, 1, 2, 3, 4, 6)), b"<Types/>")
+
+    data = E.normalize_package(raw.getvalue())
+
+    with zipfile.ZipFile(BytesIO(data)) as z:
+        assert z.namelist() == ["[Content_Types].xml", "_rels/.rels", "docProps/core.xml", "word/document.xml"]
+        assert {info.date_time for info in z.infolist()} == {E.PACKAGE_ZIP_TIME}
+        normalized_core = z.read("docProps/core.xml")
+    assert b"2024-05-06" not in normalized_core and b"2025-01-02" not in normalized_core
+    assert normalized_core.count(b">" + E.PACKAGE_DOC_TIME + b"</dcterms:") == 2
+    assert E.normalize_package(data) == data